@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import func
 
 from techpubs_core.database import get_session
+from techpubs_core.embedding_models import chunk_has_embedding, get_active_embedding_model
 from techpubs_core.models import Document, DocumentChunk, DocumentJob, DocumentVersion
 
 from schemas.chunks import ChunkResponse, DocumentChunksResponse, JobSummary
@@ -51,12 +52,13 @@ def get_document_chunks(
             .scalar()
         )
 
-        # Get embedded chunks count
+        # Get embedded chunks count (vectors of the model search uses)
+        model = get_active_embedding_model(session)
         embedded_chunks = (
             session.query(func.count(DocumentChunk.id))
             .filter(
                 DocumentChunk.document_version_id == latest_version.id,
-                DocumentChunk.embedding.isnot(None),
+                chunk_has_embedding(model),
             )
             .scalar()
         )
@@ -68,16 +70,7 @@ def get_document_chunks(
             .scalar()
         )
 
-        # Get embedding model (from first embedded chunk)
-        embedding_model = (
-            session.query(DocumentChunk.embedding_model)
-            .filter(
-                DocumentChunk.document_version_id == latest_version.id,
-                DocumentChunk.embedding_model.isnot(None),
-            )
-            .limit(1)
-            .scalar()
-        )
+        embedding_model = model.name if embedded_chunks else None
 
         # Calculate pagination
         total_pages = max(1, math.ceil(total_chunks / page_size))
@@ -85,7 +78,7 @@ def get_document_chunks(
 
         # Get paginated chunks
         chunks = (
-            session.query(DocumentChunk)
+            session.query(DocumentChunk, chunk_has_embedding(model).label("has_embedding"))
             .filter(DocumentChunk.document_version_id == latest_version.id)
             .order_by(DocumentChunk.chunk_index)
             .offset(offset)
@@ -98,13 +91,13 @@ def get_document_chunks(
                 id=chunk.id,
                 chunk_index=chunk.chunk_index,
                 content_preview=chunk.content[:100] + "..." if len(chunk.content) > 100 else chunk.content,
-                has_embedding=chunk.embedding is not None,
-                embedding_model=chunk.embedding_model,
+                has_embedding=has_embedding,
+                embedding_model=model.name if has_embedding else None,
                 token_count=chunk.token_count,
                 page_number=chunk.page_number,
                 chapter_title=chunk.chapter_title,
             )
-            for chunk in chunks
+            for chunk, has_embedding in chunks
         ]
 
         # Get jobs for this version
@@ -5,6 +5,7 @@ from sqlalchemy import func, or_
 from fastapi import APIRouter, HTTPException, Query
 
 from techpubs_core.database import get_session
+from techpubs_core.embedding_models import chunk_has_embedding, get_active_embedding_model
 from techpubs_core.models import AircraftModel, Document, DocumentCategory, DocumentChunk, DocumentType, DocumentSerialRange, DocumentVersion, DocumentJob
 
 from config import settings
@@ -48,11 +49,13 @@ def list_documents(
         )
 
         # Subquery to get chunk counts for each document version
+        # (embedded = has a vector from the model search uses)
+        model = get_active_embedding_model(session)
         chunk_counts_subq = (
             session.query(
                 DocumentChunk.document_version_id,
                 func.count(DocumentChunk.id).label("total_chunks"),
-                func.count(DocumentChunk.embedding).label("embedded_chunks"),
+                func.count(DocumentChunk.id).filter(chunk_has_embedding(model)).label("embedded_chunks"),
             )
             .group_by(DocumentChunk.document_version_id)
             .subquery()
@@ -437,7 +440,13 @@ def delete_document(guid: str) -> None:
 
 @router.post("/{guid}/reprocess", response_model=ReprocessResponse)
 def reprocess_document(guid: str) -> ReprocessResponse:
-    """Reprocess a document by cancelling pending jobs, deleting chunks, and queuing new chunking job."""
+    """Reprocess a document by cancelling pending jobs and queuing a new chunking job.
+
+    Existing chunks are left in place: the chunking job keeps them if the file
+    and chunker configuration are unchanged (only missing embeddings are
+    re-queued), and replaces them otherwise. Running jobs are cancelled too,
+    so the new job is the only one writing the version's chunks.
+    """
     with get_session() as session:
         # Find document and validate
         document = (
@@ -463,21 +472,22 @@ def reprocess_document(guid: str) -> ReprocessResponse:
         if not latest_version:
             raise HTTPException(status_code=404, detail="No document version found")
 
-        # Cancel any pending/running jobs for this version
+        # Cancel any pending/running jobs for this version, with the page-range and
+        # embedding jobs split from them. A running chunking job discards its
+        # uncommitted chunks at its next commit instead of mixing them into the new set.
+        version_jobs = session.query(DocumentJob.id).filter(DocumentJob.document_version_id == latest_version.id)
         jobs_cancelled = (
             session.query(DocumentJob)
             .filter(
-                DocumentJob.document_version_id == latest_version.id,
-                DocumentJob.status.in_(["pending", "processing"]),
+                or_(
+                    DocumentJob.document_version_id == latest_version.id,
+                    DocumentJob.parent_job_id.in_(version_jobs.scalar_subquery()),
+                ),
+                DocumentJob.status.in_(["pending", "processing", "running"]),
             )
             .update({"status": "cancelled"}, synchronize_session=False)
         )
 
-        # Delete existing chunks for this version
-        session.query(DocumentChunk).filter(
-            DocumentChunk.document_version_id == latest_version.id
-        ).delete(synchronize_session=False)
-
         # Create new chunking job
         new_job = DocumentJob(
             document_version_id=latest_version.id,
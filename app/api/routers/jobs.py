@@ -57,6 +57,7 @@ def parent_job_to_response(job: DocumentJob) -> ParentJobResponse:
         completed_at=job.completed_at,
         created_at=job.created_at,
         updated_at=job.updated_at,
+        metrics=job.metrics,
         child_job_counts=ChildJobCounts(
             total=len(child_jobs),
             completed=completed_count,
@@ -74,10 +75,13 @@ def child_job_to_response(job: DocumentJob) -> ChildJobResponse:
         error_message=job.error_message,
         chunk_start_index=job.chunk_start_index,
         chunk_end_index=job.chunk_end_index,
+        page_start=job.page_start,
+        page_end=job.page_end,
         started_at=job.started_at,
         completed_at=job.completed_at,
         created_at=job.created_at,
         updated_at=job.updated_at,
+        metrics=job.metrics,
     )
 
 
@@ -157,10 +161,14 @@ def get_job_detail(job_id: int) -> JobDetailResponse:
         if not job:
             raise HTTPException(status_code=404, detail="Parent job not found")
 
-        # Sort child jobs by chunk_start_index
+        # Page-range jobs first (by page), then embedding jobs by chunk_start_index
         child_jobs = sorted(
             job.child_jobs or [],
-            key=lambda j: j.chunk_start_index if j.chunk_start_index is not None else 0,
+            key=lambda j: (
+                j.page_start is None,
+                j.page_start if j.page_start is not None else 0,
+                j.chunk_start_index if j.chunk_start_index is not None else 0,
+            ),
         )
 
         return JobDetailResponse(
@@ -231,7 +239,7 @@ def requeue_job(job_id: int) -> JobActionResponse:
         session.refresh(job)
 
         # Send message to the appropriate queue based on job type
-        if job.job_type == "chunking":
+        if job.job_type in ("chunking", "chunking_range"):
             queue_service.send_chunking_job_message(job.id)
         elif job.job_type == "embedding":
             queue_service.send_embedding_job_message(job.id)
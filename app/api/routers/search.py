@@ -7,6 +7,7 @@ from fastapi import APIRouter
 from pydantic_ai import UsageLimits
 
 from techpubs_core.database import get_session
+from techpubs_core.embedding_models import embedding_search_sql, get_active_embedding_model
 from techpubs_core.embeddings import generate_embedding
 
 from config import settings
@@ -36,10 +37,12 @@ async def _fallback_search(
     min_similarity: float,
 ) -> list[ChunkResult]:
     """Fallback to simple vector search if agent fails."""
-    query_embedding = generate_embedding(query)
-
     with get_session() as session:
-        sql = """
+        model = get_active_embedding_model(session)
+        embedding_join, embedding_column, vector_type = embedding_search_sql(model)
+        query_embedding = generate_embedding(query, model.deployment, model.dimensions)
+
+        sql = f"""
             SELECT
                 dc.id,
                 dc.content,
@@ -48,16 +51,17 @@ async def _fallback_search(
                 d.guid::text as document_guid,
                 d.name as document_name,
                 am.name as aircraft_model_name,
-                1 - (dc.embedding <=> CAST(:query_embedding AS vector)) as similarity
+                1 - ({embedding_column} <=> CAST(:query_embedding AS {vector_type})) as similarity
             FROM document_chunks dc
+            {embedding_join}
             JOIN document_versions dv ON dc.document_version_id = dv.id
             JOIN documents d ON dv.document_id = d.id
             LEFT JOIN aircraft_models am ON d.aircraft_model_id = am.id
-            WHERE dc.embedding IS NOT NULL
+            WHERE {embedding_column} IS NOT NULL
               AND dv.deleted_at IS NULL
               AND d.deleted_at IS NULL
-              AND 1 - (dc.embedding <=> CAST(:query_embedding AS vector)) >= :min_similarity
-            ORDER BY similarity DESC
+              AND 1 - ({embedding_column} <=> CAST(:query_embedding AS {vector_type})) >= :min_similarity
+            ORDER BY {embedding_column} <=> CAST(:query_embedding AS {vector_type})
             LIMIT :limit
         """
 
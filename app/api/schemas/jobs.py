@@ -61,6 +61,7 @@ class ParentJobResponse(BaseModel):
     completed_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
+    metrics: Optional[dict] = None
     child_job_counts: ChildJobCounts
 
     class Config:
@@ -84,10 +85,13 @@ class ChildJobResponse(BaseModel):
     error_message: Optional[str] = None
     chunk_start_index: Optional[int] = None
     chunk_end_index: Optional[int] = None
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
+    metrics: Optional[dict] = None
 
     class Config:
         from_attributes = True
@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from pydantic_ai import RunContext
 from sqlalchemy import text
 
+from techpubs_core.embedding_models import embedding_search_sql, get_active_embedding_model
 from techpubs_core.embeddings import generate_embedding
 
 from .dependencies import SearchAgentDeps
@@ -72,13 +73,18 @@ def vector_search(
     # Limit results to configured max
     effective_limit = min(limit, deps.max_results)
 
+    # Search the active embedding model's vectors; switching models is one
+    # committed flag, so each search sees either the old or the new model
+    model = get_active_embedding_model(deps.session)
+    embedding_join, embedding_column, vector_type = embedding_search_sql(model)
+
     # Generate embedding for the query (this calls Azure OpenAI)
     embed_start = time.perf_counter()
-    query_embedding = generate_embedding(query)
+    query_embedding = generate_embedding(query, model.deployment, model.dimensions)
     embed_elapsed = (time.perf_counter() - embed_start) * 1000
-    print(f"DEBUG: vector_search embedding took {embed_elapsed:.2f}ms")
+    print(f"DEBUG: vector_search embedding took {embed_elapsed:.2f}ms ({model.name})")
 
-    sql = """
+    sql = f"""
         SELECT
             dc.id as chunk_id,
             dc.content,
@@ -87,17 +93,18 @@ def vector_search(
             d.guid::text as document_guid,
             d.name as document_name,
             am.name as aircraft_model_name,
-            1 - (dc.embedding <=> CAST(:query_embedding AS vector)) as similarity,
+            1 - ({embedding_column} <=> CAST(:query_embedding AS {vector_type})) as similarity,
             dc.chunk_index,
             dc.document_version_id
         FROM document_chunks dc
+        {embedding_join}
         JOIN document_versions dv ON dc.document_version_id = dv.id
         JOIN documents d ON dv.document_id = d.id
         LEFT JOIN aircraft_models am ON d.aircraft_model_id = am.id
-        WHERE dc.embedding IS NOT NULL
+        WHERE {embedding_column} IS NOT NULL
           AND dv.deleted_at IS NULL
           AND d.deleted_at IS NULL
-          AND 1 - (dc.embedding <=> CAST(:query_embedding AS vector)) >= :min_similarity
+          AND 1 - ({embedding_column} <=> CAST(:query_embedding AS {vector_type})) >= :min_similarity
     """
 
     params = {
@@ -106,7 +113,8 @@ def vector_search(
         "limit": effective_limit,
     }
 
-    sql += " ORDER BY similarity DESC LIMIT :limit"
+    # Ascending distance (same order as similarity descending) so the ANN index applies
+    sql += f" ORDER BY {embedding_column} <=> CAST(:query_embedding AS {vector_type}) LIMIT :limit"
 
     result = deps.session.execute(text(sql), params)
     rows = result.fetchall()
@@ -36,12 +36,12 @@ function formatDuration(
   return `${hours}h ${remainingMinutes}m`;
 }
 
-function formatChunkRange(
-  startIndex: number | null,
-  endIndex: number | null
-): string {
-  if (startIndex === null || endIndex === null) return "-";
-  return `${startIndex}-${endIndex}`;
+function formatRange(job: ChildJob): string {
+  if (job.page_start !== null && job.page_end !== null) {
+    return `pages ${job.page_start}-${job.page_end}`;
+  }
+  if (job.chunk_start_index === null || job.chunk_end_index === null) return "-";
+  return `${job.chunk_start_index}-${job.chunk_end_index}`;
 }
 
 export function ChildJobsTable({
@@ -81,7 +81,7 @@ export function ChildJobsTable({
               scope="col"
               className="px-4 py-3 text-left text-xs font-medium uppercase tracking-wider text-zinc-500 dark:text-zinc-400"
             >
-              Chunk Range
+              Range
             </th>
             <th
               scope="col"
@@ -125,7 +125,7 @@ export function ChildJobsTable({
                 {job.job_type}
               </td>
               <td className="whitespace-nowrap px-4 py-3 text-sm text-zinc-600 dark:text-zinc-400">
-                {formatChunkRange(job.chunk_start_index, job.chunk_end_index)}
+                {formatRange(job)}
               </td>
               <td className="whitespace-nowrap px-4 py-3 text-sm">
                 <JobStatusBadge status={job.status} />
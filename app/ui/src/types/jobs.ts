@@ -59,6 +59,7 @@ export interface ParentJob {
   completed_at: string | null;
   created_at: string;
   updated_at: string;
+  metrics: Record<string, unknown> | null;
   child_job_counts: ChildJobCounts;
 }
 
@@ -69,10 +70,13 @@ export interface ChildJob {
   error_message: string | null;
   chunk_start_index: number | null;
   chunk_end_index: number | null;
+  page_start: number | null;
+  page_end: number | null;
   started_at: string | null;
   completed_at: string | null;
   created_at: string;
   updated_at: string;
+  metrics: Record<string, unknown> | null;
 }
 
 export interface ParentJobListResponse {
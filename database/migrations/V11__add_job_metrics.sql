@@ -0,0 +1,3 @@
+-- Add metrics column to document_jobs for per-job processing measurements
+-- (e.g. extraction time, model load time)
+ALTER TABLE document_jobs ADD COLUMN metrics JSONB;
@@ -0,0 +1,5 @@
+-- Add per-page text fingerprints to document_versions
+-- Used to diff a new version against the previous version of the same document
+-- so chunks and embeddings for unchanged pages can be copied instead of regenerated.
+-- Only set when the version's chunks were produced page-by-page (no chunk spans pages).
+ALTER TABLE document_versions ADD COLUMN page_hashes JSONB;
@@ -0,0 +1,6 @@
+-- Stamp each version's chunk set with the source file hash and the chunker
+-- version/config fingerprint. The chunking job skips re-chunking when both match
+-- and only re-queues embedding for chunks with NULL embeddings.
+ALTER TABLE document_versions
+    ADD COLUMN content_hash VARCHAR(64),
+    ADD COLUMN chunker_fingerprint VARCHAR(64);
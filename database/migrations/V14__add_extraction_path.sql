@@ -0,0 +1,3 @@
+-- Blob path of each version's extraction artifact (page texts, routes and
+-- serialized Docling documents), used to re-chunk without re-parsing the PDF.
+ALTER TABLE document_versions ADD COLUMN extraction_path VARCHAR(1024);
@@ -0,0 +1,3 @@
+-- Progress of a running chunking job (last completed chapter or page and the
+-- next chunk_index), committed with its chunks so a retried job can resume.
+ALTER TABLE document_jobs ADD COLUMN checkpoint JSONB;
@@ -0,0 +1,6 @@
+-- Page bounds (1-based, inclusive) of the page-range jobs a large document's
+-- chunking job is split into. The last range job to finish renumbers the
+-- chunks and creates the embedding jobs.
+ALTER TABLE document_jobs
+ADD COLUMN page_start INT,
+ADD COLUMN page_end INT;
@@ -0,0 +1,10 @@
+-- Token buckets shared by all workers calling a rate-limited API (the
+-- embedding deployment's tokens-per-minute quota). A worker takes the
+-- bucket's advisory lock, refills it for the time elapsed since refilled_at
+-- and takes its tokens; actual usage is reconciled after each call.
+CREATE TABLE rate_limit_budgets (
+    name TEXT PRIMARY KEY,
+    tokens_per_minute INT NOT NULL,
+    available DOUBLE PRECISION NOT NULL,
+    refilled_at TIMESTAMPTZ NOT NULL
+);
@@ -0,0 +1,49 @@
+-- Embedding models, so the corpus can move to a new model without a search
+-- outage. V8 changed the dimension by NULLing every embedding; now a new
+-- model is registered next to the active one, its vectors are filled into
+-- chunk_embeddings in the background (reembed.py in the embedding job), and
+-- search switches to it in one transaction once every chunk has a vector.
+CREATE TABLE embedding_models (
+    -- Same identifier as document_chunks.embedding_model, e.g. 'azure/text-embedding-3-small'
+    name VARCHAR(100) PRIMARY KEY,
+    deployment VARCHAR(100) NOT NULL,
+    dimensions INT NOT NULL,
+    -- 'document_chunks' (the embedding column) or 'chunk_embeddings'
+    storage VARCHAR(20) NOT NULL DEFAULT 'chunk_embeddings',
+    is_active BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    activated_at TIMESTAMP WITH TIME ZONE
+);
+
+-- One model serves search, and only one lives in document_chunks.embedding
+CREATE UNIQUE INDEX idx_embedding_models_active ON embedding_models (is_active) WHERE is_active;
+CREATE UNIQUE INDEX idx_embedding_models_storage ON embedding_models (storage) WHERE storage = 'document_chunks';
+
+-- Vectors of every other model, any dimension. Each model gets its own
+-- partial ANN index on embedding cast to its dimension when it is registered.
+CREATE TABLE chunk_embeddings (
+    embedding_model VARCHAR(100) NOT NULL REFERENCES embedding_models(name),
+    chunk_id BIGINT NOT NULL REFERENCES document_chunks(id) ON DELETE CASCADE,
+    embedding vector NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (embedding_model, chunk_id)
+);
+
+CREATE INDEX idx_chunk_embeddings_chunk ON chunk_embeddings (chunk_id);
+
+-- The model already in document_chunks.embedding is the active one
+INSERT INTO embedding_models (name, deployment, dimensions, storage, is_active, activated_at)
+SELECT name, regexp_replace(name, '^azure/', ''), 1536, 'document_chunks', TRUE, NOW()
+FROM (
+    SELECT COALESCE(
+        (
+            SELECT embedding_model
+            FROM document_chunks
+            WHERE embedding_model IS NOT NULL
+            GROUP BY embedding_model
+            ORDER BY COUNT(*) DESC
+            LIMIT 1
+        ),
+        'azure/text-embedding-3-small'
+    ) AS name
+) AS current_model;
@@ -0,0 +1,10 @@
+-- Rebuild the ANN index of document_chunks.embedding as HNSW, like the
+-- per-model indexes on chunk_embeddings. V8 recreated it as ivfflat with
+-- lists = 100 right after NULLing every embedding, so its centroids were
+-- trained on no vectors, and with the default ivfflat.probes = 1 a search
+-- ordered by distance returned whichever chunks sat in one list. HNSW needs
+-- no training, so it stays accurate as the corpus grows.
+DROP INDEX IF EXISTS idx_document_chunks_embedding;
+
+CREATE INDEX idx_document_chunks_embedding ON document_chunks
+    USING hnsw (embedding vector_cosine_ops);
@@ -0,0 +1,152 @@
+"""Memory-aware admission of documents into a chunking worker.
+
+With CHUNKING_CONCURRENCY above 1 a worker processes several queue messages
+at once, each document in its own process (PyMuPDF is not thread-safe). One
+giant PDF running next to a few ordinary ones can then push the container
+past its memory limit, so each document estimates its peak memory from
+analyze_pdf's output before extraction starts and waits until the documents
+in flight leave room for it under CHUNKING_RSS_BUDGET_MB. A document that is
+alone always runs, however large its estimate.
+
+The estimates are rough. While a document runs, its process samples the RSS
+of itself and its child processes (the chapter pool workers); the peak rise
+over the RSS at admission, relative to the estimate, feeds a moving average
+that scales later estimates.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+
+# Summed peak memory of the documents in flight, on top of the idle worker processes
+CHUNKING_RSS_BUDGET_MB = int(os.environ.get("CHUNKING_RSS_BUDGET_MB", "8192"))
+
+# Per-document estimate: a fixed part plus terms for pages, file size and images
+DOCUMENT_BASE_MEMORY_MB = float(os.environ.get("DOCUMENT_BASE_MEMORY_MB", "150"))
+DOCUMENT_PAGE_MEMORY_MB = float(os.environ.get("DOCUMENT_PAGE_MEMORY_MB", "0.5"))
+DOCUMENT_FILE_MEMORY_FACTOR = float(os.environ.get("DOCUMENT_FILE_MEMORY_FACTOR", "3"))
+DOCUMENT_IMAGE_MEMORY_MB = float(os.environ.get("DOCUMENT_IMAGE_MEMORY_MB", "0.5"))
+
+# RSS sampling interval while a document runs
+ADMISSION_SAMPLE_SECONDS = 0.5
+
+# Weight of the newest measurement in the estimate scale, and the scale's
+# bounds (so one odd document can't stall or flood the worker)
+ADMISSION_SMOOTHING = 0.3
+ADMISSION_MIN_SCALE = 0.25
+ADMISSION_MAX_SCALE = 4.0
+
+_PAGE_SIZE_MB = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024) if hasattr(os, "sysconf") else 0.0
+
+
+def estimate_document_mb(analysis: dict) -> float:
+    """Unscaled peak memory estimate for chunking a document, from analyze_pdf output."""
+    return (
+        DOCUMENT_BASE_MEMORY_MB
+        + analysis["page_count"] * DOCUMENT_PAGE_MEMORY_MB
+        + analysis.get("file_size_mb", 0.0) * DOCUMENT_FILE_MEMORY_FACTOR
+        + analysis.get("image_count", 0) * DOCUMENT_IMAGE_MEMORY_MB
+    )
+
+
+def _rss_mb(pid: int) -> float | None:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE_MB
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def process_tree_rss_mb() -> float | None:
+    """Current RSS of this process and its child processes (None where /proc is unavailable)."""
+    own = _rss_mb(os.getpid())
+    if own is None:
+        return None
+    # Children that exit between listing and reading simply don't count
+    return own + sum(_rss_mb(child.pid) or 0.0 for child in multiprocessing.active_children())
+
+
+class AdmissionController:
+    """Admits documents while their scaled memory estimates fit in a budget.
+
+    The state lives in multiprocessing primitives so the document processes
+    of a worker share one controller. Create it in the parent and hand it to
+    the processes as they start (e.g. through a pool initializer).
+    """
+
+    def __init__(self, budget_mb: int = CHUNKING_RSS_BUDGET_MB) -> None:
+        self.budget_mb = budget_mb
+        self._condition = multiprocessing.Condition()
+        self._documents = multiprocessing.Value("i", 0, lock=False)
+        self._in_flight_mb = multiprocessing.Value("d", 0.0, lock=False)
+        self._scale = multiprocessing.Value("d", 1.0, lock=False)
+
+    @property
+    def scale(self) -> float:
+        """Current ratio of measured to estimated peak memory."""
+        return self._scale.value
+
+    def _fits(self, estimate_mb: float) -> bool:
+        if self._documents.value == 0:
+            return True
+        return self._in_flight_mb.value + estimate_mb * self._scale.value <= self.budget_mb
+
+    def acquire(self, estimate_mb: float) -> "Admission":
+        """Block until a document with this (unscaled) estimate fits, then admit it."""
+        start_time = time.perf_counter()
+        with self._condition:
+            self._condition.wait_for(lambda: self._fits(estimate_mb))
+            scaled_mb = estimate_mb * self._scale.value
+            self._documents.value += 1
+            self._in_flight_mb.value += scaled_mb
+        return Admission(self, estimate_mb, scaled_mb, time.perf_counter() - start_time)
+
+    def _release(self, admission: "Admission") -> None:
+        with self._condition:
+            self._documents.value -= 1
+            # Reset rather than subtract when idle, so rounding can't accumulate
+            self._in_flight_mb.value = self._in_flight_mb.value - admission.scaled_mb if self._documents.value else 0.0
+            rise_mb = admission.peak_rise_mb
+            if rise_mb is not None and admission.estimate_mb > 0:
+                ratio = min(max(rise_mb / admission.estimate_mb, ADMISSION_MIN_SCALE), ADMISSION_MAX_SCALE)
+                self._scale.value += ADMISSION_SMOOTHING * (ratio - self._scale.value)
+            self._condition.notify_all()
+
+
+class Admission:
+    """An admitted document. Samples the process's peak RSS until released."""
+
+    def __init__(self, controller: AdmissionController, estimate_mb: float, scaled_mb: float, wait_seconds: float) -> None:
+        self.estimate_mb = estimate_mb
+        self.scaled_mb = scaled_mb
+        self.wait_seconds = wait_seconds
+        self._controller = controller
+        self._start_rss_mb = process_tree_rss_mb()
+        self._peak_rss_mb = self._start_rss_mb
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(ADMISSION_SAMPLE_SECONDS):
+            self._record_rss()
+
+    def _record_rss(self) -> None:
+        rss_mb = process_tree_rss_mb()
+        if rss_mb is not None and self._peak_rss_mb is not None:
+            self._peak_rss_mb = max(self._peak_rss_mb, rss_mb)
+
+    @property
+    def peak_rise_mb(self) -> float | None:
+        """Peak RSS rise over the RSS at admission, so far (None if RSS can't be read)."""
+        if self._peak_rss_mb is None:
+            return None
+        return self._peak_rss_mb - self._start_rss_mb
+
+    def release(self) -> None:
+        """Stop sampling, feed the measured peak back into the controller and free the budget."""
+        self._stopped.set()
+        self._sampler.join()
+        self._record_rss()
+        self._controller._release(self)
@@ -0,0 +1,229 @@
+"""Blob fetching with parallel ranged downloads and a local disk cache.
+
+Downloaded documents are stored under a content key (Content-MD5, falling
+back to ETag) so reprocessing the same document version, or re-running the
+chunker while experimenting, reads the PDF from local disk instead of Azure.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+from azure.core import MatchConditions
+from azure.storage.blob import BlobServiceClient
+
+from techpubs_core import DOCUMENTS_CONTAINER, get_credential
+
+BLOB_CACHE_DIR = os.environ.get(
+    "BLOB_CACHE_DIR", os.path.join(tempfile.gettempdir(), "techpubs-blob-cache")
+)
+# Set BLOB_CACHE_MAX_MB=0 to disable the cache (downloads go to temp files)
+BLOB_CACHE_MAX_MB = int(os.environ.get("BLOB_CACHE_MAX_MB", "4096"))
+BLOB_DOWNLOAD_CONCURRENCY = int(os.environ.get("BLOB_DOWNLOAD_CONCURRENCY", "8"))
+
+# Size of each ranged GET; blobs larger than this are fetched in parallel ranges
+BLOB_RANGE_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class FetchedBlob:
+    """A blob available on local disk."""
+
+    path: str
+    size: int
+    cache_hit: bool
+    cached: bool  # True if the file belongs to the cache and must not be deleted
+
+
+@lru_cache(maxsize=1)
+def get_blob_service_client(storage_account_url: str) -> BlobServiceClient:
+    """Get a cached BlobServiceClient configured for ranged downloads."""
+    return BlobServiceClient(
+        storage_account_url,
+        credential=get_credential(),
+        max_single_get_size=BLOB_RANGE_SIZE,
+        max_chunk_get_size=BLOB_RANGE_SIZE,
+    )
+
+
+def _content_key(properties) -> str:
+    """Build a cache key from blob properties (Content-MD5, else ETag)."""
+    content_md5 = properties.content_settings.content_md5
+    if content_md5:
+        return "md5-" + bytes(content_md5).hex()
+    return "etag-" + properties.etag.strip('"').replace("0x", "")
+
+
+class BlobFetcher:
+    """Fetches document blobs into a size-bounded, content-addressed cache.
+
+    Layout under cache_dir:
+        objects/<content key><suffix>  - cached file contents
+        index/<sha256(blob path)>      - content key for a blob path
+
+    Document blob paths are unique per upload (UUID file names) and never
+    rewritten, so an index hit is trusted without contacting storage.
+    """
+
+    def __init__(
+        self,
+        storage_account_url: str,
+        cache_dir: str = BLOB_CACHE_DIR,
+        max_cache_mb: int = BLOB_CACHE_MAX_MB,
+        max_concurrency: int = BLOB_DOWNLOAD_CONCURRENCY,
+    ) -> None:
+        self._storage_account_url = storage_account_url
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        self._index_dir = os.path.join(cache_dir, "index")
+        self._max_cache_bytes = max_cache_mb * 1024 * 1024
+        self._max_concurrency = max_concurrency
+        self._in_use: set[str] = set()
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            os.makedirs(self._objects_dir, exist_ok=True)
+            os.makedirs(self._index_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether downloads are kept in the local cache."""
+        return self._max_cache_bytes > 0
+
+    def fetch(self, blob_path: str, suffix: str = "") -> FetchedBlob:
+        """Make a blob available locally, downloading it only on a cache miss.
+
+        Callers must pass the result to release() once they are done with it.
+        """
+        if not self.enabled:
+            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp_file:
+                tmp_path = tmp_file.name
+            size = self._download(blob_path, tmp_path)
+            return FetchedBlob(path=tmp_path, size=size, cache_hit=False, cached=False)
+
+        index_path = os.path.join(self._index_dir, hashlib.sha256(blob_path.encode()).hexdigest())
+
+        # Known blob path: no network round trip at all
+        object_path = self._read_index(index_path)
+        if object_path and os.path.exists(object_path):
+            return self._hit(object_path)
+
+        blob_client = self._blob_client(blob_path)
+        properties = blob_client.get_blob_properties()
+        object_path = os.path.join(self._objects_dir, _content_key(properties) + suffix)
+
+        # Same content already cached under a different blob path
+        if os.path.exists(object_path):
+            self._write_index(index_path, object_path)
+            return self._hit(object_path)
+
+        # Download next to the final location, then publish atomically
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=self._objects_dir, suffix=".part")
+        os.close(tmp_fd)
+        try:
+            size = self._download(blob_path, tmp_path, etag=properties.etag)
+            os.replace(tmp_path, object_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._write_index(index_path, object_path)
+        with self._lock:
+            self._in_use.add(object_path)
+        self._evict()
+
+        return FetchedBlob(path=object_path, size=size, cache_hit=False, cached=True)
+
+    def release(self, fetched: FetchedBlob) -> None:
+        """Release a fetched blob, deleting it if it is not owned by the cache."""
+        if not fetched.cached:
+            if os.path.exists(fetched.path):
+                os.unlink(fetched.path)
+            return
+        with self._lock:
+            self._in_use.discard(fetched.path)
+
+    def _blob_client(self, blob_path: str):
+        service_client = get_blob_service_client(self._storage_account_url)
+        return service_client.get_blob_client(DOCUMENTS_CONTAINER, blob_path)
+
+    def _download(self, blob_path: str, file_path: str, etag: str | None = None) -> int:
+        """Download a blob with concurrent range requests. Returns bytes written."""
+        blob_client = self._blob_client(blob_path)
+        if etag:
+            # Fail rather than cache content that no longer matches the key
+            stream = blob_client.download_blob(
+                max_concurrency=self._max_concurrency,
+                etag=etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+        else:
+            stream = blob_client.download_blob(max_concurrency=self._max_concurrency)
+
+        with open(file_path, "wb") as f:
+            stream.readinto(f)
+        return stream.size
+
+    def _hit(self, object_path: str) -> FetchedBlob:
+        # Touch so eviction treats the file as recently used
+        os.utime(object_path)
+        with self._lock:
+            self._in_use.add(object_path)
+        return FetchedBlob(
+            path=object_path,
+            size=os.path.getsize(object_path),
+            cache_hit=True,
+            cached=True,
+        )
+
+    @staticmethod
+    def _read_index(index_path: str) -> str | None:
+        try:
+            with open(index_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_index(index_path: str, object_path: str) -> None:
+        tmp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(object_path)
+        os.replace(tmp_path, index_path)
+
+    def _evict(self) -> None:
+        """Delete least recently used objects until the cache fits its budget.
+
+        Files currently handed out by fetch() are never evicted. Index entries
+        pointing at evicted objects are left behind and treated as misses.
+        """
+        with self._lock:
+            in_use = set(self._in_use)
+
+        entries = []
+        for entry in os.scandir(self._objects_dir):
+            if entry.is_file() and not entry.name.endswith(".part"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self._max_cache_bytes:
+                break
+            if path in in_use:
+                continue
+            try:
+                os.unlink(path)
+                total_bytes -= size
+                print(f"  Evicted {os.path.basename(path)} from blob cache ({size} bytes)")
+            except FileNotFoundError:
+                pass
+
+
+@lru_cache(maxsize=1)
+def get_blob_fetcher(storage_account_url: str) -> BlobFetcher:
+    """Get the process-wide BlobFetcher."""
+    return BlobFetcher(storage_account_url)
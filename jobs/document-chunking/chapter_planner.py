@@ -0,0 +1,154 @@
+"""Split a PDF into Docling-sized sections along its TOC.
+
+Top-level chapters of technical manuals vary wildly in size; a single
+"Time Limits / Maintenance Checks" chapter can span hundreds of pages and
+exhaust memory when converted as one unit. Chapters over the page or byte
+budget are split at their deeper TOC entries, level by level, and anything
+still too large (or without deeper entries) is cut into page windows.
+Adjacent pieces of a chapter are then packed back together up to the budget
+so small subsections don't each become a separate conversion.
+"""
+
+import os
+from dataclasses import dataclass
+
+from pdf_session import PdfSession
+
+# A section larger than either budget is split further
+CHAPTER_MAX_PAGES = int(os.environ.get("CHAPTER_MAX_PAGES", "60"))
+CHAPTER_MAX_MB = float(os.environ.get("CHAPTER_MAX_MB", "40"))
+
+
+@dataclass
+class Section:
+    """A 1-based, inclusive page range converted as one unit."""
+
+    title: str  # title of the top-level chapter the section belongs to
+    start_page: int
+    end_page: int
+
+    @property
+    def page_count(self) -> int:
+        return self.end_page - self.start_page + 1
+
+
+@dataclass
+class _TocNode:
+    level: int
+    title: str
+    page: int
+    children: list["_TocNode"]
+
+
+def _toc_tree(toc: list) -> list[_TocNode]:
+    """Nest [[level, title, page], ...] entries under their parents."""
+    roots: list[_TocNode] = []
+    stack: list[_TocNode] = []
+    for level, title, page, *_ in toc:
+        node = _TocNode(level, title, page, [])
+        while stack and stack[-1].level >= level:
+            stack.pop()
+        (stack[-1].children if stack else roots).append(node)
+        stack.append(node)
+    return roots
+
+
+def page_byte_sizes(pdf: PdfSession) -> list[int]:
+    """Approximate serialized size of each page: its content streams and images.
+
+    Uses the stored (compressed) stream lengths, so nothing is decoded.
+    Images shared between pages count towards each of them.
+    """
+    doc = pdf.doc
+
+    def stream_length(xref: int) -> int:
+        kind, value = doc.xref_get_key(xref, "Length")
+        return int(value) if kind == "int" else 0
+
+    sizes = []
+    for page in doc:
+        size = sum(stream_length(xref) for xref in page.get_contents())
+        size += sum(stream_length(image[0]) for image in page.get_images(full=True))
+        sizes.append(size)
+    return sizes
+
+
+class _Budget:
+    def __init__(self, page_sizes: list[int], max_pages: int, max_bytes: float) -> None:
+        self._page_sizes = page_sizes
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+
+    def bytes(self, start_page: int, end_page: int) -> int:
+        return sum(self._page_sizes[start_page - 1:end_page])
+
+    def fits(self, start_page: int, end_page: int) -> bool:
+        return end_page - start_page + 1 <= self.max_pages and self.bytes(start_page, end_page) <= self.max_bytes
+
+    def windows(self, start_page: int, end_page: int) -> list[tuple[int, int]]:
+        """Greedy page windows within the budget (a single oversized page stands alone)."""
+        windows = []
+        window_start = start_page
+        for page in range(start_page + 1, end_page + 1):
+            if not self.fits(window_start, page):
+                windows.append((window_start, page - 1))
+                window_start = page
+        windows.append((window_start, end_page))
+        return windows
+
+
+def _split(start_page: int, end_page: int, children: list[_TocNode], budget: _Budget) -> list[tuple[int, int]]:
+    """Split a page range at its TOC children (recursively) or into page windows."""
+    if budget.fits(start_page, end_page):
+        return [(start_page, end_page)]
+
+    inner = [child for child in children if start_page < child.page <= end_page]
+    if not inner:
+        return budget.windows(start_page, end_page)
+
+    # Pages before the first child (the chapter's own introduction) form their own piece
+    pieces = []
+    if inner[0].page > start_page:
+        pieces.extend(_split(start_page, inner[0].page - 1, [], budget))
+    for i, child in enumerate(inner):
+        child_end = inner[i + 1].page - 1 if i + 1 < len(inner) else end_page
+        if child_end >= child.page:
+            pieces.extend(_split(child.page, child_end, child.children, budget))
+    return pieces
+
+
+def _pack(pieces: list[tuple[int, int]], budget: _Budget) -> list[tuple[int, int]]:
+    """Merge consecutive pieces while the merged range stays within the budget."""
+    packed = [pieces[0]]
+    for start_page, end_page in pieces[1:]:
+        if budget.fits(packed[-1][0], end_page):
+            packed[-1] = (packed[-1][0], end_page)
+        else:
+            packed.append((start_page, end_page))
+    return packed
+
+
+def plan_sections(
+    toc: list,
+    page_count: int,
+    page_sizes: list[int],
+    max_pages: int = CHAPTER_MAX_PAGES,
+    max_mb: float = CHAPTER_MAX_MB,
+) -> list[Section]:
+    """Plan the sections for chapter-based conversion.
+
+    Each top-level TOC chapter (from its first page up to the next chapter)
+    becomes one or more sections, all titled with the chapter's title.
+    Pages before the first chapter are not covered.
+    """
+    budget = _Budget(page_sizes, max_pages, max_mb * 1024 * 1024)
+    chapters = [node for node in _toc_tree(toc) if node.level == 1 and node.page >= 1]
+
+    sections = []
+    for i, chapter in enumerate(chapters):
+        end_page = chapters[i + 1].page - 1 if i + 1 < len(chapters) else page_count
+        if end_page < chapter.page:
+            continue
+        pieces = _pack(_split(chapter.page, end_page, chapter.children, budget), budget)
+        sections.extend(Section(chapter.title, start_page, end) for start_page, end in pieces)
+    return sections
@@ -0,0 +1,174 @@
+"""Persisted extraction results for re-chunking without re-parsing.
+
+An extraction artifact records what the extractors got out of a PDF: the
+text layer of every page, the route each page took, the TOC (headings with
+page provenance) and, for pages converted by Docling, the serialized
+DoclingDocument. Changing the chunker then only needs the artifact, not the
+PDF.
+
+Artifacts are gzip-compressed JSON Lines written to the documents container
+under extractions/<version guid>/. The first line is a header; each further
+line is one page, in page order, so neither writing nor reading needs the
+whole artifact in memory.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+
+from techpubs_core import DOCUMENTS_CONTAINER
+
+from blob_cache import get_blob_fetcher, get_blob_service_client
+from page_classifier import (
+    SCANNED_MAX_TEXT_CHARS,
+    SCANNED_MIN_IMAGE_COVERAGE,
+    TABLE_MIN_HORIZONTAL_RULES,
+    TABLE_MIN_VERTICAL_RULES,
+)
+from profiles import ExtractionProfile
+
+# Bump whenever a code change alters what is extracted from the same PDF
+EXTRACTOR_VERSION = 2
+
+ARTIFACT_FORMAT = 1
+
+
+def extractor_fingerprint(profile: ExtractionProfile) -> str:
+    """Fingerprint of the extractor code version, page routing and Docling profile."""
+    config = {
+        "version": EXTRACTOR_VERSION,
+        "profile": asdict(profile),
+        "scanned_max_text_chars": SCANNED_MAX_TEXT_CHARS,
+        "scanned_min_image_coverage": SCANNED_MIN_IMAGE_COVERAGE,
+        "table_min_horizontal_rules": TABLE_MIN_HORIZONTAL_RULES,
+        "table_min_vertical_rules": TABLE_MIN_VERTICAL_RULES,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def artifact_blob_path(version_guid, profile: ExtractionProfile) -> str:
+    """Blob path of a version's artifact for the current extractor and profile.
+
+    The extractor fingerprint is part of the name, so a blob path is never
+    rewritten with different content (which the blob cache relies on).
+    """
+    return f"extractions/{version_guid}/{extractor_fingerprint(profile)}.jsonl.gz"
+
+
+@dataclass
+class ArtifactPage:
+    """One page of an extraction artifact."""
+
+    page_number: int
+    text: str
+    route: str
+    docling_document: dict | None = None
+
+
+class ArtifactWriter:
+    """Streams an artifact to a local temp file, then uploads it."""
+
+    def __init__(self, content_hash: str, page_count: int, toc: list, profile: ExtractionProfile) -> None:
+        tmp_fd, self.path = tempfile.mkstemp(suffix=".jsonl.gz")
+        os.close(tmp_fd)
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        self._page_count = page_count
+        self._next_page = 1
+        self._write({
+            "format": ARTIFACT_FORMAT,
+            "extractor_fingerprint": extractor_fingerprint(profile),
+            "content_hash": content_hash,
+            "page_count": page_count,
+            "toc": toc,
+        })
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+
+    def write_page(self, page: ArtifactPage) -> None:
+        """Append a page. Pages must be written in order, each exactly once."""
+        if page.page_number != self._next_page:
+            raise ValueError(f"Expected page {self._next_page}, got {page.page_number}")
+        self._write({
+            "page": page.page_number,
+            "text": page.text,
+            "route": page.route,
+            "docling": page.docling_document,
+        })
+        self._next_page += 1
+
+    def upload(self, storage_account_url: str, blob_path: str) -> int:
+        """Close the artifact and upload it. Returns the compressed size in bytes."""
+        if self._next_page != self._page_count + 1:
+            raise ValueError(f"Artifact is incomplete ({self._next_page - 1} of {self._page_count} pages)")
+        self._file.close()
+        blob_client = get_blob_service_client(storage_account_url).get_blob_client(DOCUMENTS_CONTAINER, blob_path)
+        with open(self.path, "rb") as f:
+            blob_client.upload_blob(f, overwrite=True)
+        return os.path.getsize(self.path)
+
+    def discard(self) -> None:
+        """Delete the local file."""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class ArtifactReader:
+    """Reads an artifact from a local file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+        if header.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"Unsupported extraction artifact format: {header.get('format')}")
+        self.extractor_fingerprint: str = header["extractor_fingerprint"]
+        self.content_hash: str = header["content_hash"]
+        self.page_count: int = header["page_count"]
+        self.toc: list = header["toc"]
+
+    def pages(self) -> Iterator[ArtifactPage]:
+        """Iterate over the pages in order."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            f.readline()  # header
+            for line in f:
+                record = json.loads(line)
+                yield ArtifactPage(
+                    page_number=record["page"],
+                    text=record["text"],
+                    route=record["route"],
+                    docling_document=record["docling"],
+                )
+
+
+def fetch_artifact(storage_account_url: str, blob_path: str, profile: ExtractionProfile):
+    """Fetch an artifact through the blob cache.
+
+    Returns (ArtifactReader, FetchedBlob), or None if the artifact does not
+    exist or was written by a different extractor or profile. The caller must release
+    the FetchedBlob through the fetcher when done.
+    """
+    fetcher = get_blob_fetcher(storage_account_url)
+    try:
+        fetched = fetcher.fetch(blob_path, suffix=".jsonl.gz")
+    except Exception as e:
+        print(f"Extraction artifact {blob_path} unavailable: {e}")
+        return None
+
+    try:
+        reader = ArtifactReader(fetched.path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ignoring unreadable extraction artifact {blob_path}: {e}")
+        fetcher.release(fetched)
+        return None
+    if reader.extractor_fingerprint != extractor_fingerprint(profile):
+        fetcher.release(fetched)
+        return None
+    return reader, fetched
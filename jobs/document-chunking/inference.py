@@ -0,0 +1,90 @@
+"""CPU inference settings for Docling's layout, table and OCR models.
+
+The chunking workers have no GPU. Models run on CPU with a fixed thread
+budget per process (so chapter pool workers don't oversubscribe the cores),
+pages go through the models in batches, and model weights are read from
+DOCLING_ARTIFACTS_PATH (baked into the image) instead of being downloaded
+at runtime.
+"""
+
+import os
+from pathlib import Path
+
+import torch
+from docling.datamodel.accelerator_options import AcceleratorDevice, AcceleratorOptions
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.datamodel.settings import settings
+
+# Local directory with pre-fetched Docling models (empty = download on first use)
+DOCLING_ARTIFACTS_PATH = os.environ.get("DOCLING_ARTIFACTS_PATH", "")
+
+# Intra-op threads per process (0 = the cores divided among the chapter pool
+# workers) and inter-op threads per process
+INFERENCE_INTRA_OP_THREADS = int(os.environ.get("INFERENCE_INTRA_OP_THREADS", "0"))
+INFERENCE_INTER_OP_THREADS = int(os.environ.get("INFERENCE_INTER_OP_THREADS", "1"))
+
+# Pages per model batch. Larger batches amortize per-call overhead on CPU.
+PAGE_BATCH_SIZE = int(os.environ.get("PAGE_BATCH_SIZE", "8"))
+LAYOUT_BATCH_SIZE = int(os.environ.get("LAYOUT_BATCH_SIZE", "8"))
+TABLE_BATCH_SIZE = int(os.environ.get("TABLE_BATCH_SIZE", "4"))
+OCR_BATCH_SIZE = int(os.environ.get("OCR_BATCH_SIZE", "4"))
+
+
+def intra_op_threads(workers: int) -> int:
+    """Intra-op threads for each of workers processes running models at once."""
+    if INFERENCE_INTRA_OP_THREADS:
+        return INFERENCE_INTRA_OP_THREADS
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def configure_process(threads: int) -> None:
+    """Apply the thread and batch settings to this process.
+
+    Call once per process before any model runs: torch only accepts the
+    inter-op thread count before its inter-op pool has started.
+    """
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(INFERENCE_INTER_OP_THREADS)
+    except RuntimeError:
+        pass  # already started in this process; keep its setting
+    settings.perf.page_batch_size = PAGE_BATCH_SIZE
+
+
+def apply_inference_options(options: PdfPipelineOptions, threads: int) -> PdfPipelineOptions:
+    """Set CPU inference, batch sizes and the local artifacts path on pipeline options."""
+    options.accelerator_options = AcceleratorOptions(num_threads=threads, device=AcceleratorDevice.CPU)
+    options.layout_batch_size = LAYOUT_BATCH_SIZE
+    options.table_batch_size = TABLE_BATCH_SIZE
+    options.ocr_batch_size = OCR_BATCH_SIZE
+    if DOCLING_ARTIFACTS_PATH:
+        options.artifacts_path = DOCLING_ARTIFACTS_PATH
+    return options
+
+
+def check_artifacts() -> list[str]:
+    """Problems with the local model artifacts (empty if they look usable)."""
+    if not DOCLING_ARTIFACTS_PATH:
+        return ["DOCLING_ARTIFACTS_PATH is not set; models are downloaded on first use"]
+    path = Path(DOCLING_ARTIFACTS_PATH)
+    if not path.is_dir():
+        return [f"DOCLING_ARTIFACTS_PATH {path} does not exist"]
+    if not any(path.iterdir()):
+        return [f"DOCLING_ARTIFACTS_PATH {path} is empty"]
+    return []
+
+
+def report(threads: int, load_seconds: float | None) -> dict:
+    """Inference configuration of this process, for the startup self-check."""
+    return {
+        "device": "cpu",
+        "cuda_available": torch.cuda.is_available(),
+        "torch": torch.__version__,
+        "intra_op_threads": torch.get_num_threads(),
+        "configured_threads": threads,
+        "inter_op_threads": torch.get_num_interop_threads(),
+        "page_batch_size": PAGE_BATCH_SIZE,
+        "layout_batch_size": LAYOUT_BATCH_SIZE,
+        "artifacts_path": DOCLING_ARTIFACTS_PATH or None,
+        "model_load_seconds": round(load_seconds, 3) if load_seconds is not None else None,
+    }
@@ -1,29 +1,64 @@
+import hashlib
+import heapq
+import json
+import math
 import os
 import re
 import sys
-import tempfile
+import time
 import traceback
-from collections.abc import Iterator
-from datetime import datetime
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
-import fitz  # PyMuPDF
-from azure.storage.blob import BlobServiceClient
 import tiktoken
 from docling.chunking import HybridChunker
-from docling.document_converter import DocumentConverter
+from docling.datamodel.base_models import DocumentStream, InputFormat
+from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling_core.transforms.chunker.tokenizer.openai import OpenAITokenizer
+from docling_core.types.doc import DoclingDocument
+from sqlalchemy import func, or_
 
 from techpubs_core import (
-    DOCUMENTS_CONTAINER,
     DocumentChunk,
     DocumentJob,
     DocumentVersion,
+    JobMessage,
     JobQueueConsumer,
     JobQueueProducer,
-    get_credential,
+    VisibilityRenewer,
+    bulk_copy_chunks,
+    bulk_insert_chunks,
     get_session,
+    invalidate_search_cache_for_job,
+    renumber_chunks,
 )
+from techpubs_core.embedding_models import (
+    STORAGE_CHUNKS,
+    chunk_has_embedding,
+    get_active_embedding_model,
+    write_embeddings,
+)
+from techpubs_core.embeddings import generate_embeddings_batch
+
+from admission import Admission, AdmissionController, estimate_document_mb
+from blob_cache import get_blob_fetcher
+from extraction_artifact import (
+    ArtifactPage,
+    ArtifactReader,
+    ArtifactWriter,
+    artifact_blob_path,
+    extractor_fingerprint,
+    fetch_artifact,
+)
+from chapter_planner import CHAPTER_MAX_MB, CHAPTER_MAX_PAGES, page_byte_sizes, plan_sections
+from inference import check_artifacts, configure_process, intra_op_threads, report
+from page_classifier import SCANNED_MAX_TEXT_CHARS, classify_pages
+from profiles import DEFAULT_PROFILE, ExtractionProfile, profile_for_document_type
+from pdf_session import PdfSession, chapter_stream
 
 # OpenAI text-embedding-3-small model parameters
 # - Max input: 8191 tokens
@@ -35,133 +70,349 @@ EMBEDDING_MODEL_MAX_TOKENS = 1000
 # Batch size for embedding jobs (number of chunks per job)
 EMBEDDING_BATCH_SIZE = 500
 
+# Bump whenever a code change alters the chunks produced for the same input.
+# Stored chunk sets stamped with an older fingerprint are re-chunked.
+CHUNKER_VERSION = 4
+
 # Thresholds for determining large PDFs (configurable via env vars)
 LARGE_PDF_PAGE_THRESHOLD = int(os.environ.get("LARGE_PDF_PAGE_THRESHOLD", "100"))
 LARGE_PDF_SIZE_MB_THRESHOLD = int(os.environ.get("LARGE_PDF_SIZE_MB_THRESHOLD", "10"))
 
-
-def download_blob_to_file(storage_account_url: str, blob_path: str, file_path: str) -> int:
-    """Download blob content from Azure Blob Storage directly to a file.
-
-    Returns the number of bytes downloaded.
-    """
-    credential = get_credential()
-    blob_service_client = BlobServiceClient(storage_account_url, credential=credential)
-    blob_client = blob_service_client.get_blob_client(DOCUMENTS_CONTAINER, blob_path)
-
-    with open(file_path, "wb") as f:
-        stream = blob_client.download_blob()
-        stream.readinto(f)
-        return stream.size
-
-
-def analyze_pdf(file_path: str) -> dict:
+# Process pool settings for the simple page-based strategy.
+# Set SIMPLE_CHUNKING_WORKERS=1 to force serial extraction.
+SIMPLE_CHUNKING_WORKERS = int(os.environ.get("SIMPLE_CHUNKING_WORKERS", str(os.cpu_count() or 1)))
+SIMPLE_PARALLEL_MIN_PAGES = int(os.environ.get("SIMPLE_PARALLEL_MIN_PAGES", "50"))
+SIMPLE_SPANS_PER_WORKER = 4
+
+# Process pool settings for the chapter-based Docling strategy.
+# Chapters are only admitted while the summed per-chapter memory estimate
+# stays under CHAPTER_MEMORY_BUDGET_MB.
+CHAPTER_WORKERS = int(os.environ.get("CHAPTER_WORKERS", str(os.cpu_count() or 1)))
+CHAPTER_MEMORY_BUDGET_MB = int(os.environ.get("CHAPTER_MEMORY_BUDGET_MB", "6144"))
+CHAPTER_BASE_MEMORY_MB = int(os.environ.get("CHAPTER_BASE_MEMORY_MB", "1500"))
+CHAPTER_PAGE_MEMORY_MB = float(os.environ.get("CHAPTER_PAGE_MEMORY_MB", "15"))
+
+# Load the default profile's models at startup and report the load time
+# (python main.py --self-check does the same and exits)
+CHUNKING_SELF_CHECK = os.environ.get("CHUNKING_SELF_CHECK", "1") == "1"
+
+# Number of queue messages a single container run processes. Models loaded
+# by the extraction context are reused across all of them.
+CHUNKING_MAX_MESSAGES = int(os.environ.get("CHUNKING_MAX_MESSAGES", "1"))
+
+# Number of those messages processed at once, each in its own process.
+# Documents beyond the first are admitted against CHUNKING_RSS_BUDGET_MB
+# (see admission.py). Each process runs its own chapter pool of
+# CHAPTER_WORKERS; inference threads are split across all of those workers.
+CHUNKING_CONCURRENCY = int(os.environ.get("CHUNKING_CONCURRENCY", "1"))
+
+# Documents at or under both limits are embedded inline by the chunking job
+# instead of fanning out to the embedding queue (0 pages disables this)
+INLINE_EMBEDDING_MAX_PAGES = int(os.environ.get("INLINE_EMBEDDING_MAX_PAGES", "20"))
+INLINE_EMBEDDING_MAX_TOKENS = int(os.environ.get("INLINE_EMBEDDING_MAX_TOKENS", "50000"))
+
+# Queue messages stay hidden for CHUNKING_VISIBILITY_TIMEOUT seconds and are
+# renewed while their jobs run, so a message only reappears when its replica
+# is gone (it then reappears at least 4/5 of the timeout after the last renewal).
+CHUNKING_VISIBILITY_TIMEOUT = int(os.environ.get("CHUNKING_VISIBILITY_TIMEOUT", "600"))
+
+# Chunking jobs commit their chunks with a checkpoint between sections (chapter
+# strategy) or pages (page-based strategies), at most every
+# CHUNKING_CHECKPOINT_SECONDS for pages. A job left "running" with no commit
+# for CHUNKING_STALE_SECONDS is taken to be dead and is resumed when its
+# message is redelivered. Keep it under 4/5 of CHUNKING_VISIBILITY_TIMEOUT so
+# a redelivered message finds its dead job stale.
+CHUNKING_CHECKPOINT_SECONDS = int(os.environ.get("CHUNKING_CHECKPOINT_SECONDS", "30"))
+CHUNKING_STALE_SECONDS = int(os.environ.get("CHUNKING_STALE_SECONDS", "300"))
+
+# Documents of at least CHUNKING_FANOUT_MIN_PAGES pages (page-based
+# strategies) are split into page-range jobs of about CHUNKING_FANOUT_PAGES
+# pages that any replica can pick up from the chunking queue. The last range
+# job to finish numbers the chunks and creates the embedding jobs.
+# 0 disables the split.
+CHUNKING_FANOUT_MIN_PAGES = int(os.environ.get("CHUNKING_FANOUT_MIN_PAGES", "1000"))
+CHUNKING_FANOUT_PAGES = int(os.environ.get("CHUNKING_FANOUT_PAGES", "200"))
+
+# Chunk key identifying the checkpoint unit of each resumable strategy
+CHECKPOINT_UNIT_KEYS = {
+    "chapter": "section_number",
+    "routed": "page_number",
+    "simple": "page_number",
+}
+
+_chapter_pool: ProcessPoolExecutor | None = None
+_chapter_pool_workers = 0
+
+# Shared admission controller, set in document processes (see process_messages)
+_admission_controller: AdmissionController | None = None
+
+
+def analyze_pdf(pdf: PdfSession) -> dict:
     """Analyze PDF for size and TOC to determine chunking strategy."""
-    doc = fitz.open(file_path)
-    file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-    toc = doc.get_toc()  # [[level, title, page], ...]
-    page_count = len(doc)
-
-    is_large = page_count > LARGE_PDF_PAGE_THRESHOLD or file_size_mb > LARGE_PDF_SIZE_MB_THRESHOLD
+    is_large = pdf.page_count > LARGE_PDF_PAGE_THRESHOLD or pdf.file_size_mb > LARGE_PDF_SIZE_MB_THRESHOLD
 
     # Filter to top-level chapters (level 1)
-    chapters = [{"title": t[1], "page": t[2]} for t in toc if t[0] == 1]
+    chapters = [{"title": t[1], "page": t[2]} for t in pdf.toc if t[0] == 1]
     has_valid_toc = len(chapters) >= 2
 
-    doc.close()
+    # Embedded images drive rendering and layout memory (shared images count once per page)
+    image_count = sum(len(pdf.doc.get_page_images(page_index)) for page_index in range(pdf.page_count))
 
     return {
-        "page_count": page_count,
-        "file_size_mb": file_size_mb,
+        "page_count": pdf.page_count,
+        "file_size_mb": pdf.file_size_mb,
+        "image_count": image_count,
         "is_large": is_large,
         "has_toc": has_valid_toc,
         "chapters": chapters,
     }
 
 
-def extract_chapter_pdf(source_path: str, start_page: int, end_page: int) -> str:
-    """Extract page range to temp PDF file. Returns temp file path."""
-    doc = fitz.open(source_path)
-    new_doc = fitz.open()
-    new_doc.insert_pdf(doc, from_page=start_page - 1, to_page=end_page - 1)
+def _chunk_page_text(text: str, max_tokens: int, encoding) -> list[tuple[str, int]]:
+    """Split one page of text into sentence-boundary chunks of at most max_tokens.
 
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-        new_doc.save(tmp.name)
-        new_doc.close()
-        doc.close()
-        return tmp.name
+    Every sentence on the page is encoded once, in a single batch, with the
+    leading space it has when joined into a chunk. tiktoken never merges
+    tokens across a space that follows sentence punctuation, so the sum of
+    the sentence counts is the exact token count of the joined chunk. Only
+    the first sentence of each chunk, which is joined without that space, is
+    re-encoded. A single sentence longer than max_tokens becomes its own chunk.
 
+    Returns:
+        List of (content, token_count) tuples
+    """
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    spaced_counts = [len(tokens) for tokens in encoding.encode_ordinary_batch([" " + s for s in sentences])]
 
-def extract_text_chunks_simple(file_path: str, max_tokens: int = EMBEDDING_MODEL_MAX_TOKENS) -> Iterator[dict]:
-    """Page-based text extraction with sentence-boundary chunking.
+    page_chunks = []
+    current_chunk = []
+    current_tokens = 0
+
+    for sentence, spaced_tokens in zip(sentences, spaced_counts):
+        if current_chunk and current_tokens + spaced_tokens > max_tokens:
+            page_chunks.append((" ".join(current_chunk), current_tokens))
+            current_chunk, current_tokens = [], 0
+        if current_chunk:
+            current_tokens += spaced_tokens
+        else:
+            current_tokens = len(encoding.encode_ordinary(sentence))
+        current_chunk.append(sentence)
+
+    if current_chunk:
+        page_chunks.append((" ".join(current_chunk), current_tokens))
+
+    return page_chunks
+
+
+def _chunk_texts(page_texts: list[str], max_tokens: int) -> list[list[tuple[str, int]]]:
+    """Process pool worker: chunk a span of page texts.
 
-    Used for large PDFs without a valid TOC.
+    Returns one list of (content, token_count) tuples per page, in input order.
     """
-    doc = fitz.open(file_path)
-    chunk_index = 0
+    encoding = get_extraction_context().encoding
+    return [_chunk_page_text(text, max_tokens, encoding) for text in page_texts]
 
-    for page_num in range(len(doc)):
-        text = doc[page_num].get_text("text")
-        sentences = re.split(r'(?<=[.!?])\s+', text)
 
-        current_chunk = []
-        current_tokens = 0
+def _page_span_size(page_count: int, workers: int) -> int:
+    """Pages per process pool task.
 
-        for sentence in sentences:
-            tokens = len(sentence.split())
-            if current_tokens + tokens > max_tokens and current_chunk:
-                yield {
-                    "content": " ".join(current_chunk),
-                    "chunk_index": chunk_index,
-                    "page_number": page_num + 1,
-                }
-                chunk_index += 1
-                current_chunk, current_tokens = [], 0
-            current_chunk.append(sentence)
-            current_tokens += tokens
+    Uses several spans per worker so a few dense pages don't leave the
+    other workers idle.
+    """
+    return max(1, math.ceil(page_count / (workers * SIMPLE_SPANS_PER_WORKER)))
+
+
+def load_page_texts(
+    pdf: PdfSession,
+    page_indexes: list[int],
+    workers: int = SIMPLE_CHUNKING_WORKERS,
+) -> list[str]:
+    """Get page texts from the session, extracting many uncached pages in a process pool."""
+    missing = pdf.uncached_pages(page_indexes)
+    if workers > 1 and len(missing) >= SIMPLE_PARALLEL_MIN_PAGES:
+        print(f"  Extracting text of {len(missing)} pages with {workers} workers")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return pdf.page_texts(page_indexes, executor, _page_span_size(len(missing), workers))
+    return pdf.page_texts(page_indexes)
+
+
+def extract_text_chunks_simple(
+    pdf: PdfSession,
+    max_tokens: int = EMBEDDING_MODEL_MAX_TOKENS,
+    workers: int = SIMPLE_CHUNKING_WORKERS,
+    pages: list[int] | None = None,
+    start_chunk_index: int = 0,
+) -> Iterator[dict]:
+    """Page-based text extraction with sentence-boundary chunking.
 
-        if current_chunk:
+    Used for large PDFs without a valid TOC. Chunks are packed by real
+    tiktoken token counts, which are returned in each chunk's 'token_count'
+    so storage does not tokenize the text again. Page text comes from the
+    session's cache, so pages already read for fingerprinting are not
+    extracted again. When workers > 1 and there are enough pages, text
+    extraction and chunking run in process pools; results are merged back
+    in page order so the output is identical to the serial path.
+
+    Args:
+        pdf: Open PDF session.
+        max_tokens: Maximum chunk size.
+        workers: Process pool size (1 = serial).
+        pages: Optional 1-based page numbers to extract. Defaults to all pages.
+        start_chunk_index: chunk_index of the first chunk produced.
+    """
+    if pages is None:
+        page_indexes = list(range(pdf.page_count))
+    else:
+        page_indexes = sorted(page_number - 1 for page_number in pages)
+
+    page_texts = load_page_texts(pdf, page_indexes, workers)
+
+    if workers > 1 and len(page_indexes) >= SIMPLE_PARALLEL_MIN_PAGES:
+        span_size = _page_span_size(len(page_indexes), workers)
+        print(f"  Chunking {len(page_indexes)} pages with {workers} workers ({span_size} pages per task)")
+
+        def page_results() -> Iterator[list[tuple[str, int]]]:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_chunk_texts, page_texts[start:start + span_size], max_tokens)
+                    for start in range(0, len(page_texts), span_size)
+                ]
+                for future in futures:
+                    yield from future.result()
+    else:
+        encoding = get_extraction_context().encoding
+
+        def page_results() -> Iterator[list[tuple[str, int]]]:
+            for text in page_texts:
+                yield _chunk_page_text(text, max_tokens, encoding)
+
+    chunk_index = start_chunk_index
+    for page_index, page_chunks in zip(page_indexes, page_results()):
+        for content, token_count in page_chunks:
             yield {
-                "content": " ".join(current_chunk),
+                "content": content,
                 "chunk_index": chunk_index,
-                "page_number": page_num + 1,
+                "page_number": page_index + 1,
+                "token_count": token_count,
             }
             chunk_index += 1
 
-    doc.close()
 
+class ExtractionContext:
+    """Process-wide Docling converter and tokenizer state.
+
+    Layout models and tokenizers are loaded lazily on first use and then
+    reused for every chapter and every message handled by this process
+    (including pool worker processes, which each hold their own context).
+    There is one converter per extraction profile. Models run on CPU with
+    this process's share of the cores (see inference.py).
+    """
+
+    def __init__(self) -> None:
+        # Up to CHUNKING_CONCURRENCY documents each run a pool of CHAPTER_WORKERS
+        self.inference_threads = intra_op_threads(max(1, CHUNKING_CONCURRENCY) * CHAPTER_WORKERS)
+        configure_process(self.inference_threads)
+        self._encoding = None
+        self._converters: dict[ExtractionProfile, DocumentConverter] = {}
+        self._chunker: HybridChunker | None = None
+        self.model_load_seconds = 0.0
+        # Profile name -> [pages converted, conversion seconds], summed over workers
+        self.conversion_stats: dict[str, list] = {}
+
+    @property
+    def encoding(self):
+        """tiktoken encoding matching the embedding model."""
+        if self._encoding is None:
+            start_time = time.perf_counter()
+            self._encoding = tiktoken.get_encoding(EMBEDDING_MODEL_TOKENIZER)
+            self.model_load_seconds += time.perf_counter() - start_time
+        return self._encoding
+
+    def converter(self, profile: ExtractionProfile = DEFAULT_PROFILE) -> DocumentConverter:
+        """Docling converter for a profile, with its PDF pipeline (layout/table models) loaded."""
+        converter = self._converters.get(profile)
+        if converter is None:
+            start_time = time.perf_counter()
+            converter = DocumentConverter(
+                format_options={
+                    InputFormat.PDF: PdfFormatOption(pipeline_options=profile.pipeline_options(self.inference_threads))
+                }
+            )
+            converter.initialize_pipeline(InputFormat.PDF)
+            self._converters[profile] = converter
+            elapsed = time.perf_counter() - start_time
+            self.model_load_seconds += elapsed
+            print(f"Loaded Docling models for the {profile.name} profile in {elapsed:.2f}s")
+        return converter
+
+    def record_conversion(self, profile: ExtractionProfile, pages: int, seconds: float) -> None:
+        """Add a Docling conversion to the per-profile throughput totals."""
+        stats = self.conversion_stats.setdefault(profile.name, [0, 0.0])
+        stats[0] += pages
+        stats[1] += seconds
+
+    @property
+    def chunker(self) -> HybridChunker:
+        """HybridChunker using the embedding model's tokenizer."""
+        if self._chunker is None:
+            # Use OpenAI's cl100k_base tokenizer (used by text-embedding-3-small)
+            # max_tokens is required for OpenAI tokenizers
+            tokenizer = OpenAITokenizer(
+                tokenizer=self.encoding,
+                max_tokens=EMBEDDING_MODEL_MAX_TOKENS,
+            )
+
+            # Use HybridChunker with tokenizer matching our embedding model
+            # This ensures chunks are properly sized for embedding and respect document structure
+            self._chunker = HybridChunker(
+                tokenizer=tokenizer,
+                merge_peers=True,
+            )
+        return self._chunker
+
+
+@lru_cache(maxsize=1)
+def get_extraction_context() -> ExtractionContext:
+    """Get the extraction context for this process."""
+    return ExtractionContext()
 
-def extract_text_chunks_docling(file_path: str) -> Iterator[dict]:
+
+def extract_text_chunks_docling(
+    source: str | DocumentStream,
+    profile: ExtractionProfile = DEFAULT_PROFILE,
+) -> Iterator[dict]:
     """
     Extract text chunks from document using Docling's HybridChunker.
 
     Uses tokenizer-aware chunking that respects document structure (headings,
     sections, paragraphs) and produces chunks sized appropriately for the
-    embedding model (text-embedding-3-small).
+    embedding model (text-embedding-3-small). The converter, tokenizer and
+    chunker come from the process-wide extraction context.
 
     Args:
-        file_path: Path to the document file to process.
+        source: Path to the document file, or an in-memory DocumentStream.
+        profile: Docling pipeline configuration to convert with.
 
     Yields dicts with 'content', 'page_number', and 'chunk_index' keys.
     """
-    converter = DocumentConverter()
-    result = converter.convert(file_path)
+    context = get_extraction_context()
+    converter = context.converter(profile)
+    start_time = time.perf_counter()
+    result = converter.convert(source)
+    context.record_conversion(profile, result.document.num_pages(), time.perf_counter() - start_time)
+    yield from chunk_docling_document(result.document)
 
-    # Use OpenAI's cl100k_base tokenizer (used by text-embedding-3-small)
-    # max_tokens is required for OpenAI tokenizers
-    tokenizer = OpenAITokenizer(
-        tokenizer=tiktoken.get_encoding(EMBEDDING_MODEL_TOKENIZER),
-        max_tokens=EMBEDDING_MODEL_MAX_TOKENS,
-    )
 
-    # Use HybridChunker with tokenizer matching our embedding model
-    # This ensures chunks are properly sized for embedding and respect document structure
-    chunker = HybridChunker(
-        tokenizer=tokenizer,
-        merge_peers=True,
-    )
+def chunk_docling_document(document: DoclingDocument) -> Iterator[dict]:
+    """Chunk a converted (or deserialized) DoclingDocument with the HybridChunker.
+
+    Yields dicts with 'content', 'page_number', 'chunk_index' and 'token_count' keys.
+    """
+    context = get_extraction_context()
+    chunker = context.chunker
+    enc = context.encoding
 
-    for chunk_index, chunk in enumerate(chunker.chunk(dl_doc=result.document)):
+    for chunk_index, chunk in enumerate(chunker.chunk(dl_doc=document)):
         # Use contextualize() to get context-enriched text that includes
         # heading hierarchy for better semantic search
         print(f"Processing chunk {chunk_index} of length {len(chunk.text)}")
@@ -171,7 +422,6 @@ def extract_text_chunks_docling(file_path: str) -> Iterator[dict]:
 
         # Truncate to model's max sequence length if needed
         # This can happen when contextualize() adds long heading hierarchies
-        enc = tiktoken.get_encoding(EMBEDDING_MODEL_TOKENIZER)
         tokens = enc.encode(content)
         if len(tokens) > EMBEDDING_MODEL_MAX_TOKENS:
             tokens = tokens[:EMBEDDING_MODEL_MAX_TOKENS]
@@ -190,64 +440,510 @@ def extract_text_chunks_docling(file_path: str) -> Iterator[dict]:
             "content": content,
             "chunk_index": chunk_index,
             "page_number": page_number,
+            "token_count": len(tokens),
         }
 
 
-def extract_text_chunks_by_chapter(file_path: str, analysis: dict) -> Iterator[dict]:
-    """Process chapters sequentially with Docling.
+def estimate_chapter_memory_mb(page_count: int) -> float:
+    """Rough peak memory estimate for converting one chapter with Docling."""
+    return CHAPTER_BASE_MEMORY_MB + page_count * CHAPTER_PAGE_MEMORY_MB
+
+
+def _convert_chapter(
+    start_page: int,
+    end_page: int,
+    pdf_bytes: bytes,
+    keep_document: bool = False,
+    profile: ExtractionProfile = DEFAULT_PROFILE,
+) -> tuple[list[dict], float, float, dict | None]:
+    """Process pool worker: convert and chunk one chapter with Docling.
+
+    The chapter arrives as serialized PDF bytes sliced by the parent's
+    PdfSession, so workers never reopen the full source document.
+
+    Returns the chapter's chunks, the model load time this call incurred
+    (non-zero only the first time a worker process loads the profile's
+    models), the conversion time and, if keep_document is set, the
+    serialized DoclingDocument.
+    """
+    context = get_extraction_context()
+    load_seconds_before = context.model_load_seconds
+    converter = context.converter(profile)
+    load_seconds = context.model_load_seconds - load_seconds_before
+
+    start_time = time.perf_counter()
+    result = converter.convert(chapter_stream(start_page, end_page, pdf_bytes))
+    convert_seconds = time.perf_counter() - start_time
+    chunks = list(chunk_docling_document(result.document))
+    document = result.document.export_to_dict() if keep_document else None
+
+    return chunks, load_seconds, convert_seconds, document
+
+
+def get_chapter_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the process-wide chapter pool.
+
+    The pool outlives a single job so each worker keeps its extraction
+    context (and loaded models) warm across chapters and messages.
+    """
+    global _chapter_pool, _chapter_pool_workers
+    if _chapter_pool is None or _chapter_pool_workers != workers:
+        shutdown_chapter_pool()
+        _chapter_pool = ProcessPoolExecutor(max_workers=workers)
+        _chapter_pool_workers = workers
+    return _chapter_pool
+
+
+def shutdown_chapter_pool() -> None:
+    """Shut down the chapter pool, if one was started."""
+    global _chapter_pool, _chapter_pool_workers
+    if _chapter_pool is not None:
+        _chapter_pool.shutdown(cancel_futures=True)
+        _chapter_pool = None
+        _chapter_pool_workers = 0
+
+
+def _iter_chapter_results(
+    pdf: PdfSession,
+    page_ranges: list[tuple[int, int]],
+    workers: int,
+    memory_budget_mb: int,
+    keep_documents: bool = False,
+    profiles: list[ExtractionProfile] | None = None,
+) -> Iterator[tuple[list[dict], dict | None]]:
+    """Convert chapters and yield (chunks, serialized document) in chapter order.
+
+    The serialized DoclingDocument is only produced with keep_documents.
+    profiles gives each chapter's extraction profile (default: the default
+    profile for all); conversion throughput is recorded per profile on the
+    extraction context.
+
+    With more than one worker, chapters are submitted to the shared chapter
+    pool while the summed memory estimate of in-flight chapters stays under
+    the budget.
+    A chapter is always admitted when nothing else is running, so a single
+    oversized chapter still makes progress. Results that finish early are
+    buffered until every preceding chapter has been yielded. Chapters are
+    sliced from the open session only when they are submitted.
+    """
+    if profiles is None:
+        profiles = [DEFAULT_PROFILE] * len(page_ranges)
+    context = get_extraction_context()
+
+    if workers <= 1 or len(page_ranges) < 2:
+        for (start_page, end_page), profile in zip(page_ranges, profiles):
+            chunks, _, convert_seconds, document = _convert_chapter(
+                start_page, end_page, pdf.slice_bytes(start_page, end_page), keep_documents, profile
+            )
+            context.record_conversion(profile, end_page - start_page + 1, convert_seconds)
+            yield chunks, document
+        return
+
+    executor = get_chapter_pool(workers)
+
+    pending: dict[Future, tuple[int, float]] = {}
+    results: dict[int, tuple[list[dict], dict | None]] = {}
+    in_flight_mb = 0.0
+    next_submit = 0
+    next_yield = 0
+
+    try:
+        while next_yield < len(page_ranges):
+            while next_submit < len(page_ranges) and len(pending) < workers:
+                start_page, end_page = page_ranges[next_submit]
+                estimate_mb = estimate_chapter_memory_mb(end_page - start_page + 1)
+                if pending and in_flight_mb + estimate_mb > memory_budget_mb:
+                    break
+                future = executor.submit(
+                    _convert_chapter,
+                    start_page,
+                    end_page,
+                    pdf.slice_bytes(start_page, end_page),
+                    keep_documents,
+                    profiles[next_submit],
+                )
+                pending[future] = (next_submit, estimate_mb)
+                in_flight_mb += estimate_mb
+                next_submit += 1
+
+            if next_yield not in results:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, estimate_mb = pending.pop(future)
+                    in_flight_mb -= estimate_mb
+                    chunks, worker_load_seconds, convert_seconds, document = future.result()
+                    results[index] = (chunks, document)
+                    context.model_load_seconds += worker_load_seconds
+                    start_page, end_page = page_ranges[index]
+                    context.record_conversion(profiles[index], end_page - start_page + 1, convert_seconds)
+
+            while next_yield in results:
+                yield results.pop(next_yield)
+                next_yield += 1
+    except BrokenProcessPool:
+        # A worker died (usually OOM); start a fresh pool for the next job
+        shutdown_chapter_pool()
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def extract_text_chunks_by_chapter(
+    pdf: PdfSession,
+    analysis: dict,
+    workers: int = CHAPTER_WORKERS,
+    memory_budget_mb: int = CHAPTER_MEMORY_BUDGET_MB,
+    start_section: int = 1,
+    start_chunk_index: int = 0,
+    profile: ExtractionProfile = DEFAULT_PROFILE,
+) -> Iterator[dict]:
+    """Process chapters with Docling, optionally in parallel.
 
     Splits large PDFs by TOC chapters and processes each chapter separately
-    to avoid memory issues with very large documents.
+    to avoid memory issues with very large documents. Chapters over the
+    CHAPTER_MAX_PAGES / CHAPTER_MAX_MB budget are split further at deeper TOC
+    levels or into page windows (see chapter_planner); their chunks keep the
+    top-level chapter_title. Sections may finish out of order in the process
+    pool, but are re-sequenced so chunk_index and chapter_title match the
+    serial path. Each chunk carries its 1-based 'section_number';
+    start_section and start_chunk_index continue an interrupted run after its
+    last completed section. Every section is converted with the given profile.
+    """
+    sections = plan_sections(pdf.toc, analysis["page_count"], page_byte_sizes(pdf))
+    chapter_count = len({section.title for section in sections})
+    print(f"  Planned {len(sections)} sections for {chapter_count} chapters")
+
+    if workers > 1:
+        print(f"  Converting {len(sections)} sections with up to {workers} workers ({memory_budget_mb}MB budget)")
+
+    chunk_index = start_chunk_index
+    section_numbers = range(start_section, len(sections) + 1)
+    section_results = _iter_chapter_results(
+        pdf,
+        [(sections[number - 1].start_page, sections[number - 1].end_page) for number in section_numbers],
+        workers,
+        memory_budget_mb,
+        profiles=[profile] * len(section_numbers),
+    )
+
+    for section_number, (section_chunks, _) in zip(section_numbers, section_results):
+        section = sections[section_number - 1]
+        print(
+            f"  Processed chapter: {section.title} "
+            f"(pages {section.start_page}-{section.end_page}, {len(section_chunks)} chunks)"
+        )
+
+        for chunk in section_chunks:
+            page_number = chunk["page_number"]
+            yield {
+                "content": chunk["content"],
+                "chunk_index": chunk_index,
+                # Docling numbers pages within the section's slice
+                "page_number": section.start_page + page_number - 1 if page_number is not None else None,
+                "chapter_title": section.title,
+                "section_number": section_number,
+                "token_count": chunk["token_count"],
+            }
+            chunk_index += 1
+
+
+def extract_text_chunks_routed(
+    pdf: PdfSession,
+    pages: list[int] | None = None,
+    workers: int = CHAPTER_WORKERS,
+    memory_budget_mb: int = CHAPTER_MEMORY_BUDGET_MB,
+    artifact: ArtifactWriter | None = None,
+    start_chunk_index: int = 0,
+    profile: ExtractionProfile = DEFAULT_PROFILE,
+) -> Iterator[dict]:
+    """Route each page to the fast text-layer extractor or to Docling.
+
+    Pages are profiled with fitz (text-layer density, image coverage,
+    ruling lines). Pages with a clean text layer go through the simple
+    extractor; scanned and table-heavy pages are converted by Docling, one
+    page per task in the shared chapter pool. Converting pages individually
+    keeps every chunk within a single page, so the result can still be
+    diffed page by page against the previous version.
+
+    Args:
+        pdf: Open PDF session.
+        pages: Optional 1-based page numbers to extract. Defaults to all pages.
+        workers: Process pool size for Docling pages (1 = serial).
+        memory_budget_mb: Memory budget for in-flight Docling pages.
+        artifact: Optional writer receiving every page's text, route and
+            Docling document as the pages are consumed (all pages only).
+        start_chunk_index: chunk_index of the first chunk produced.
+        profile: Document's extraction profile. Scanned pages always get OCR
+            and table pages table structure (see ExtractionProfile.for_route).
     """
-    chapters = analysis["chapters"]
-    total_pages = analysis["page_count"]
+    if artifact is not None and pages is not None:
+        raise ValueError("Extraction artifacts cover whole documents")
+    page_numbers = sorted(pages) if pages is not None else list(range(1, pdf.page_count + 1))
+
+    page_texts = load_page_texts(pdf, [page_number - 1 for page_number in page_numbers])
+    profiles = classify_pages(pdf, page_numbers)
+    docling_pages = [page_number for page_number in page_numbers if profiles[page_number].needs_docling]
+    text_pages = [page_number for page_number in page_numbers if not profiles[page_number].needs_docling]
+
+    routes: dict[str, int] = {}
+    for page_profile in profiles.values():
+        routes[page_profile.route] = routes.get(page_profile.route, 0) + 1
+    print(f"  Page routing: {routes} ({len(docling_pages)} pages to Docling)")
+
+    text_chunks_by_page: dict[int, list[dict]] = {}
+    if text_pages:
+        for chunk in extract_text_chunks_simple(pdf, pages=text_pages):
+            text_chunks_by_page.setdefault(chunk["page_number"], []).append(chunk)
+
+    docling_results = _iter_chapter_results(
+        pdf,
+        [(page_number, page_number) for page_number in docling_pages],
+        workers,
+        memory_budget_mb,
+        keep_documents=artifact is not None,
+        profiles=[profile.for_route(profiles[page_number].route) for page_number in docling_pages],
+    )
+
+    chunk_index = start_chunk_index
+    for page_number, page_text in zip(page_numbers, page_texts):
+        document = None
+        if profiles[page_number].needs_docling:
+            page_chunks, document = next(docling_results)
+        else:
+            page_chunks = text_chunks_by_page.get(page_number, [])
+
+        if artifact is not None:
+            artifact.write_page(ArtifactPage(page_number, page_text, profiles[page_number].route, document))
+
+        for chunk in page_chunks:
+            yield {
+                "content": chunk["content"],
+                "chunk_index": chunk_index,
+                # Docling numbers pages within the one-page slice
+                "page_number": page_number,
+                "token_count": chunk["token_count"],
+            }
+            chunk_index += 1
+
+
+def extract_text_chunks_from_artifact(
+    artifact: ArtifactReader,
+    max_tokens: int = EMBEDDING_MODEL_MAX_TOKENS,
+) -> Iterator[dict]:
+    """Re-chunk a document from its extraction artifact, without the PDF.
+
+    Text-layer pages are chunked from their stored text and Docling pages
+    from their stored DoclingDocument, so no parsing or layout model runs.
+    Produces the same chunks as extract_text_chunks_routed for the same
+    extraction.
+    """
+    context = get_extraction_context()
+    encoding = context.encoding
+
     chunk_index = 0
+    for page in artifact.pages():
+        if page.docling_document is not None:
+            page_chunks = chunk_docling_document(DoclingDocument.model_validate(page.docling_document))
+        else:
+            page_chunks = (
+                {"content": content, "token_count": token_count}
+                for content, token_count in _chunk_page_text(page.text, max_tokens, encoding)
+            )
 
-    for i, chapter in enumerate(chapters):
-        start_page = chapter["page"]
-        end_page = chapters[i + 1]["page"] - 1 if i + 1 < len(chapters) else total_pages
+        for chunk in page_chunks:
+            yield {
+                "content": chunk["content"],
+                "chunk_index": chunk_index,
+                "page_number": page.page_number,
+                "token_count": chunk["token_count"],
+            }
+            chunk_index += 1
 
-        print(f"  Processing chapter: {chapter['title']} (pages {start_page}-{end_page})")
-        chapter_path = extract_chapter_pdf(file_path, start_page, end_page)
 
-        try:
-            for chunk in extract_text_chunks_docling(chapter_path):
-                yield {
-                    "content": chunk["content"],
-                    "chunk_index": chunk_index,
-                    "page_number": chunk["page_number"],
-                    "chapter_title": chapter["title"],
-                }
-                chunk_index += 1
-        finally:
-            os.unlink(chapter_path)
+def select_strategy(analysis: dict) -> str:
+    """Pick the chunking strategy for an analyzed PDF.
+
+    Returns one of "docling", "chapter", "simple" or "routed".
+    """
+    # if not analysis["is_large"]:
+    #     # Small PDF: use Docling directly
+    #     return "docling"
+
+    # elif analysis["has_toc"]:
+    #     # Large PDF with TOC: split by chapter
+    #     return "chapter"
+
+    # else:
+    # Per-page routing: Docling only for scanned and table-heavy pages
+    return "routed"
 
 
-def extract_text_chunks(file_path: str) -> Iterator[dict]:
+def extract_text_chunks(
+    pdf: PdfSession,
+    analysis: dict | None = None,
+    artifact: ArtifactWriter | None = None,
+    checkpoint: dict | None = None,
+    profile: ExtractionProfile = DEFAULT_PROFILE,
+) -> Iterator[dict]:
     """Extract chunks using strategy based on PDF size and TOC.
 
-    Routes to one of three strategies:
+    If an artifact writer is given and the routed strategy is used, the
+    extraction is recorded to it as the chunks are produced.
+
+    With a checkpoint from an interrupted job, the checkpoint's strategy
+    continues after its last completed section or page. Docling runs with
+    the given extraction profile.
+
+    Routes to one of four strategies:
     - Small PDFs: Use Docling directly
     - Large PDFs with TOC: Split by chapter, process each with Docling
     - Large PDFs without TOC: Use simple page-based chunking
+    - Routed: simple chunking per page, Docling for scanned/table pages
     """
-    analysis = analyze_pdf(file_path)
+    if analysis is None:
+        analysis = analyze_pdf(pdf)
     print(f"PDF analysis: {analysis['page_count']} pages, {analysis['file_size_mb']:.1f}MB, TOC: {analysis['has_toc']}")
 
-    # if not analysis["is_large"]:
-    #     # Small PDF: use Docling directly
-    #     print("Strategy: Docling (small PDF)")
-    #     yield from extract_text_chunks_docling(file_path)
+    strategy = select_strategy(analysis) if checkpoint is None else checkpoint["strategy"]
+    start_unit = 1 if checkpoint is None else checkpoint["last_unit"] + 1
+    start_chunk_index = 0 if checkpoint is None else checkpoint["next_chunk_index"]
+    pages = None if checkpoint is None else list(range(start_unit, analysis["page_count"] + 1))
+    if checkpoint is not None:
+        print(f"Resuming {strategy} strategy at unit {start_unit}, chunk_index {start_chunk_index}")
+
+    if strategy == "docling":
+        print("Strategy: Docling (small PDF)")
+        yield from extract_text_chunks_docling(pdf.file_path, profile)
+
+    elif strategy == "chapter":
+        print(f"Strategy: Chapter-based ({len(analysis['chapters'])} chapters)")
+        yield from extract_text_chunks_by_chapter(
+            pdf, analysis, start_section=start_unit, start_chunk_index=start_chunk_index, profile=profile
+        )
 
-    # elif analysis["has_toc"]:
-    #     # Large PDF with TOC: split by chapter
-    #     print(f"Strategy: Chapter-based ({len(analysis['chapters'])} chapters)")
-    #     yield from extract_text_chunks_by_chapter(file_path, analysis)
+    elif strategy == "simple":
+        print("Strategy: Simple page-based (large PDF, no TOC)")
+        yield from extract_text_chunks_simple(pdf, pages=pages, start_chunk_index=start_chunk_index)
+
+    else:
+        print("Strategy: Per-page routing (text layer, Docling for scanned/table pages)")
+        yield from extract_text_chunks_routed(
+            pdf, pages=pages, artifact=artifact, start_chunk_index=start_chunk_index, profile=profile
+        )
 
-    # else:
-    # Large PDF without TOC: simple chunking
-    print("Strategy: Simple page-based (large PDF, no TOC)")
-    yield from extract_text_chunks_simple(file_path)
+
+def fingerprint_pages(pdf: PdfSession) -> list[str]:
+    """Hash each page's text (whitespace-normalized) for version diffing.
+
+    Pages with little or no text layer (e.g. scans) also hash their images,
+    so they don't all share the fingerprint of an empty page. The page text
+    stays cached on the session for the extraction step.
+    """
+    fingerprints = []
+    for page_index, text in enumerate(load_page_texts(pdf, list(range(pdf.page_count)))):
+        normalized = " ".join(text.split())
+        digest = hashlib.blake2b(normalized.encode(), digest_size=16)
+        if len(normalized) < SCANNED_MAX_TEXT_CHARS:
+            for image in pdf.doc[page_index].get_image_info(hashes=True):
+                digest.update(image["digest"])
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+
+def find_previous_version(
+    session,
+    document_version: DocumentVersion,
+    profile: ExtractionProfile,
+) -> DocumentVersion | None:
+    """Find the latest earlier version of the same document with page fingerprints.
+
+    Only versions chunked with the current chunker configuration and profile
+    qualify, so copied and freshly extracted chunks always come from the same
+    chunker.
+    """
+    return (
+        session.query(DocumentVersion)
+        .filter(
+            DocumentVersion.document_id == document_version.document_id,
+            DocumentVersion.id < document_version.id,
+            DocumentVersion.deleted_at.is_(None),
+            DocumentVersion.page_hashes.is_not(None),
+            DocumentVersion.chunker_fingerprint == chunker_fingerprint(profile),
+        )
+        .order_by(DocumentVersion.id.desc())
+        .first()
+    )
+
+
+def plan_incremental_chunks(
+    pdf: PdfSession,
+    page_hashes: list[str],
+    previous_version: DocumentVersion,
+    session,
+    profile: ExtractionProfile = DEFAULT_PROFILE,
+) -> tuple[list[dict], list[tuple[int, int, int]]] | None:
+    """Plan chunks for a new version from the previous version's chunks.
+
+    Pages whose fingerprint also appears in the previous version reuse that
+    page's chunks (and embeddings); only the remaining pages are extracted.
+    This relies on page-local chunks, which is why only versions chunked
+    page-by-page carry page_hashes.
+
+    Returns:
+        (new chunks to insert, (source chunk id, chunk_index, page_number) copies),
+        both with final chunk_index values, or None if no page can be reused.
+    """
+    previous_pages_by_hash: dict[str, int] = {}
+    for page_number, page_hash in enumerate(previous_version.page_hashes, start=1):
+        previous_pages_by_hash.setdefault(page_hash, page_number)
+
+    reused_pages = {
+        page_number: previous_pages_by_hash[page_hash]
+        for page_number, page_hash in enumerate(page_hashes, start=1)
+        if page_hash in previous_pages_by_hash
+    }
+    if not reused_pages:
+        return None
+
+    changed_pages = [p for p in range(1, len(page_hashes) + 1) if p not in reused_pages]
+    print(
+        f"Incremental ingestion against version {previous_version.id}: "
+        f"{len(reused_pages)} pages unchanged, {len(changed_pages)} pages to extract"
+    )
+
+    previous_chunks_by_page: dict[int, list[int]] = {}
+    previous_chunks = (
+        session.query(DocumentChunk.id, DocumentChunk.page_number)
+        .filter(DocumentChunk.document_version_id == previous_version.id)
+        .order_by(DocumentChunk.chunk_index)
+        .all()
+    )
+    if not previous_chunks:
+        # e.g. the previous version is being reprocessed
+        return None
+    for chunk_id, page_number in previous_chunks:
+        previous_chunks_by_page.setdefault(page_number, []).append(chunk_id)
+
+    new_chunks_by_page: dict[int, list[dict]] = {}
+    if changed_pages:
+        for chunk in extract_text_chunks_routed(pdf, pages=changed_pages, profile=profile):
+            new_chunks_by_page.setdefault(chunk["page_number"], []).append(chunk)
+
+    new_chunks = []
+    copies = []
+    chunk_index = 0
+    for page_number in range(1, len(page_hashes) + 1):
+        if page_number in reused_pages:
+            for chunk_id in previous_chunks_by_page.get(reused_pages[page_number], []):
+                copies.append((chunk_id, chunk_index, page_number))
+                chunk_index += 1
+        else:
+            for chunk in new_chunks_by_page.get(page_number, []):
+                new_chunks.append({**chunk, "chunk_index": chunk_index})
+                chunk_index += 1
+
+    return new_chunks, copies
 
 
 def store_chunks_without_embeddings(
@@ -255,50 +951,68 @@ def store_chunks_without_embeddings(
     document_version_id: int,
     session,
     tokenizer=None,
-) -> tuple[list[DocumentChunk], int]:
+) -> tuple[int, int]:
     """
     Store chunks in the database without embeddings.
 
+    Rows are streamed to PostgreSQL with COPY rather than added to the
+    session one ORM object at a time.
+
     Args:
         chunks: Iterator of chunk dictionaries with content and metadata
         document_version_id: ID of the document version
         session: Database session
-        tokenizer: Optional HuggingFace tokenizer for accurate token counting.
-                   If None, falls back to word splitting approximation.
+        tokenizer: Optional tiktoken encoding used for chunks that do not
+                   carry a 'token_count'. If None, falls back to word
+                   splitting approximation.
 
     Returns:
-        Tuple of (list of created DocumentChunk objects, total token count)
+        Tuple of (number of chunks stored, total token count)
     """
-    stored_chunks = []
-    total_token_count = 0
+    return bulk_insert_chunks(
+        session,
+        document_version_id,
+        chunks,
+        tokenizer=tokenizer,
+        progress_every=100,
+    )
 
-    for chunk in chunks:
-        content = chunk["content"]
 
-        # Use tokenizer for accurate count, fall back to word split
-        if tokenizer is not None:
-            token_count = len(tokenizer.encode(content))
-        else:
-            token_count = len(content.split())
+def chunker_fingerprint(profile: ExtractionProfile) -> str:
+    """Fingerprint of the chunker code version and configuration, for one extraction profile."""
+    config = {
+        "version": CHUNKER_VERSION,
+        "extractor": extractor_fingerprint(profile),
+        "tokenizer": EMBEDDING_MODEL_TOKENIZER,
+        "max_tokens": EMBEDDING_MODEL_MAX_TOKENS,
+        "large_pdf_page_threshold": LARGE_PDF_PAGE_THRESHOLD,
+        "large_pdf_size_mb_threshold": LARGE_PDF_SIZE_MB_THRESHOLD,
+        # The section plan, which chapter chunks and checkpoints follow
+        "chapter_max_pages": CHAPTER_MAX_PAGES,
+        "chapter_max_mb": CHAPTER_MAX_MB,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:32]
 
-        total_token_count += token_count
 
-        document_chunk = DocumentChunk(
-            document_version_id=document_version_id,
-            chunk_index=chunk["chunk_index"],
-            content=content,
-            embedding=None,  # Will be filled in by embedding job
-            token_count=token_count,
-            page_number=chunk["page_number"],
-            chapter_title=chunk.get("chapter_title"),
-        )
-        session.add(document_chunk)
-        stored_chunks.append(document_chunk)
+def file_content_hash(file_path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-        if len(stored_chunks) % 100 == 0:
-            print(f"  Stored {len(stored_chunks)} chunks...")
 
-    return stored_chunks, total_token_count
+def get_pending_chunk_indexes(session, document_version_id: int) -> set[int]:
+    """Chunk indexes of a version that still have no embedding from the active model."""
+    model = get_active_embedding_model(session)
+    return {
+        chunk_index
+        for (chunk_index,) in session.query(DocumentChunk.chunk_index).filter(
+            DocumentChunk.document_version_id == document_version_id,
+            ~chunk_has_embedding(model),
+        )
+    }
 
 
 def create_embedding_jobs(
@@ -306,10 +1020,14 @@ def create_embedding_jobs(
     total_chunks: int,
     parent_job_id: int,
     session,
+    pending_chunk_indexes: set[int] | None = None,
 ) -> list[DocumentJob]:
     """
     Create embedding jobs for batches of chunks.
 
+    If pending_chunk_indexes is given, batches that contain none of those
+    indexes (e.g. chunks copied with their embeddings) are skipped.
+
     Returns the list of created DocumentJob objects.
     """
     embedding_jobs = []
@@ -317,6 +1035,11 @@ def create_embedding_jobs(
     for start_idx in range(0, total_chunks, EMBEDDING_BATCH_SIZE):
         end_idx = min(start_idx + EMBEDDING_BATCH_SIZE, total_chunks)
 
+        if pending_chunk_indexes is not None and not any(
+            index in pending_chunk_indexes for index in range(start_idx, end_idx)
+        ):
+            continue
+
         embedding_job = DocumentJob(
             document_version_id=document_version_id,
             job_type="embedding",
@@ -344,6 +1067,546 @@ def queue_embedding_jobs(embedding_jobs: list[DocumentJob]) -> None:
         print(f"  Queued embedding job {job.id} (chunks {job.chunk_start_index}-{job.chunk_end_index})")
 
 
+def plan_page_ranges(page_count: int, pages_per_range: int = CHUNKING_FANOUT_PAGES) -> list[tuple[int, int]]:
+    """Split pages 1..page_count into evenly sized, contiguous (start, end) ranges."""
+    range_count = math.ceil(page_count / pages_per_range)
+    range_size = math.ceil(page_count / range_count)
+    return [(start, min(start + range_size - 1, page_count)) for start in range(1, page_count + 1, range_size)]
+
+
+def create_page_range_jobs(job: DocumentJob, page_count: int, session) -> list[DocumentJob]:
+    """Split a chunking job into page-range jobs.
+
+    Range jobs from an earlier split of the same job are cancelled; their
+    chunks were deleted with the rest of the stale chunk set. The job is
+    locked first, so a range job still running from that split sees the
+    cancellation when it merges (see merge_page_range_jobs).
+    """
+    session.query(DocumentJob).filter(DocumentJob.id == job.id).with_for_update().one()
+    session.query(DocumentJob).filter(
+        DocumentJob.parent_job_id == job.id,
+        DocumentJob.job_type == "chunking_range",
+        DocumentJob.status != "cancelled",
+    ).update({"status": "cancelled"}, synchronize_session=False)
+
+    range_jobs = []
+    for page_start, page_end in plan_page_ranges(page_count):
+        range_job = DocumentJob(
+            document_version_id=job.document_version_id,
+            job_type="chunking_range",
+            status="pending",
+            parent_job_id=job.id,
+            page_start=page_start,
+            page_end=page_end,
+        )
+        session.add(range_job)
+        range_jobs.append(range_job)
+    return range_jobs
+
+
+def queue_page_range_jobs(range_jobs: list[DocumentJob]) -> None:
+    """Queue page-range jobs to the chunking queue."""
+    queue_name = os.environ.get("QUEUE_NAME")
+    if not queue_name:
+        raise ValueError("QUEUE_NAME environment variable must be set")
+
+    producer = JobQueueProducer(queue_name=queue_name)
+
+    for job in range_jobs:
+        producer.send_job(job.id)
+        print(f"  Queued page-range job {job.id} (pages {job.page_start}-{job.page_end})")
+
+
+class JobCancelled(RuntimeError):
+    """The chunking job was cancelled (its document was reprocessed) while it ran."""
+
+
+class RangeJobCancelled(JobCancelled):
+    """The page-range job, or the job it was split from, was cancelled while it ran."""
+
+
+def ensure_job_not_cancelled(session, job_id: int) -> None:
+    """Lock a chunking job's row before committing its chunks; raise JobCancelled if it was cancelled.
+
+    Cancelling the job (see reprocess_document in the API) waits for the
+    lock, so chunks committed after this check land before the stale-chunk
+    delete of the job that replaces it, and none land after.
+    """
+    with session.no_autoflush:
+        status = session.query(DocumentJob.status).filter(DocumentJob.id == job_id).with_for_update().scalar()
+    if status == "cancelled":
+        raise JobCancelled(f"Job {job_id} was cancelled while it ran")
+
+
+def merge_page_range_jobs(
+    range_job: DocumentJob,
+    content_hash: str,
+    fingerprint: str,
+    session,
+) -> list[DocumentJob]:
+    """Complete a split chunking job once all of its page-range jobs have completed.
+
+    Call in the transaction that completes a range job. The parent job is
+    locked, so of several range jobs finishing at once exactly one sees all
+    of them complete. That one renumbers the chunks (each range numbered its
+    own from 0) in page order, stamps the chunk set and creates the
+    embedding jobs.
+
+    Returns:
+        The embedding jobs to queue after commit; empty while ranges are outstanding.
+
+    Raises:
+        RangeJobCancelled: If the parent job was split again or cancelled
+            while the range ran; roll back to drop the range's chunks.
+    """
+    parent_job_id = range_job.parent_job_id
+    parent_job = (
+        session.query(DocumentJob)
+        .filter(DocumentJob.id == parent_job_id)
+        .with_for_update()
+        .populate_existing()
+        .one()
+    )
+    if parent_job.status == "cancelled":
+        raise RangeJobCancelled(f"Job {parent_job_id} of page-range job {range_job.id} was cancelled")
+
+    # Read under the lock: a re-split cancels the range in a transaction holding it
+    with session.no_autoflush:
+        status = session.query(DocumentJob.status).filter(DocumentJob.id == range_job.id).scalar()
+    if status == "cancelled":
+        raise RangeJobCancelled(f"Page-range job {range_job.id} was cancelled by a later split of job {parent_job_id}")
+
+    # Range jobs keep the parent from looking interrupted while they run
+    parent_job.updated_at = datetime.now()
+
+    session.flush()
+    outstanding = (
+        session.query(func.count(DocumentJob.id))
+        .filter(
+            DocumentJob.parent_job_id == parent_job_id,
+            DocumentJob.job_type == "chunking_range",
+            DocumentJob.status.notin_(["completed", "cancelled"]),
+        )
+        .scalar()
+    )
+    if outstanding:
+        print(f"{outstanding} page-range jobs of job {parent_job_id} outstanding")
+        return []
+
+    merge_start = time.perf_counter()
+    document_version = parent_job.document_version
+    total_chunks, total_token_count = renumber_chunks(session, document_version.id)
+    document_version.total_token_count = total_token_count
+    document_version.content_hash = content_hash
+    document_version.chunker_fingerprint = fingerprint
+
+    embedding_jobs = create_embedding_jobs(
+        document_version_id=document_version.id,
+        total_chunks=total_chunks,
+        parent_job_id=parent_job_id,
+        session=session,
+    )
+    parent_job.metrics = {
+        **(parent_job.metrics or {}),
+        "merge_seconds": round(time.perf_counter() - merge_start, 3),
+        "fan_out_seconds": round(time.time() - parent_job.started_at.timestamp(), 3),
+    }
+    parent_job.status = "completed"
+    parent_job.error_message = None
+    parent_job.completed_at = datetime.now()
+    print(
+        f"Merged page ranges of job {parent_job_id}: {total_chunks} chunks, "
+        f"{total_token_count:,} tokens, {len(embedding_jobs)} embedding jobs"
+    )
+    return embedding_jobs
+
+
+def _merge_chunk_plan(
+    new_chunks: Iterable[dict],
+    copies: list[tuple[int, int, int]],
+) -> Iterator[tuple[int, dict | None, tuple[int, int, int] | None]]:
+    """Merge new chunks and copies into one (chunk_index, chunk, copy) stream.
+
+    Both inputs must already be ordered by chunk_index; exactly one of chunk
+    and copy is set on each item.
+    """
+    new_items = ((chunk["chunk_index"], chunk, None) for chunk in new_chunks)
+    copy_items = ((copy[1], None, copy) for copy in copies)
+    return heapq.merge(new_items, copy_items, key=lambda item: item[0])
+
+
+def store_chunk_windows(
+    new_chunks: Iterable[dict],
+    copies: list[tuple[int, int, int]],
+    document_version_id: int,
+    parent_job_id: int,
+    session,
+    tokenizer=None,
+    unit_key: str | None = None,
+    on_checkpoint: Callable[[int, int], None] | None = None,
+    checkpoint_seconds: float = 0,
+    start_chunk_index: int = 0,
+    before_commit: Callable[[], None] | None = None,
+) -> dict:
+    """Store chunks in EMBEDDING_BATCH_SIZE windows, fanning out embedding as they land.
+
+    new_chunks may be a lazy extraction stream. Each window of chunk indexes
+    is written (COPY for new chunks, server-side copy for reused ones) and
+    committed together with its embedding job, which is queued right away.
+    Embedding therefore runs while later pages are still being extracted.
+    Windows whose chunks all arrived with embeddings get no embedding job.
+
+    With unit_key (the chunk key of the extractor's checkpoint unit, e.g.
+    'section_number'), commits only happen between units: when the stream
+    moves on to a new unit and a window is waiting for its embedding job or
+    checkpoint_seconds have passed since the last commit. Before each such
+    commit, on_checkpoint(last completed unit, next chunk_index) lets the
+    caller record progress in the same transaction. start_chunk_index
+    continues a resumed run; the open window's embedding job then also
+    covers the chunks committed before the interruption. before_commit() runs
+    right before every commit and may raise to abandon the uncommitted window.
+
+    Returns:
+        Dict with 'chunks', 'tokens', 'copied' and 'embedding_jobs' totals,
+        plus 'first_job_seconds' (time to the first queued job, or None).
+    """
+    totals = {"chunks": 0, "tokens": 0, "copied": 0, "embedding_jobs": 0, "first_job_seconds": None}
+    start_time = time.perf_counter()
+    last_commit = start_time
+
+    window_start = start_chunk_index - start_chunk_index % EMBEDDING_BATCH_SIZE
+    window_end = start_chunk_index  # one past the last chunk_index in the window
+    window_inserted = window_end > window_start
+    window_new: list[dict] = []
+    window_copies: list[tuple[int, int, int]] = []
+    ready_jobs: list[DocumentJob] = []
+    active_model = get_active_embedding_model(session)
+
+    def write_window() -> None:
+        nonlocal window_inserted
+        if window_new:
+            inserted, tokens = store_chunks_without_embeddings(
+                iter(window_new), document_version_id, session, tokenizer=tokenizer
+            )
+            totals["chunks"] += inserted
+            totals["tokens"] += tokens
+            window_inserted = True
+        if window_copies:
+            copied, copied_tokens = bulk_copy_chunks(session, document_version_id, window_copies)
+            totals["chunks"] += copied
+            totals["tokens"] += copied_tokens
+            totals["copied"] += copied
+        window_new.clear()
+        window_copies.clear()
+
+    def close_window() -> None:
+        write_window()
+
+        # Copied chunks can still lack embeddings if their source never got one
+        needs_embedding = window_inserted or session.query(DocumentChunk.id).filter(
+            DocumentChunk.document_version_id == document_version_id,
+            DocumentChunk.chunk_index >= window_start,
+            DocumentChunk.chunk_index < window_end,
+            ~chunk_has_embedding(active_model),
+        ).first() is not None
+
+        if needs_embedding:
+            embedding_job = DocumentJob(
+                document_version_id=document_version_id,
+                job_type="embedding",
+                status="pending",
+                parent_job_id=parent_job_id,
+                chunk_start_index=window_start,
+                chunk_end_index=window_end,
+            )
+            session.add(embedding_job)
+            ready_jobs.append(embedding_job)
+
+    def commit(last_unit: int | None) -> None:
+        nonlocal last_commit
+        write_window()
+        if on_checkpoint is not None and last_unit is not None:
+            on_checkpoint(last_unit, window_end)
+        if before_commit is not None:
+            before_commit()
+
+        # Chunks, their embedding jobs and the checkpoint become durable together
+        session.commit()
+        last_commit = time.perf_counter()
+        if ready_jobs:
+            queue_embedding_jobs(ready_jobs)
+            totals["embedding_jobs"] += len(ready_jobs)
+            if totals["first_job_seconds"] is None:
+                totals["first_job_seconds"] = time.perf_counter() - start_time
+            ready_jobs.clear()
+
+    unit = None
+    for chunk_index, chunk, copy in _merge_chunk_plan(new_chunks, copies):
+        if unit_key is not None and chunk is not None:
+            if unit is not None and chunk[unit_key] != unit and (
+                ready_jobs or time.perf_counter() - last_commit >= checkpoint_seconds
+            ):
+                # Every chunk before this one belongs to a completed unit
+                commit(unit)
+            unit = chunk[unit_key]
+
+        if chunk_index >= window_start + EMBEDDING_BATCH_SIZE:
+            close_window()
+            if unit_key is None:
+                commit(None)
+            window_start = chunk_index - chunk_index % EMBEDDING_BATCH_SIZE
+            window_inserted = False
+
+        if chunk is not None:
+            window_new.append(chunk)
+        else:
+            window_copies.append(copy)
+        window_end = chunk_index + 1
+
+    if window_end > window_start:
+        close_window()
+    commit(unit)
+
+    return totals
+
+
+def embed_and_store_chunks(
+    new_chunks: list[dict],
+    copies: list[tuple[int, int, int]],
+    document_version_id: int,
+    parent_job_id: int,
+    session,
+) -> dict:
+    """Embed a small document's chunks inline and store them with their vectors.
+
+    Nothing is committed here, so the chunks, their embeddings and the job
+    status land in the caller's single transaction. Copied chunks that lack
+    an embedding still get regular embedding jobs, returned unqueued.
+
+    Returns:
+        Dict with 'chunks', 'tokens', 'copied' and 'embedding_jobs' totals,
+        plus the unqueued DocumentJob objects under 'pending_jobs'.
+    """
+    model = get_active_embedding_model(session)
+    print(f"Embedding {len(new_chunks)} chunks inline with {model.name}...")
+    embeddings = generate_embeddings_batch(
+        [chunk["content"] for chunk in new_chunks], deployment=model.deployment, dimensions=model.dimensions
+    )
+
+    if model.storage == STORAGE_CHUNKS:
+        inserted, tokens = bulk_insert_chunks(
+            session,
+            document_version_id,
+            ({**chunk, "embedding": embedding} for chunk, embedding in zip(new_chunks, embeddings)),
+            progress_every=0,
+            embedding_model=model.name,
+        )
+    else:
+        # The model's vectors live in chunk_embeddings, keyed by the new chunk ids
+        inserted, tokens = bulk_insert_chunks(session, document_version_id, new_chunks, progress_every=0)
+        chunk_ids = dict(
+            session.query(DocumentChunk.chunk_index, DocumentChunk.id).filter(
+                DocumentChunk.document_version_id == document_version_id,
+                DocumentChunk.chunk_index.in_([chunk["chunk_index"] for chunk in new_chunks]),
+            )
+        )
+        write_embeddings(
+            session,
+            model,
+            ((chunk_ids[chunk["chunk_index"]], embedding) for chunk, embedding in zip(new_chunks, embeddings)),
+        )
+    copied, copied_tokens = bulk_copy_chunks(session, document_version_id, copies)
+
+    embedding_jobs = []
+    if copied:
+        pending_chunk_indexes = get_pending_chunk_indexes(session, document_version_id)
+        if pending_chunk_indexes:
+            embedding_jobs = create_embedding_jobs(
+                document_version_id=document_version_id,
+                total_chunks=inserted + copied,
+                parent_job_id=parent_job_id,
+                session=session,
+                pending_chunk_indexes=pending_chunk_indexes,
+            )
+
+    return {
+        "chunks": inserted + copied,
+        "tokens": tokens + copied_tokens,
+        "copied": copied,
+        "embedding_jobs": len(embedding_jobs),
+        "pending_jobs": embedding_jobs,
+    }
+
+
+def conversion_throughput(before: dict[str, list], after: dict[str, list]) -> dict:
+    """Per-profile Docling pages, seconds and pages/second between two stats snapshots.
+
+    Seconds are summed over pool workers, so pages/second is per worker.
+    """
+    throughput = {}
+    for name, (pages, seconds) in after.items():
+        pages_before, seconds_before = before.get(name, (0, 0.0))
+        pages, seconds = pages - pages_before, seconds - seconds_before
+        if pages:
+            throughput[name] = {
+                "pages": pages,
+                "seconds": round(seconds, 3),
+                "pages_per_second": round(pages / seconds, 2) if seconds else None,
+            }
+    return throughput
+
+
+def process_page_range_job(
+    job: DocumentJob,
+    session,
+    storage_account_url: str,
+    profile: ExtractionProfile,
+) -> None:
+    """Extract the pages of a page-range job (already marked running).
+
+    The range's chunks are numbered from 0 and committed together with the
+    job's completion, so a retried range starts clean. Completing the last
+    range merges the split job (see merge_page_range_jobs). A failed range
+    fails its parent job; requeuing the range job completes both. A range
+    cancelled by a later split of its parent discards its chunks.
+    """
+    document_version = job.document_version
+    fetcher = get_blob_fetcher(storage_account_url)
+    fetched = None
+    pdf = None
+    admission = None
+
+    try:
+        fetch_start = time.perf_counter()
+        fetched = fetcher.fetch(document_version.blob_path, suffix=Path(document_version.file_name).suffix)
+        fetch_seconds = time.perf_counter() - fetch_start
+        content_hash = file_content_hash(fetched.path)
+
+        pdf = PdfSession(fetched.path)
+        analysis = analyze_pdf(pdf)
+        strategy = select_strategy(analysis)
+        pages = list(range(job.page_start, job.page_end + 1))
+        print(f"Extracting pages {job.page_start}-{job.page_end} of {pdf.page_count} ({strategy})")
+
+        # The range's share of the document's memory estimate
+        share = len(pages) / analysis["page_count"]
+        admission = admit_document(
+            {
+                "page_count": len(pages),
+                "file_size_mb": analysis["file_size_mb"] * share,
+                "image_count": analysis["image_count"] * share,
+            },
+            session,
+        )
+
+        extraction_start = time.perf_counter()
+        if strategy == "simple":
+            chunks = extract_text_chunks_simple(pdf, pages=pages)
+        else:
+            chunks = extract_text_chunks_routed(pdf, pages=pages, profile=profile)
+        stored, tokens = store_chunks_without_embeddings(
+            chunks, document_version.id, session, tokenizer=get_extraction_context().encoding
+        )
+        extraction_seconds = time.perf_counter() - extraction_start
+        print(f"Extracted and stored {stored} chunks in {extraction_seconds:.2f}s")
+
+        job.metrics = {
+            **(job.metrics or {}),
+            "blob_cache_hit": fetched.cache_hit,
+            "download_seconds": round(fetch_seconds, 3),
+            "extraction_seconds": round(extraction_seconds, 3),
+            "chunks": stored,
+            "tokens": tokens,
+            "extraction_profile": profile.name,
+        }
+        job.status = "completed"
+        job.completed_at = datetime.now()
+
+        embedding_jobs = merge_page_range_jobs(job, content_hash, chunker_fingerprint(profile), session)
+
+        # Commit before queuing so the embedding jobs exist when picked up
+        session.commit()
+        if embedding_jobs:
+            queue_embedding_jobs(embedding_jobs)
+
+    except RangeJobCancelled as e:
+        # The range's chunks are uncommitted; the later split re-extracts its pages
+        session.rollback()
+        print(f"{e}, discarding its chunks")
+
+    except Exception as e:
+        session.rollback()
+        # The caller's session rolls back on the re-raise, so record the failure in one of its own
+        with get_session() as failure_session:
+            failed_job = failure_session.get(DocumentJob, job.id)
+            failed_job.status = "failed"
+            failed_job.error_message = str(e)
+            failed_job.completed_at = datetime.now()
+            parent_job = failed_job.parent_job
+            parent_job.status = "failed"
+            parent_job.error_message = (
+                f"Page-range job {failed_job.id} (pages {failed_job.page_start}-{failed_job.page_end}) failed: {e}"
+            )
+        raise
+
+    finally:
+        if pdf is not None:
+            pdf.close()
+        if admission is not None:
+            admission.release()
+        if fetched is not None:
+            fetcher.release(fetched)
+
+
+def admit_document(analysis: dict, session) -> Admission | None:
+    """Wait until there is memory to chunk the document, when documents run concurrently."""
+    if _admission_controller is None:
+        return None
+    # Don't hold the job's row locks while other documents finish
+    session.commit()
+    admission = _admission_controller.acquire(estimate_document_mb(analysis))
+    print(f"Admitted with an estimated peak of {admission.scaled_mb:.0f} MB after {admission.wait_seconds:.1f}s")
+    return admission
+
+
+class JobInProgress(RuntimeError):
+    """The job, or another one writing its document version's chunks, is running
+    on another replica that has committed recently."""
+
+
+def claim_document_version(session, job: DocumentJob) -> None:
+    """Check that no other chunking job is writing the job's document version.
+
+    Two chunking jobs of one version (a reprocess racing a requeued job)
+    would interleave their stale-chunk deletes and COPYs. The version row is
+    locked for the rest of the claim transaction, so of two jobs claiming at
+    once the second sees the first running once it commits. Cancelled jobs
+    don't count: they discard their uncommitted chunks (see
+    ensure_job_not_cancelled). Page-range jobs of one split are coordinated
+    through their parent instead.
+
+    Raises:
+        JobInProgress: If another chunking job of the version is running and has committed recently.
+    """
+    session.query(DocumentVersion.id).filter(DocumentVersion.id == job.document_version_id).with_for_update().one()
+    other_job = (
+        session.query(DocumentJob.id)
+        .filter(
+            DocumentJob.document_version_id == job.document_version_id,
+            DocumentJob.job_type.in_(["chunking", "chunking_range"]),
+            DocumentJob.status == "running",
+            DocumentJob.id != job.id,
+            or_(DocumentJob.parent_job_id.is_(None), DocumentJob.parent_job_id != job.id),
+            DocumentJob.updated_at >= func.now() - timedelta(seconds=CHUNKING_STALE_SECONDS),
+        )
+        .first()
+    )
+    if other_job is not None:
+        raise JobInProgress(
+            f"Job {other_job.id} is writing the chunks of document version {job.document_version_id}"
+        )
+
+
 def process_chunking_job(job_id: int) -> None:
     """
     Process a document chunking job.
@@ -351,25 +1614,44 @@ def process_chunking_job(job_id: int) -> None:
     1. Look up the DocumentJob by ID
     2. Get the associated DocumentVersion and blob_path
     3. Download and parse the document
-    4. Extract text chunks and store WITHOUT embeddings
-    5. Create embedding jobs for batches of chunks
-    6. Queue embedding jobs
-    7. Update job status
+    4. Extract text chunks and store them WITHOUT embeddings, committing
+       one EMBEDDING_BATCH_SIZE window at a time
+    5. Create and queue each window's embedding job as soon as it is committed
+    6. Update job status
+
+    Small documents skip steps 4-5: their chunks are embedded inline and
+    stored with their vectors in the same transaction that completes the job.
+
+    Resumable strategies commit a checkpoint on the job with their chunks. A
+    job whose replica died mid-run resumes from that checkpoint when its
+    message is redelivered (or when it is requeued), keeping the committed
+    chunks.
     """
     storage_account_url = os.environ.get("STORAGE_ACCOUNT_URL")
     if not storage_account_url:
         raise ValueError("STORAGE_ACCOUNT_URL environment variable must be set")
 
     with get_session() as session:
-        # Look up the job
-        job = session.query(DocumentJob).filter(DocumentJob.id == job_id).first()
+        # Look up the job, locked so only one replica can claim it
+        job = session.query(DocumentJob).filter(DocumentJob.id == job_id).with_for_update().first()
         if not job:
             raise ValueError(f"DocumentJob with id {job_id} not found")
 
-        if job.status != "pending":
+        # A running job with no recent commit lost its replica (crash, OOM, timeout)
+        interrupted = (
+            job.status == "running"
+            and job.updated_at.timestamp() < time.time() - CHUNKING_STALE_SECONDS
+        )
+        if job.status == "running" and not interrupted:
+            # Its message must survive: if that replica dies, this is how the job resumes
+            raise JobInProgress(f"Job {job_id} is running elsewhere (last update {job.updated_at})")
+        if job.status != "pending" and not interrupted:
             print(f"Job {job_id} is not pending (status: {job.status}), skipping")
             return
 
+        if job.job_type == "chunking":
+            claim_document_version(session, job)
+
         # Get the document version
         document_version = job.document_version
         if not document_version:
@@ -381,67 +1663,317 @@ def process_chunking_job(job_id: int) -> None:
         print(f"Processing chunking job {job_id} for document version {document_version.id}")
         print(f"Blob path: {document_version.blob_path}")
 
+        document_type = document_version.document.document_type
+        profile = profile_for_document_type(document_type.code if document_type else None)
+        print(f"Extraction profile: {profile.name}")
+
+        if interrupted:
+            print(f"Job {job_id} was interrupted (last update {job.updated_at}), retrying")
+
         # Mark job as running
         job.status = "running"
-        job.started_at = datetime.now()
+        job.started_at = job.started_at if interrupted else datetime.now()
+        job.updated_at = datetime.now()
+        if job.job_type == "chunking_range":
+            job.parent_job.updated_at = datetime.now()
         session.commit()
 
-        # Create temp file for download
-        suffix = Path(document_version.file_name).suffix
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp_file:
-            tmp_path = tmp_file.name
+        if job.job_type == "chunking_range":
+            process_page_range_job(job, session, storage_account_url, profile)
+            return
+
+        fetcher = get_blob_fetcher(storage_account_url)
+        fetched = None
+        pdf = None
+        artifact_reader = None
+        artifact_writer = None
+        admission = None
 
         try:
-            # Download the blob directly to temp file
-            print("Downloading blob...")
-            bytes_downloaded = download_blob_to_file(
-                storage_account_url, document_version.blob_path, tmp_path
+            fetch_start = time.perf_counter()
+
+            # Re-chunk from the extraction artifact when this extractor already parsed the file
+            if document_version.extraction_path == artifact_blob_path(document_version.guid, profile):
+                fetched_artifact = fetch_artifact(storage_account_url, document_version.extraction_path, profile)
+                if fetched_artifact is not None:
+                    artifact_reader, fetched = fetched_artifact
+
+            if artifact_reader is not None:
+                fetch_seconds = time.perf_counter() - fetch_start
+                print(f"Using extraction artifact {document_version.extraction_path} ({fetched.size} bytes)")
+                content_hash = artifact_reader.content_hash
+            else:
+                # Fetch the blob (from the local cache when this version was seen before)
+                print("Downloading blob...")
+                suffix = Path(document_version.file_name).suffix
+                fetched = fetcher.fetch(document_version.blob_path, suffix=suffix)
+                fetch_seconds = time.perf_counter() - fetch_start
+                file_path = fetched.path
+                if fetched.cache_hit:
+                    print(f"Using cached blob ({fetched.size} bytes)")
+                else:
+                    print(f"Downloaded {fetched.size} bytes in {fetch_seconds:.2f}s")
+
+                content_hash = file_content_hash(file_path)
+            fingerprint = chunker_fingerprint(profile)
+
+            # Held until the next commit, which covers the deletes below
+            ensure_job_not_cancelled(session, job_id)
+
+            # A checkpoint only holds for the same file and chunker. Re-chunking
+            # from an extraction artifact is cheap enough to start over.
+            checkpoint = job.checkpoint
+            if checkpoint is not None and (
+                artifact_reader is not None
+                or checkpoint["content_hash"] != content_hash
+                or checkpoint["chunker_fingerprint"] != fingerprint
+            ):
+                checkpoint = None
+
+            resumed_chunks, resumed_tokens = 0, 0
+            if checkpoint is not None:
+                # Keep the chunks committed up to the checkpoint
+                session.query(DocumentChunk).filter(
+                    DocumentChunk.document_version_id == document_version.id,
+                    DocumentChunk.chunk_index >= checkpoint["next_chunk_index"],
+                ).delete(synchronize_session=False)
+                resumed_chunks, resumed_tokens = (
+                    session.query(func.count(DocumentChunk.id), func.coalesce(func.sum(DocumentChunk.token_count), 0))
+                    .filter(DocumentChunk.document_version_id == document_version.id)
+                    .one()
+                )
+                print(f"Resuming from checkpoint with {resumed_chunks} committed chunks")
+
+                # Embedding jobs committed before the interruption may never have been
+                # queued. Which ones were is not recorded, so all pending ones are sent
+                # again: a duplicate message is harmless, since the embedding job claims
+                # its row under a lock and skips a job that is no longer pending.
+                unqueued_jobs = (
+                    session.query(DocumentJob)
+                    .filter(
+                        DocumentJob.parent_job_id == job_id,
+                        DocumentJob.job_type == "embedding",
+                        DocumentJob.status == "pending",
+                    )
+                    .all()
+                )
+                session.commit()
+                queue_embedding_jobs(unqueued_jobs)
+
+            existing_chunks = (
+                session.query(func.count(DocumentChunk.id), func.max(DocumentChunk.chunk_index))
+                .filter(DocumentChunk.document_version_id == document_version.id)
+                .one()
             )
-            print(f"Downloaded {bytes_downloaded} bytes")
+
+            if checkpoint is None and existing_chunks[0] and (
+                document_version.content_hash == content_hash
+                and document_version.chunker_fingerprint == fingerprint
+            ):
+                # Same file, same chunker: keep the chunk set, only embed what is missing
+                pending_chunk_indexes = get_pending_chunk_indexes(session, document_version.id)
+                print(
+                    f"Chunk set is up to date ({existing_chunks[0]} chunks), "
+                    f"{len(pending_chunk_indexes)} chunks need embeddings"
+                )
+                embedding_jobs = create_embedding_jobs(
+                    document_version_id=document_version.id,
+                    total_chunks=existing_chunks[1] + 1,
+                    parent_job_id=job_id,
+                    session=session,
+                    pending_chunk_indexes=pending_chunk_indexes,
+                )
+                job.metrics = {**(job.metrics or {}), "chunk_set_reused": True}
+                job.status = "completed"
+                job.completed_at = datetime.now()
+
+                # Commit before queuing so the embedding jobs exist when picked up
+                session.commit()
+                queue_embedding_jobs(embedding_jobs)
+                print(f"Created {len(embedding_jobs)} embedding jobs for missing embeddings")
+                return
+
+            if checkpoint is None and existing_chunks[0]:
+                # Stale chunk set (file or chunker changed): start over
+                print(f"Deleting {existing_chunks[0]} stale chunks")
+                session.query(DocumentChunk).filter(
+                    DocumentChunk.document_version_id == document_version.id
+                ).delete(synchronize_session=False)
+
+            job.checkpoint = checkpoint
+            document_version.content_hash = None
+            document_version.chunker_fingerprint = None
 
             # Extract and store chunks without embeddings
             print("Extracting and storing chunks...")
-            chunks = list(extract_text_chunks(tmp_path))
-            total_chunks = len(chunks)
+            context = get_extraction_context()
+            model_load_seconds_before = context.model_load_seconds
+            conversion_stats_before = {name: list(stats) for name, stats in context.conversion_stats.items()}
+            extraction_start = time.perf_counter()
+
+            # Chunk key of the checkpoint unit, for full extractions that can resume
+            unit_key = None
+            strategy = None
+
+            if artifact_reader is not None:
+                # Same file and extractor: only the chunking runs again
+                analysis = {"page_count": artifact_reader.page_count, "file_size_mb": fetched.size / (1024 * 1024)}
+                admission = admit_document(analysis, session)
+                new_chunks, copies = extract_text_chunks_from_artifact(artifact_reader), []
+            else:
+                # One open document for analysis, fingerprinting and extraction
+                pdf = PdfSession(file_path)
+                analysis = analyze_pdf(pdf)
+                strategy = select_strategy(analysis) if checkpoint is None else checkpoint["strategy"]
+
+                # Page-local chunks can be diffed against the previous version
+                page_hashes = None
+                previous_version = None
+                incremental = None
+                if strategy in ("simple", "routed"):
+                    page_hashes = fingerprint_pages(pdf)
+                    previous_version = find_previous_version(session, document_version, profile) if checkpoint is None else None
+
+                # Huge documents without a version to diff against: split across replicas
+                if (
+                    strategy in ("simple", "routed")
+                    and checkpoint is None
+                    and previous_version is None
+                    and CHUNKING_FANOUT_MIN_PAGES
+                    and analysis["page_count"] >= CHUNKING_FANOUT_MIN_PAGES
+                ):
+                    document_version.page_hashes = page_hashes
+                    range_jobs = create_page_range_jobs(job, analysis["page_count"], session)
+                    job.metrics = {
+                        **(job.metrics or {}),
+                        "blob_cache_hit": fetched.cache_hit,
+                        "download_seconds": round(fetch_seconds, 3),
+                        "extraction_profile": profile.name,
+                        "page_range_jobs": len(range_jobs),
+                    }
+                    # The job stays running until its last range job merges the chunks
+                    session.commit()
+                    queue_page_range_jobs(range_jobs)
+                    print(f"Split {analysis['page_count']} pages into {len(range_jobs)} page-range jobs")
+                    return
+
+                admission = admit_document(analysis, session)
+                if previous_version is not None:
+                    incremental = plan_incremental_chunks(pdf, page_hashes, previous_version, session, profile)
+
+                if incremental is not None:
+                    new_chunks, copies = incremental
+                else:
+                    # Record the full extraction so later re-chunking can skip the PDF
+                    if strategy == "routed" and checkpoint is None:
+                        artifact_writer = ArtifactWriter(content_hash, pdf.page_count, pdf.toc, profile)
+                    new_chunks, copies = extract_text_chunks(
+                        pdf, analysis, artifact=artifact_writer, checkpoint=checkpoint, profile=profile
+                    ), []
+                    unit_key = CHECKPOINT_UNIT_KEYS.get(strategy)
+                document_version.page_hashes = page_hashes
+
+            # Extractors report token counts; the tokenizer is only a fallback
+            tokenizer = context.encoding
+
+            # Small documents: embed inline rather than paying two queue hops
+            inline = False
+            if checkpoint is None and INLINE_EMBEDDING_MAX_PAGES and analysis["page_count"] <= INLINE_EMBEDDING_MAX_PAGES:
+                new_chunks = list(new_chunks)
+                new_token_count = sum(
+                    chunk["token_count"] if chunk.get("token_count") is not None else len(tokenizer.encode_ordinary(chunk["content"]))
+                    for chunk in new_chunks
+                )
+                inline = new_token_count <= INLINE_EMBEDDING_MAX_TOKENS
+
+            if inline:
+                stored = embed_and_store_chunks(new_chunks, copies, document_version.id, job_id, session)
+            else:
+                def record_checkpoint(last_unit: int, next_chunk_index: int) -> None:
+                    job.checkpoint = {
+                        "strategy": strategy,
+                        "content_hash": content_hash,
+                        "chunker_fingerprint": fingerprint,
+                        "last_unit": last_unit,
+                        "next_chunk_index": next_chunk_index,
+                    }
+                    job.updated_at = datetime.now()
+
+                # Store and commit window by window, queuing embedding as each window lands
+                stored = store_chunk_windows(
+                    new_chunks,
+                    copies,
+                    document_version.id,
+                    job_id,
+                    session,
+                    tokenizer=tokenizer,
+                    unit_key=unit_key,
+                    on_checkpoint=record_checkpoint if unit_key else None,
+                    # Docling sections are slow enough to checkpoint every one
+                    checkpoint_seconds=0 if strategy == "chapter" else CHUNKING_CHECKPOINT_SECONDS,
+                    start_chunk_index=checkpoint["next_chunk_index"] if checkpoint else 0,
+                    before_commit=lambda: ensure_job_not_cancelled(session, job_id),
+                )
+            total_chunks = stored["chunks"] + resumed_chunks
+            total_token_count = stored["tokens"] + resumed_tokens
+
+            # Extraction and storage overlap, so this covers both
+            extraction_seconds = time.perf_counter() - extraction_start
+            model_load_seconds = context.model_load_seconds - model_load_seconds_before
+            print(f"Extracted and stored {total_chunks} chunks in {extraction_seconds:.2f}s (model load: {model_load_seconds:.2f}s)")
+            metrics = {
+                "blob_cache_hit": fetched.cache_hit,
+                "download_seconds": round(fetch_seconds, 3),
+                "extraction_seconds": round(extraction_seconds, 3),
+                "model_load_seconds": round(model_load_seconds, 3),
+                "chunks_reused": stored["copied"],
+                "from_extraction_artifact": artifact_reader is not None,
+                "inline_embedding": inline,
+                "extraction_profile": profile.name,
+            }
+            docling_throughput = conversion_throughput(conversion_stats_before, context.conversion_stats)
+            if docling_throughput:
+                metrics["docling_throughput"] = docling_throughput
+            if not inline and stored["first_job_seconds"] is not None:
+                metrics["first_embedding_job_seconds"] = round(stored["first_job_seconds"], 3)
+            if admission is not None:
+                metrics["memory_estimate_mb"] = round(admission.scaled_mb)
+                metrics["admission_wait_seconds"] = round(admission.wait_seconds, 3)
+                if admission.peak_rise_mb is not None:
+                    metrics["peak_rss_rise_mb"] = round(admission.peak_rise_mb)
+            if checkpoint is not None:
+                metrics["resumed_from_chunk_index"] = checkpoint["next_chunk_index"]
+            job.metrics = {**(job.metrics or {}), **metrics}
 
             if total_chunks == 0:
                 print("No text chunks extracted")
+                ensure_job_not_cancelled(session, job_id)
+                job.checkpoint = None
                 job.status = "completed"
                 job.completed_at = datetime.now()
                 return
 
-            # Initialize tokenizer for accurate token counting
-            print("Loading tokenizer for token counting...")
-            tokenizer = tiktoken.get_encoding(EMBEDDING_MODEL_TOKENIZER)
-
-            _, total_token_count = store_chunks_without_embeddings(
-                iter(chunks),
-                document_version.id,
-                session,
-                tokenizer=tokenizer,
-            )
-
-            # Update document version with total token count
+            if stored["copied"]:
+                print(f"Copied {stored['copied']} chunks with embeddings from the previous version")
+
+            if artifact_writer is not None:
+                artifact_path = artifact_blob_path(document_version.guid, profile)
+                try:
+                    artifact_size = artifact_writer.upload(storage_account_url, artifact_path)
+                    document_version.extraction_path = artifact_path
+                    print(f"Stored extraction artifact {artifact_path} ({artifact_size} bytes)")
+                except Exception as e:
+                    # The chunks are fine without it; the next re-chunk parses the PDF again
+                    print(f"WARNING: Failed to store extraction artifact: {e}", file=sys.stderr)
+
+            # The chunk set is complete: record its token count and stamp it
+            ensure_job_not_cancelled(session, job_id)
             document_version.total_token_count = total_token_count
-            session.flush()  # Ensure chunks are in DB before creating embedding jobs
-
-            print(f"Stored {total_chunks} chunks ({total_token_count:,} tokens), creating embedding jobs...")
-
-            # Create embedding jobs for batches
-            embedding_jobs = create_embedding_jobs(
-                document_version_id=document_version.id,
-                total_chunks=total_chunks,
-                parent_job_id=job_id,
-                session=session,
-            )
-            session.flush()  # Ensure embedding jobs have IDs
-
-            print(f"Created {len(embedding_jobs)} embedding jobs")
-
-            # Queue embedding jobs
-            queue_embedding_jobs(embedding_jobs)
+            document_version.content_hash = content_hash
+            document_version.chunker_fingerprint = fingerprint
 
             # Mark chunking job as completed
+            job.checkpoint = None
             job.status = "completed"
             job.completed_at = datetime.now()
 
@@ -449,7 +1981,21 @@ def process_chunking_job(job_id: int) -> None:
             print(f"  - Document Version ID: {document_version.id}")
             print(f"  - Chunks stored: {total_chunks}")
             print(f"  - Total tokens: {total_token_count:,}")
-            print(f"  - Embedding jobs created: {len(embedding_jobs)}")
+            print(f"  - Embedding jobs created: {stored['embedding_jobs']}")
+
+            session.commit()
+            if inline and stored["pending_jobs"]:
+                queue_embedding_jobs(stored["pending_jobs"])
+
+            # Inline embeddings and copied chunks are searchable now, and embedding
+            # jobs that finished before this job may have left the invalidation to it
+            decision = invalidate_search_cache_for_job(session, job)
+            job.metrics = {**job.metrics, "search_cache_invalidation": decision}
+
+        except JobCancelled as e:
+            # A newer job replaces the chunk set; the uncommitted chunks go with the rollback
+            session.rollback()
+            print(f"{e}, discarding its uncommitted chunks")
 
         except Exception as e:
             job.status = "failed"
@@ -458,44 +2004,118 @@ def process_chunking_job(job_id: int) -> None:
             raise
 
         finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+            if pdf is not None:
+                pdf.close()
+            if admission is not None:
+                admission.release()
+            if artifact_writer is not None:
+                artifact_writer.discard()
+            # Release the cached file (temp files are deleted)
+            if fetched is not None:
+                fetcher.release(fetched)
+
+
+def self_check() -> bool:
+    """Check the model artifacts and load the default profile's models, reporting the load time.
+
+    Returns False if the local model artifacts are missing or the models fail to load.
+    """
+    problems = check_artifacts()
+    context = get_extraction_context()
+    load_seconds = None
+    try:
+        load_seconds_before = context.model_load_seconds
+        context.converter(DEFAULT_PROFILE)
+        load_seconds = context.model_load_seconds - load_seconds_before
+    except Exception as e:
+        problems.append(f"Failed to load Docling models: {e}")
+
+    print(f"Inference self-check: {json.dumps(report(context.inference_threads, load_seconds))}")
+    for problem in problems:
+        print(f"WARNING: {problem}", file=sys.stderr)
+    return not problems
+
+
+def _init_document_process(controller: AdmissionController) -> None:
+    """Document process initializer: share the parent's admission controller."""
+    global _admission_controller
+    _admission_controller = controller
+
+
+def process_messages(messages: list[JobMessage]) -> Iterator[tuple[JobMessage, BaseException | None]]:
+    """Process the messages' jobs, yielding each message with its error (None on success).
+
+    Up to CHUNKING_CONCURRENCY jobs run at once, each in its own process,
+    admitted against the memory budget. A single job runs in this process.
+    """
+    if CHUNKING_CONCURRENCY <= 1 or len(messages) <= 1:
+        for job_message in messages:
+            print(f"Processing job ID: {job_message.job_id}")
+            try:
+                process_chunking_job(job_message.job_id)
+            except Exception as e:
+                yield job_message, e
+            else:
+                yield job_message, None
+        return
+
+    controller = AdmissionController()
+    print(f"Processing {len(messages)} jobs, {CHUNKING_CONCURRENCY} at a time, within {controller.budget_mb} MB")
+    with ProcessPoolExecutor(
+        max_workers=min(CHUNKING_CONCURRENCY, len(messages)),
+        initializer=_init_document_process,
+        initargs=(controller,),
+    ) as executor:
+        futures = {executor.submit(process_chunking_job, job_message.job_id): job_message for job_message in messages}
+        for future in as_completed(futures):
+            yield futures[future], future.exception()
+    print(f"Memory estimate scale after this batch: {controller.scale:.2f}")
 
 
 def main():
+    if "--self-check" in sys.argv:
+        sys.exit(0 if self_check() else 1)
+
     print("Document chunking job started")
+    if CHUNKING_SELF_CHECK:
+        self_check()
 
     try:
         queue_name = os.environ.get("QUEUE_NAME")
         if not queue_name:
             raise ValueError("QUEUE_NAME environment variable must be set")
 
-        # Use 600s visibility timeout for chunking jobs (longer processing time)
-        consumer = JobQueueConsumer(queue_name=queue_name, visibility_timeout=600)
+        consumer = JobQueueConsumer(queue_name=queue_name, visibility_timeout=CHUNKING_VISIBILITY_TIMEOUT)
 
-        message_count = 0
-        for job_message in consumer.receive_messages(max_messages=1):
-            message_count += 1
+        messages = list(consumer.receive_messages(max_messages=CHUNKING_MAX_MESSAGES))
+        for job_message in messages:
             print(f"Processing message: {job_message.raw_message.id}")
 
-            try:
-                print(f"Processing job ID: {job_message.job_id}")
-
-                process_chunking_job(job_message.job_id)
-
-                # Delete the message after successful processing
-                consumer.delete_message(job_message)
-                print(f"Message {job_message.raw_message.id} deleted from queue")
-
-            except Exception as e:
-                print(f"Error processing message {job_message.raw_message.id}: {e}", file=sys.stderr)
-                traceback.print_exc()
-                # Message will become visible again after visibility_timeout expires
-                raise
+        # Keep the messages hidden for as long as their jobs run
+        renewer = VisibilityRenewer(consumer, messages)
+        failed = 0
+        try:
+            for job_message, error in process_messages(messages):
+                renewer.release(job_message)
+                if error is None:
+                    # Delete the message after successful processing
+                    consumer.delete_message(job_message)
+                    print(f"Message {job_message.raw_message.id} deleted from queue")
+                elif isinstance(error, JobInProgress):
+                    # Left for redelivery, which resumes the job if its replica died
+                    print(f"{error}; message {job_message.raw_message.id} left on the queue")
+                else:
+                    failed += 1
+                    print(f"Error processing message {job_message.raw_message.id}: {error}", file=sys.stderr)
+                    traceback.print_exception(error)
+                    # Message will become visible again after visibility_timeout expires
+        finally:
+            renewer.stop()
 
-        if message_count == 0:
+        if not messages:
             print("No messages in queue")
+        if failed:
+            raise RuntimeError(f"{failed} of {len(messages)} messages failed")
 
         print("Document chunking job completed")
 
@@ -504,6 +2124,9 @@ def main():
         traceback.print_exc()
         sys.exit(1)
 
+    finally:
+        shutdown_chapter_pool()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,131 @@
+"""Per-page routing between the text-layer extractor and Docling.
+
+Most manual pages have a clean text layer that PyMuPDF reads in
+milliseconds. Docling is only worth its cost on pages where that text layer
+is missing (scanned pages) or where layout carries meaning (tables). Pages
+are profiled from cheap fitz measurements and routed accordingly.
+"""
+
+import os
+from dataclasses import dataclass
+
+import fitz  # PyMuPDF
+
+from pdf_session import PdfSession
+
+# A page with fewer text-layer characters than this is treated as having no text
+SCANNED_MAX_TEXT_CHARS = int(os.environ.get("SCANNED_MAX_TEXT_CHARS", "100"))
+# Fraction of the page covered by images for a text-less page to count as scanned
+SCANNED_MIN_IMAGE_COVERAGE = float(os.environ.get("SCANNED_MIN_IMAGE_COVERAGE", "0.5"))
+# Distinct horizontal and vertical rule positions (a table's rows and columns,
+# plus one) for a page to count as table-heavy. Tables usually have far more
+# rows than columns, so the two are counted separately.
+TABLE_MIN_HORIZONTAL_RULES = int(os.environ.get("TABLE_MIN_HORIZONTAL_RULES", "6"))
+TABLE_MIN_VERTICAL_RULES = int(os.environ.get("TABLE_MIN_VERTICAL_RULES", "3"))
+
+# Line segments within this many points of axis-aligned count as rules
+_AXIS_TOLERANCE = 1.0
+# Ignore hairline strokes shorter than this (points)
+_MIN_RULE_LENGTH = 20.0
+# Rectangles thinner than this (points) are drawn rules, not boxes
+_MAX_RULE_THICKNESS = 2.0
+
+ROUTE_TEXT = "text"
+ROUTE_SCANNED = "scanned"
+ROUTE_TABLE = "table"
+
+
+@dataclass
+class PageProfile:
+    """Layout measurements for one page and the resulting route."""
+
+    page_number: int
+    text_chars: int
+    image_coverage: float  # fraction of the page area covered by images
+    horizontal_rules: int  # distinct positions, see _count_rules
+    vertical_rules: int
+    route: str
+
+    @property
+    def needs_docling(self) -> bool:
+        return self.route != ROUTE_TEXT
+
+
+def _image_coverage(page: fitz.Page) -> float:
+    """Fraction of the page covered by images (overlaps counted once per image)."""
+    page_area = abs(page.rect)
+    if not page_area:
+        return 0.0
+    covered = 0.0
+    for image in page.get_image_info():
+        bbox = fitz.Rect(image["bbox"]) & page.rect
+        if not bbox.is_empty:
+            covered += abs(bbox)
+    return min(1.0, covered / page_area)
+
+
+def _count_rules(page: fitz.Page) -> tuple[int, int]:
+    """Count the distinct positions of horizontal and vertical ruling lines.
+
+    Rules are axis-aligned line segments and thin rectangles; any other
+    rectangle contributes its four edges, since table cells are often drawn
+    as rectangles. Rules at the same position count once, so a grid counts
+    its rows and columns, while bordered callouts stacked down a prose page
+    share their two vertical edges and don't look like a table.
+    """
+    rows: set[int] = set()
+    columns: set[int] = set()
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) <= _AXIS_TOLERANCE and abs(p1.x - p2.x) >= _MIN_RULE_LENGTH:
+                    rows.add(round(p1.y / _AXIS_TOLERANCE))
+                elif abs(p1.x - p2.x) <= _AXIS_TOLERANCE and abs(p1.y - p2.y) >= _MIN_RULE_LENGTH:
+                    columns.add(round(p1.x / _AXIS_TOLERANCE))
+            elif item[0] == "re":
+                rect = item[1]
+                if rect.height < _MAX_RULE_THICKNESS:
+                    if rect.width >= _MIN_RULE_LENGTH:
+                        rows.add(round((rect.y0 + rect.y1) / 2 / _AXIS_TOLERANCE))
+                elif rect.width < _MAX_RULE_THICKNESS:
+                    if rect.height >= _MIN_RULE_LENGTH:
+                        columns.add(round((rect.x0 + rect.x1) / 2 / _AXIS_TOLERANCE))
+                else:
+                    if rect.width >= _MIN_RULE_LENGTH:
+                        rows.update((round(rect.y0 / _AXIS_TOLERANCE), round(rect.y1 / _AXIS_TOLERANCE)))
+                    if rect.height >= _MIN_RULE_LENGTH:
+                        columns.update((round(rect.x0 / _AXIS_TOLERANCE), round(rect.x1 / _AXIS_TOLERANCE)))
+    return len(rows), len(columns)
+
+
+def profile_page(page: fitz.Page, text: str) -> PageProfile:
+    """Measure one page and decide how it should be extracted."""
+    text_chars = len("".join(text.split()))
+    image_coverage = _image_coverage(page)
+    horizontal_rules, vertical_rules = _count_rules(page)
+
+    if text_chars < SCANNED_MAX_TEXT_CHARS and image_coverage >= SCANNED_MIN_IMAGE_COVERAGE:
+        route = ROUTE_SCANNED
+    elif horizontal_rules >= TABLE_MIN_HORIZONTAL_RULES and vertical_rules >= TABLE_MIN_VERTICAL_RULES:
+        route = ROUTE_TABLE
+    else:
+        route = ROUTE_TEXT
+
+    return PageProfile(
+        page_number=page.number + 1,
+        text_chars=text_chars,
+        image_coverage=image_coverage,
+        horizontal_rules=horizontal_rules,
+        vertical_rules=vertical_rules,
+        route=route,
+    )
+
+
+def classify_pages(pdf: PdfSession, page_numbers: list[int]) -> dict[int, PageProfile]:
+    """Profile the given (1-based) pages, using the session's cached page text."""
+    page_texts = pdf.page_texts([page_number - 1 for page_number in page_numbers])
+    return {
+        page_number: profile_page(pdf.doc[page_number - 1], text)
+        for page_number, text in zip(page_numbers, page_texts)
+    }
@@ -0,0 +1,110 @@
+"""Single-open PDF access for a chunking job.
+
+A PdfSession keeps the source PDF open for the whole job. Analysis, page
+fingerprinting and text chunking share its page text cache, and chapter
+slices are produced as in-memory PDFs for Docling instead of temp files.
+"""
+
+import os
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from io import BytesIO
+
+import fitz  # PyMuPDF
+from docling.datamodel.base_models import DocumentStream
+
+
+def _extract_page_texts(file_path: str, page_indexes: list[int]) -> list[str]:
+    """Process pool worker: extract the text of the given (0-based) pages.
+
+    Workers open the PDF themselves so no fitz objects cross process boundaries.
+    """
+    doc = fitz.open(file_path)
+    try:
+        return [doc[page_index].get_text("text") for page_index in page_indexes]
+    finally:
+        doc.close()
+
+
+class PdfSession:
+    """An open PDF plus the page text extracted from it so far.
+
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.doc = fitz.open(file_path)
+        self.file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        self._page_texts: dict[int, str] = {}
+        self._toc: list | None = None
+
+    def __enter__(self) -> "PdfSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the document and drop cached text."""
+        self.doc.close()
+        self._page_texts.clear()
+
+    @property
+    def page_count(self) -> int:
+        return len(self.doc)
+
+    @property
+    def toc(self) -> list:
+        """Table of contents as [[level, title, page], ...]."""
+        if self._toc is None:
+            self._toc = self.doc.get_toc()
+        return self._toc
+
+    def uncached_pages(self, page_indexes: Iterable[int]) -> list[int]:
+        """The (0-based) pages whose text has not been extracted yet."""
+        return [page_index for page_index in page_indexes if page_index not in self._page_texts]
+
+    def page_texts(
+        self,
+        page_indexes: Iterable[int],
+        executor: Executor | None = None,
+        span_size: int = 0,
+    ) -> list[str]:
+        """Text of the given (0-based) pages, extracting uncached pages once.
+
+        With an executor, uncached pages are extracted in contiguous spans
+        of span_size pages by worker processes; otherwise they are read
+        from the open document.
+        """
+        page_indexes = list(page_indexes)
+        missing = self.uncached_pages(page_indexes)
+
+        if missing and executor is not None and span_size > 0:
+            spans = [missing[start:start + span_size] for start in range(0, len(missing), span_size)]
+            futures = [executor.submit(_extract_page_texts, self.file_path, span) for span in spans]
+            for span, future in zip(spans, futures):
+                self._page_texts.update(zip(span, future.result()))
+        else:
+            for page_index in missing:
+                self._page_texts[page_index] = self.doc[page_index].get_text("text")
+
+        return [self._page_texts[page_index] for page_index in page_indexes]
+
+    def slice_bytes(self, start_page: int, end_page: int) -> bytes:
+        """Serialize a (1-based, inclusive) page range as a standalone PDF."""
+        new_doc = fitz.open()
+        try:
+            new_doc.insert_pdf(self.doc, from_page=start_page - 1, to_page=end_page - 1)
+            return new_doc.tobytes()
+        finally:
+            new_doc.close()
+
+    def slice_stream(self, start_page: int, end_page: int) -> DocumentStream:
+        """A (1-based, inclusive) page range as an in-memory Docling input."""
+        return chapter_stream(start_page, end_page, self.slice_bytes(start_page, end_page))
+
+
+def chapter_stream(start_page: int, end_page: int, pdf_bytes: bytes) -> DocumentStream:
+    """Wrap serialized PDF pages for DocumentConverter.convert()."""
+    return DocumentStream(name=f"pages-{start_page}-{end_page}.pdf", stream=BytesIO(pdf_bytes))
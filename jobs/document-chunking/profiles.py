@@ -0,0 +1,122 @@
+"""Docling extraction profiles per document type.
+
+Docling's default pipeline runs OCR and accurate table-structure recognition
+on every page, which is wasted work on text-native service bulletins and
+essential on wiring manuals or scanned legacy handbooks. A profile names one
+pipeline configuration; each DocumentType code maps to a profile, with
+text-native types defaulting to the fast one.
+
+Override the mapping with EXTRACTION_PROFILES, e.g. "POH=fast,SB=tables".
+"""
+
+import os
+from dataclasses import dataclass, replace
+
+from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+
+from inference import apply_inference_options
+from page_classifier import ROUTE_SCANNED, ROUTE_TABLE
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """One Docling PDF pipeline configuration."""
+
+    name: str
+    do_ocr: bool
+    do_table_structure: bool
+    accurate_tables: bool = False
+    do_picture_classification: bool = False
+
+    def pipeline_options(self, threads: int) -> PdfPipelineOptions:
+        """Docling pipeline options for this profile, running on CPU with the given threads."""
+        options = apply_inference_options(PdfPipelineOptions(), threads)
+        options.do_ocr = self.do_ocr
+        options.do_table_structure = self.do_table_structure
+        options.table_structure_options.mode = (
+            TableFormerMode.ACCURATE if self.accurate_tables else TableFormerMode.FAST
+        )
+        options.do_picture_classification = self.do_picture_classification
+        return options
+
+    def for_route(self, route: str) -> "ExtractionProfile":
+        """This profile with what a routed page needs switched on.
+
+        Per-page routing only sends scanned and table-heavy pages to Docling;
+        a scanned page is useless without OCR and a table page without table
+        structure, whatever the document's profile.
+        """
+        if route == ROUTE_SCANNED and not self.do_ocr:
+            return replace(self, do_ocr=True)
+        if route == ROUTE_TABLE and not self.do_table_structure:
+            return replace(self, do_table_structure=True)
+        return self
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in [
+        # Text layer only: no OCR, tables and pictures come through as plain text
+        ExtractionProfile("fast", do_ocr=False, do_table_structure=False),
+        # Text-native manuals with many tables (torque values, limits, wire lists)
+        ExtractionProfile("tables", do_ocr=False, do_table_structure=True, accurate_tables=True),
+        # Parts catalogs: tables plus figure classification
+        ExtractionProfile(
+            "illustrated", do_ocr=False, do_table_structure=True, accurate_tables=True, do_picture_classification=True
+        ),
+        # Scanned documents: OCR every page
+        ExtractionProfile("scanned", do_ocr=True, do_table_structure=True),
+        # Docling's defaults, for documents of unknown type
+        ExtractionProfile("standard", do_ocr=True, do_table_structure=True, accurate_tables=True),
+    ]
+}
+
+DEFAULT_PROFILE = PROFILES["standard"]
+
+# DocumentType code -> profile name
+DOCUMENT_TYPE_PROFILES = {
+    # Service publications
+    "AMM": "tables",
+    "IPC": "illustrated",
+    "WM": "tables",
+    "SB": "fast",
+    "SA": "fast",
+    "CCMM": "tables",
+    "FIM": "tables",
+    "LAG": "tables",
+    # Pilot publications (legacy handbooks are often scans)
+    "POH": "scanned",
+    "AFM": "fast",
+    "PIM": "fast",
+    "AC": "fast",
+    "EC": "fast",
+    "SS": "fast",
+    # Other
+    "SAPP": "fast",
+    # Temporary revisions follow their manuals
+    "TRAMM": "tables",
+    "TRIPC": "illustrated",
+    "TRWM": "tables",
+    "TRCC": "tables",
+    "TRF": "tables",
+    "TRAPP": "fast",
+}
+
+
+def _profile_overrides() -> dict[str, str]:
+    overrides = {}
+    for entry in os.environ.get("EXTRACTION_PROFILES", "").split(","):
+        if "=" in entry:
+            code, name = (part.strip() for part in entry.split("=", 1))
+            if name not in PROFILES:
+                raise ValueError(f"Unknown extraction profile '{name}' for document type {code}")
+            overrides[code.upper()] = name
+    return overrides
+
+
+def profile_for_document_type(code: str | None) -> ExtractionProfile:
+    """The extraction profile for a DocumentType code (None for untyped documents)."""
+    if code is None:
+        return DEFAULT_PROFILE
+    name = _profile_overrides().get(code.upper()) or DOCUMENT_TYPE_PROFILES.get(code.upper())
+    return PROFILES[name] if name else DEFAULT_PROFILE
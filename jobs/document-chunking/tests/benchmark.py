@@ -0,0 +1,283 @@
+"""Benchmark the chunking strategies on a synthetic manual corpus.
+
+Each (manual, strategy) pair runs in a fresh subprocess so peak RSS and
+model load time are measured per run. Results are written as JSON and can
+be compared against a previous run (e.g. from another commit).
+
+Usage:
+    uv run tests/benchmark.py --output results.json
+    uv run tests/benchmark.py --strategies simple routed --output after.json --compare before.json
+    uv run tests/benchmark.py --strategies chapter --profile fast --output fast.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import main
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import CORPUS, build_corpus
+
+STRATEGIES = ["simple", "routed", "chapter", "docling"]
+
+# Metrics where a higher value is better; everything else is lower-is-better
+HIGHER_IS_BETTER = {"pages_per_second", "chunks_per_second"}
+COMPARED_METRICS = ["pages_per_second", "chunks_per_second", "seconds", "peak_rss_mb", "chunks"]
+
+
+class _PeakRssSampler:
+    """Samples the summed RSS of this process and its live pool workers until stopped.
+
+    The chapter pool is persistent, so its workers are never reaped and
+    RUSAGE_CHILDREN would miss them; the tree is read from /proc instead.
+    """
+
+    def __init__(self, interval: float = 0.2) -> None:
+        from admission import process_tree_rss_mb
+
+        self._read = process_tree_rss_mb
+        self._interval = interval
+        self._peak_mb = self._read() or 0.0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self._interval):
+            self._peak_mb = max(self._peak_mb, self._read() or 0.0)
+
+    def stop(self) -> float:
+        """Stop sampling and return the peak in MB (at least this process's own peak)."""
+        self._stopped.set()
+        self._thread.join()
+        self._peak_mb = max(self._peak_mb, self._read() or 0.0)
+        # ru_maxrss is in KB on Linux
+        return max(self._peak_mb, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+
+def _token_distribution(token_counts: list[int]) -> dict:
+    if not token_counts:
+        return {"count": 0}
+    ordered = sorted(token_counts)
+
+    def percentile(p: float) -> int:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "min": ordered[0],
+        "p50": percentile(0.50),
+        "p90": percentile(0.90),
+        "p99": percentile(0.99),
+        "max": ordered[-1],
+        "mean": round(statistics.fmean(ordered), 1),
+    }
+
+
+def _load_converters(barrier, profiles: list) -> None:
+    """Chapter pool task: load the Docling models of the profiles in this worker.
+
+    Every warm-up task waits at the barrier first, so each one holds a
+    different worker.
+    """
+    import main as chunking
+
+    barrier.wait()
+    context = chunking.get_extraction_context()
+    for profile in profiles:
+        context.converter(profile)
+
+
+def _warm_up(strategy: str, profile) -> float:
+    """Load the models a strategy uses, where it uses them, and return the seconds taken.
+
+    The chapter pool and the routed strategy's Docling pages convert in the
+    pool workers, so their models are loaded there; the docling strategy
+    (and a single worker) converts in this process.
+    """
+    import main as chunking
+    from page_classifier import ROUTE_SCANNED, ROUTE_TABLE
+
+    start_time = time.perf_counter()
+    context = chunking.get_extraction_context()
+    context.encoding
+    if strategy == "chapter":
+        profiles = [profile]
+    elif strategy == "routed":
+        profiles = list({profile.for_route(ROUTE_SCANNED), profile.for_route(ROUTE_TABLE)})
+    elif strategy == "docling":
+        profiles = [profile]
+    else:
+        profiles = []
+
+    workers = chunking.CHAPTER_WORKERS
+    if profiles and strategy != "docling" and workers > 1:
+        with multiprocessing.Manager() as manager:
+            barrier = manager.Barrier(workers)
+            pool = chunking.get_chapter_pool(workers)
+            for future in [pool.submit(_load_converters, barrier, profiles) for _ in range(workers)]:
+                future.result()
+    else:
+        for warm_profile in profiles:
+            context.converter(warm_profile)
+    return time.perf_counter() - start_time
+
+
+def run_one(strategy: str, path: str, profile_name: str = "standard") -> dict:
+    """Run one strategy on one PDF in this process and return its metrics.
+
+    Models are loaded before the timer starts, so throughput covers
+    extraction only; the load is reported as warmup_seconds.
+    """
+    import main as chunking
+    from pdf_session import PdfSession
+    from profiles import PROFILES
+
+    profile = PROFILES[profile_name]
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    context = chunking.get_extraction_context()
+    warmup_seconds = _warm_up(strategy, profile)
+    model_load_seconds_before = context.model_load_seconds
+    rss_sampler = _PeakRssSampler()
+    start_time = time.perf_counter()
+
+    try:
+        with PdfSession(path) as pdf:
+            analysis = chunking.analyze_pdf(pdf)
+            if strategy == "simple":
+                chunks = list(chunking.extract_text_chunks_simple(pdf))
+            elif strategy == "routed":
+                chunks = list(chunking.extract_text_chunks_routed(pdf, profile=profile))
+            elif strategy == "chapter":
+                if not analysis["has_toc"]:
+                    return {"skipped": "no TOC"}
+                chunks = list(chunking.extract_text_chunks_by_chapter(pdf, analysis, profile=profile))
+            else:
+                chunks = list(chunking.extract_text_chunks_docling(path, profile))
+        seconds = time.perf_counter() - start_time
+    finally:
+        peak_rss_mb = rss_sampler.stop()
+
+    encoding = context.encoding
+    token_counts = [
+        chunk["token_count"] if chunk.get("token_count") is not None else len(encoding.encode_ordinary(chunk["content"]))
+        for chunk in chunks
+    ]
+
+    return {
+        "pages": analysis["page_count"],
+        "chunks": len(chunks),
+        "seconds": round(seconds, 3),
+        "warmup_seconds": round(warmup_seconds, 3),
+        # Models loaded during the run anyway (e.g. a route profile not warmed up)
+        "model_load_seconds": round(context.model_load_seconds - model_load_seconds_before, 3),
+        "pages_per_second": round(analysis["page_count"] / seconds, 2),
+        "chunks_per_second": round(len(chunks) / seconds, 2),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+        "tokens": _token_distribution(token_counts),
+        "docling_throughput": chunking.conversion_throughput({}, context.conversion_stats),
+    }
+
+
+def _run_isolated(strategy: str, path: Path, profile_name: str, timeout: int) -> dict:
+    """Run one benchmark in a fresh interpreter so RSS and model loads are per run."""
+    command = [sys.executable, __file__, "--run-one", strategy, str(path), profile_name]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed"}
+    # The extractors print progress; the result is the last line
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    """Describe metric changes between two result files."""
+    lines = [f"Comparing {current.get('commit')} against {baseline.get('commit')}"]
+    baseline_runs = {(run["manual"], run["strategy"]): run for run in baseline["runs"]}
+    for run in current["runs"]:
+        previous = baseline_runs.get((run["manual"], run["strategy"]))
+        if previous is None or "error" in run or "error" in previous or "skipped" in run:
+            continue
+        changes = []
+        for metric in COMPARED_METRICS:
+            before, after = previous.get(metric), run.get(metric)
+            if not before or after is None:
+                continue
+            delta = (after - before) / before * 100
+            better = delta > 0 if metric in HIGHER_IS_BETTER else delta < 0
+            marker = "+" if better else "-" if abs(delta) >= 0.5 else " "
+            changes.append(f"{metric} {before} -> {after} ({delta:+.1f}%){marker}")
+        lines.append(f"  {run['manual']:<16} {run['strategy']:<8} " + ", ".join(changes))
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus-dir", type=Path, default=Path(tempfile.gettempdir()) / "techpubs-benchmark-corpus")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument("--profile", default="standard", help="Docling extraction profile (see profiles.py)")
+    parser.add_argument("--manuals", nargs="+", help="Only run these manuals (by name)")
+    parser.add_argument("--output", type=Path, help="Write JSON results here (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="Previous results JSON to compare against")
+    parser.add_argument("--timeout", type=int, default=3600, help="Per-run timeout in seconds")
+    parser.add_argument("--run-one", nargs=3, metavar=("STRATEGY", "PDF", "PROFILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_one(*args.run_one)))
+        return
+
+    specs = [spec for spec in CORPUS if not args.manuals or spec.name in args.manuals]
+    runs = []
+    for spec, path in build_corpus(args.corpus_dir, specs):
+        for strategy in args.strategies:
+            print(f"Running {strategy} on {spec.name}...", file=sys.stderr)
+            result = _run_isolated(strategy, path, args.profile, args.timeout)
+            runs.append({"manual": spec.name, "strategy": strategy, **result})
+            print(f"  {result}", file=sys.stderr)
+
+    results = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "profile": args.profile,
+        "runs": runs,
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        for line in compare(results, json.loads(args.compare.read_text())):
+            print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Synthetic technical manuals for benchmarking the chunking strategies.
+
+Manuals are generated with PyMuPDF from a fixed seed, so the same spec
+always produces the same PDF and benchmark runs are comparable.
+"""
+
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+WORDS = (
+    "aircraft fuel pump shall be inspected for leaks and torque values checked per table "
+    "remove install actuator hydraulic line fitting assembly landing gear brake wear limit "
+    "caution warning note ensure safety wire panel access door seal replace serviceable"
+).split()
+
+PAGE_RECT = fitz.paper_rect("letter")
+MARGIN = 54
+
+
+@dataclass(frozen=True)
+class ManualSpec:
+    """Shape of one synthetic manual."""
+
+    name: str
+    pages: int
+    toc_depth: int = 1  # 0 = no TOC
+    pages_per_chapter: int = 20
+    table_every: int = 0  # every Nth page carries a ruled table (0 = never)
+    scanned_every: int = 0  # every Nth page is an image-only scan (0 = never)
+    seed: int = 1
+
+    def file_name(self) -> str:
+        return f"{self.name}.pdf"
+
+
+# Default corpus: small/large, with and without TOC, text-only and mixed layouts
+CORPUS = [
+    ManualSpec("small-text", pages=20, toc_depth=0),
+    ManualSpec("medium-toc", pages=150, toc_depth=2, table_every=15),
+    ManualSpec("large-notoc", pages=400, toc_depth=0, table_every=25, scanned_every=40),
+    ManualSpec("large-deep-toc", pages=400, toc_depth=3, pages_per_chapter=40, table_every=10, scanned_every=50),
+]
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(6, 24))
+        sentence = " ".join(rng.choice(WORDS) for _ in range(length))
+        sentences.append(sentence.capitalize() + rng.choice([".", ".", ".", "!", "?"]))
+        words -= length
+    return " ".join(sentences)
+
+
+def _text_page(page: fitz.Page, rng: random.Random, heading: str) -> None:
+    page.insert_text((MARGIN, MARGIN + 14), heading, fontsize=14)
+    body = "\n\n".join(_paragraph(rng, rng.randint(60, 140)) for _ in range(rng.randint(3, 6)))
+    page.insert_textbox(fitz.Rect(MARGIN, MARGIN + 30, PAGE_RECT.width - MARGIN, PAGE_RECT.height - MARGIN), body, fontsize=8)
+
+
+def _table_page(page: fitz.Page, rng: random.Random, heading: str) -> None:
+    page.insert_text((MARGIN, MARGIN + 14), heading, fontsize=14)
+    rows, columns = rng.randint(10, 25), rng.randint(3, 6)
+    width = (PAGE_RECT.width - 2 * MARGIN) / columns
+    height = 18
+    top = MARGIN + 40
+    for row in range(rows + 1):
+        y = top + row * height
+        page.draw_line((MARGIN, y), (MARGIN + columns * width, y))
+    for column in range(columns + 1):
+        x = MARGIN + column * width
+        page.draw_line((x, top), (x, top + rows * height))
+    for row in range(rows):
+        for column in range(columns):
+            cell = rng.choice(WORDS) if column else f"{rng.randint(1, 999)}-{rng.randint(10, 99)}"
+            page.insert_text((MARGIN + column * width + 3, top + row * height + 12), cell, fontsize=8)
+
+
+def _scanned_page(page: fitz.Page, rng: random.Random) -> None:
+    # An image-only page: a noisy grayscale pixmap with no text layer
+    pixmap = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 425, 550), False)
+    pixmap.set_rect(pixmap.irect, (235,))
+    for _ in range(400):
+        x, y = rng.randrange(20, 400), rng.randrange(20, 530)
+        pixmap.set_rect(fitz.IRect(x, y, x + rng.randint(10, 60), y + 3), (40,))
+    page.insert_image(page.rect, pixmap=pixmap)
+
+
+def _toc(spec: ManualSpec) -> list[list]:
+    """TOC entries: chapters at level 1, each halved into nested sections down to toc_depth."""
+    toc = []
+
+    def add(level: int, title: str, start: int, span: int) -> None:
+        toc.append([level, title, start + 1])
+        if level < spec.toc_depth and span >= 2:
+            half = span // 2
+            add(level + 1, f"{title}.1", start, half)
+            add(level + 1, f"{title}.2", start + half, span - half)
+
+    for chapter, start in enumerate(range(0, spec.pages, spec.pages_per_chapter), start=1):
+        add(1, f"Chapter {chapter}", start, min(spec.pages_per_chapter, spec.pages - start))
+    return toc
+
+
+def make_manual(spec: ManualSpec, path: Path) -> None:
+    """Write the manual described by spec to path."""
+    rng = random.Random(spec.seed)
+    doc = fitz.open()
+    for page_number in range(1, spec.pages + 1):
+        page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+        heading = f"{spec.name} page {page_number}"
+        if spec.scanned_every and page_number % spec.scanned_every == 0:
+            _scanned_page(page, rng)
+        elif spec.table_every and page_number % spec.table_every == 0:
+            _table_page(page, rng, heading)
+        else:
+            _text_page(page, rng, heading)
+    if spec.toc_depth:
+        doc.set_toc(_toc(spec))
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def build_corpus(directory: Path, specs: list[ManualSpec] = CORPUS) -> list[tuple[ManualSpec, Path]]:
+    """Generate any missing manuals in directory. Returns (spec, path) pairs."""
+    directory.mkdir(parents=True, exist_ok=True)
+    manuals = []
+    for spec in specs:
+        path = directory / spec.file_name()
+        spec_path = path.with_suffix(".spec")
+        spec_text = repr(asdict(spec))
+        if not path.exists() or not spec_path.exists() or spec_path.read_text() != spec_text:
+            print(f"Generating {path} ({spec.pages} pages)")
+            make_manual(spec, path)
+            spec_path.write_text(spec_text)
+        manuals.append((spec, path))
+    return manuals
@@ -5,14 +5,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import main
+from pdf_session import PdfSession
 
 def test_large_file(path):
   print("running test on " + path)
-  analysis = main.analyze_pdf(path)
-  chunks = main.extract_text_chunks_by_chapter(path, analysis)
-  for index, chunk in enumerate(chunks):
-    print(f"Chunk {index}")
-    print(chunk)
+  with PdfSession(path) as pdf:
+    analysis = main.analyze_pdf(pdf)
+    chunks = main.extract_text_chunks_by_chapter(pdf, analysis)
+    for index, chunk in enumerate(chunks):
+      print(f"Chunk {index}")
+      print(chunk)
 
 
 
@@ -1,35 +1,52 @@
 import os
 import sys
+import time
 from datetime import datetime
-from uuid import uuid4
-
-from sqlalchemy import update
 
 from techpubs_core import (
-    CorpusVersion,
     DocumentChunk,
     DocumentJob,
+    EmbeddingModel,
     JobQueueConsumer,
     get_session,
+    invalidate_search_cache_for_job,
 )
-from techpubs_core.embeddings import generate_embeddings_batch, get_embedding_model
+from techpubs_core.embedding_models import chunk_has_embedding, get_active_embedding_model, write_embeddings
+from techpubs_core.embeddings import generate_embeddings_batch
+
+# Chunks embedded per API call; each call's vectors are committed before the next
+EMBEDDING_API_BATCH_SIZE = int(os.environ.get("EMBEDDING_API_BATCH_SIZE", "32"))
+
+# A running job with no committed batch for this long is taken to be dead and
+# is resumed when its message is redelivered
+EMBEDDING_STALE_SECONDS = int(os.environ.get("EMBEDDING_STALE_SECONDS", "120"))
+
+
+def record_search_cache_invalidation(session, job: DocumentJob) -> None:
+    """Invalidate the search cache if this job's family is done, and log the decision on the job."""
+    decision = invalidate_search_cache_for_job(session, job)
+    job.metrics = {**(job.metrics or {}), "search_cache_invalidation": decision}
+    session.commit()
 
 
-def invalidate_search_cache(session) -> str:
-    """Invalidate the search cache by updating the corpus version.
+def next_chunk_batch(session, job: DocumentJob, model: EmbeddingModel, after_chunk_index: int) -> list:
+    """The next EMBEDDING_API_BATCH_SIZE chunks of the job's range that lack the model's embeddings.
 
-    Returns:
-        The new corpus version string.
+    Keyset-paginated on chunk_index: each call is a short, indexed query in
+    its own transaction, so batches can be committed in between.
     """
-    new_version = uuid4().hex[:8]
-    session.execute(
-        update(CorpusVersion)
-        .where(CorpusVersion.id == 1)
-        .values(version=new_version, updated_at=datetime.utcnow())
+    return (
+        session.query(DocumentChunk.id, DocumentChunk.chunk_index, DocumentChunk.content)
+        .filter(
+            DocumentChunk.document_version_id == job.document_version_id,
+            DocumentChunk.chunk_index > after_chunk_index,
+            DocumentChunk.chunk_index < job.chunk_end_index,
+            ~chunk_has_embedding(model),
+        )
+        .order_by(DocumentChunk.chunk_index)
+        .limit(EMBEDDING_API_BATCH_SIZE)
+        .all()
     )
-    session.commit()
-    print(f"Search cache invalidated, new corpus version: {new_version}")
-    return new_version
 
 
 def process_embedding_job(job_id: int) -> None:
@@ -37,18 +54,32 @@ def process_embedding_job(job_id: int) -> None:
     Process a document embedding job.
 
     1. Look up the DocumentJob by ID
-    2. Get chunks in the specified range that need embeddings
-    3. Generate embeddings in batches
-    4. Update chunk records with embeddings
+    2. Page through the chunks in the specified range that need embeddings
+    3. Embed one API batch at a time
+    4. Write each batch back in bulk (binary COPY + one statement) and commit it
     5. Update job status
+
+    Committed batches survive a failure. The retried job (requeued, or an
+    interrupted one whose message is redelivered) only embeds the chunks
+    that are still missing an embedding.
+
+    Chunks are embedded with the active embedding model, whichever table
+    its vectors live in. It is looked up for every batch; if search switched
+    models since the last one, the range is paged through again for the new
+    model.
     """
     with get_session() as session:
-        # Look up the job
-        job = session.query(DocumentJob).filter(DocumentJob.id == job_id).first()
+        # Look up the job, locked so only one replica can claim it
+        job = session.query(DocumentJob).filter(DocumentJob.id == job_id).with_for_update().first()
         if not job:
             raise ValueError(f"DocumentJob with id {job_id} not found")
 
-        if job.status != "pending":
+        # A running job that stopped committing batches lost its replica
+        interrupted = (
+            job.status == "running"
+            and job.updated_at.timestamp() < time.time() - EMBEDDING_STALE_SECONDS
+        )
+        if job.status != "pending" and not interrupted:
             print(f"Job {job_id} is not pending (status: {job.status}), skipping")
             return
 
@@ -58,57 +89,84 @@ def process_embedding_job(job_id: int) -> None:
         print(f"Processing embedding job {job_id}")
         print(f"  Document version: {job.document_version_id}")
         print(f"  Chunk range: {job.chunk_start_index}-{job.chunk_end_index}")
+        if interrupted:
+            print(f"Job {job_id} was interrupted (last update {job.updated_at}), retrying")
 
         # Mark job as running
         job.status = "running"
-        job.started_at = datetime.now()
+        job.started_at = job.started_at if interrupted else datetime.now()
+        job.updated_at = datetime.now()
         session.commit()
 
         try:
-            # Query chunks that need embeddings in the specified range
-            chunks = (
-                session.query(DocumentChunk)
-                .filter(
-                    DocumentChunk.document_version_id == job.document_version_id,
-                    DocumentChunk.chunk_index >= job.chunk_start_index,
-                    DocumentChunk.chunk_index < job.chunk_end_index,
-                    DocumentChunk.embedding.is_(None),
+            batch_delay = float(os.environ.get("EMBEDDING_BATCH_DELAY", "0.0"))
+            embedded = 0
+            embedding_seconds = 0.0
+            write_seconds = 0.0
+            model_name = None
+
+            while True:
+                # The model search uses; its name is stored with the vectors
+                model = get_active_embedding_model(session)
+                if model.name != model_name:
+                    print(f"  Using model: {model.name}")
+                    model_name = model.name
+                    last_chunk_index = job.chunk_start_index - 1
+
+                chunks = next_chunk_batch(session, job, model, last_chunk_index)
+                if not chunks:
+                    break
+
+                if embedded and batch_delay > 0:
+                    # Sleep between batches to avoid rate limiting
+                    time.sleep(batch_delay)
+
+                embedding_start = time.perf_counter()
+                embeddings = generate_embeddings_batch(
+                    [chunk.content for chunk in chunks],
+                    batch_size=EMBEDDING_API_BATCH_SIZE,
+                    deployment=model.deployment,
+                    dimensions=model.dimensions,
                 )
-                .order_by(DocumentChunk.chunk_index)
-                .all()
-            )
-
-            if not chunks:
-                print("No chunks need embeddings in this range")
-                job.status = "completed"
-                job.completed_at = datetime.now()
-                return
+                embedding_seconds += time.perf_counter() - embedding_start
 
-            print(f"Generating embeddings for {len(chunks)} chunks...")
+                write_start = time.perf_counter()
+                embedded += write_embeddings(
+                    session,
+                    model,
+                    ((chunk.id, embedding) for chunk, embedding in zip(chunks, embeddings)),
+                )
+                write_seconds += time.perf_counter() - write_start
 
-            # Get the model identifier for tracking
-            embedding_model = get_embedding_model()
-            print(f"  Using model: {embedding_model}")
+                # This batch's vectors are kept even if a later batch fails
+                job.updated_at = datetime.now()
+                session.commit()
+                last_chunk_index = chunks[-1].chunk_index
+                print(f"  Embedded {embedded} chunks (through chunk {last_chunk_index})")
 
-            # Generate embeddings (library handles batching internally)
-            batch_delay = float(os.environ.get("EMBEDDING_BATCH_DELAY", "0.0"))
-            texts = [chunk.content for chunk in chunks]
-            embeddings = generate_embeddings_batch(texts, batch_delay=batch_delay)
+            if not embedded:
+                print("No chunks need embeddings in this range")
 
-            for chunk, embedding in zip(chunks, embeddings):
-                chunk.embedding = embedding
-                chunk.embedding_model = embedding_model
+            job.metrics = {
+                **(job.metrics or {}),
+                "chunks_embedded": embedded,
+                "embedding_model": model_name,
+                "embedding_seconds": round(embedding_seconds, 3),
+                "write_seconds": round(write_seconds, 3),
+            }
 
             # Mark job as completed
             job.status = "completed"
             job.completed_at = datetime.now()
             session.commit()
 
-            # Invalidate search cache since new embeddings are available
-            invalidate_search_cache(session)
+            # New embeddings are searchable; the cache is invalidated once per
+            # document (or per window), not once per embedding job. Earlier jobs
+            # of the document may also have left the invalidation to this one.
+            record_search_cache_invalidation(session, job)
 
             print(f"Successfully processed embedding job {job_id}")
-            print(f"  - Chunks embedded: {len(chunks)}")
+            print(f"  - Chunks embedded: {embedded}")
 
         except Exception as e:
             job.status = "failed"
@@ -0,0 +1,144 @@
+"""Background re-embedding of the corpus with a new embedding model.
+
+Registers REEMBED_DEPLOYMENT at REEMBED_DIMENSIONS as an embedding model
+(named REEMBED_MODEL_NAME, if set) with its ANN index, and fills in its
+vectors for every searchable chunk, in keyset-paginated batches committed
+one at a time, while search keeps using the active model. Calls draw from a
+token bucket of their own (REEMBED_TOKENS_PER_MINUTE) instead of the
+deployment's, so the backfill cannot take the deployment's quota from
+ingestion and search.
+
+Runs until no chunk lacks a vector, then reports coverage. With
+REEMBED_ACTIVATE=1 it also switches search to the model once coverage is
+100%, and keeps making passes until none finds a chunk embedded with the
+previous model around the switch. A stopped run loses at most one batch;
+run it again to continue. New documents ingested meanwhile are embedded with the active
+model only, so run it again (or keep it scheduled) until the switch.
+
+Run with: python reembed.py
+"""
+
+import os
+import sys
+import time
+
+from techpubs_core import DocumentChunk, EmbeddingModel, get_session
+from techpubs_core.embedding_models import (
+    activate_embedding_model,
+    chunk_has_embedding,
+    chunk_is_searchable,
+    embedding_coverage,
+    register_embedding_model,
+    write_embeddings,
+)
+from techpubs_core.embeddings import generate_embeddings_batch
+from techpubs_core.rate_limit import TokenBucket
+
+# Deployment and dimensions of the model to re-embed with
+REEMBED_DEPLOYMENT = os.environ.get("REEMBED_DEPLOYMENT", "")
+REEMBED_DIMENSIONS = int(os.environ.get("REEMBED_DIMENSIONS", "1536"))
+
+# Name to register the model under (default: azure/<deployment>@<dimensions>)
+REEMBED_MODEL_NAME = os.environ.get("REEMBED_MODEL_NAME") or None
+
+# Chunks per API call and commit
+REEMBED_BATCH_SIZE = int(os.environ.get("REEMBED_BATCH_SIZE", "64"))
+
+# Token budget of the backfill, shared by all re-embed runs through Postgres
+REEMBED_TOKENS_PER_MINUTE = int(os.environ.get("REEMBED_TOKENS_PER_MINUTE", "60000"))
+
+# Switch search to the model once every searchable chunk has its vector
+REEMBED_ACTIVATE = os.environ.get("REEMBED_ACTIVATE", "0") == "1"
+
+
+def next_reembed_batch(session, model: EmbeddingModel, after_chunk_id: int) -> list:
+    """The next REEMBED_BATCH_SIZE searchable chunks without the model's vector, by id."""
+    return (
+        session.query(DocumentChunk.id, DocumentChunk.content)
+        .filter(
+            DocumentChunk.id > after_chunk_id,
+            chunk_is_searchable(),
+            ~chunk_has_embedding(model),
+        )
+        .order_by(DocumentChunk.id)
+        .limit(REEMBED_BATCH_SIZE)
+        .all()
+    )
+
+
+def reembed_pass(model: EmbeddingModel, token_bucket: TokenBucket) -> int:
+    """Embed every searchable chunk that lacks the model's vector, one committed batch at a time.
+
+    Returns:
+        Number of chunks embedded
+    """
+    embedded = 0
+    start_time = time.perf_counter()
+    last_chunk_id = 0
+
+    with get_session() as session:
+        while chunks := next_reembed_batch(session, model, last_chunk_id):
+            # Charged to the backfill's budget only, and reconciled with actual usage
+            embeddings = generate_embeddings_batch(
+                [chunk.content for chunk in chunks],
+                batch_size=REEMBED_BATCH_SIZE,
+                deployment=model.deployment,
+                dimensions=model.dimensions,
+                token_bucket=token_bucket,
+            )
+            embedded += write_embeddings(
+                session, model, ((chunk.id, embedding) for chunk, embedding in zip(chunks, embeddings))
+            )
+            session.commit()
+            last_chunk_id = chunks[-1].id
+
+            elapsed = time.perf_counter() - start_time
+            print(
+                f"  Re-embedded {embedded} chunks (through chunk {last_chunk_id}, "
+                f"{embedded / elapsed:.1f} chunks/s)"
+            )
+
+    return embedded
+
+
+def main():
+    print("Re-embedding job started")
+
+    try:
+        if not REEMBED_DEPLOYMENT:
+            raise ValueError("REEMBED_DEPLOYMENT environment variable must be set")
+
+        with get_session() as session:
+            model = register_embedding_model(session, REEMBED_DEPLOYMENT, REEMBED_DIMENSIONS, REEMBED_MODEL_NAME)
+            # Used across the sessions of the passes below
+            session.refresh(model)
+            session.expunge(model)
+        print(f"Re-embedding with {model.name} ({model.dimensions} dimensions)")
+
+        token_bucket = TokenBucket(f"reembed:{model.name}", REEMBED_TOKENS_PER_MINUTE)
+
+        # Chunks ingested during a pass are picked up by the next one
+        while reembed_pass(model, token_bucket):
+            pass
+
+        with get_session() as session:
+            embedded, total = embedding_coverage(session, model)
+        print(f"Coverage of {model.name}: {embedded}/{total} searchable chunks")
+
+        if REEMBED_ACTIVATE and not model.is_active:
+            with get_session() as session:
+                activate_embedding_model(session, model.name)
+            # Chunks embedded with the previous model around the switch, until embedding
+            # jobs that read the previous model before it have committed their last batch
+            while reembed_pass(model, token_bucket):
+                pass
+
+        print("Re-embedding job completed")
+
+    except Exception as e:
+        print(f"Error in re-embedding job: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,19 @@ from techpubs_core.constants import (
     DEFAULT_EMBEDDING_QUEUE,
     DOCUMENTS_CONTAINER,
 )
+from techpubs_core.bulk import (
+    bulk_copy_chunks,
+    bulk_insert_chunks,
+    bulk_update_embeddings,
+    bulk_upsert_chunk_embeddings,
+    renumber_chunks,
+)
 from techpubs_core.database import get_engine, get_session, get_session_factory
 from techpubs_core.models import (
     AircraftModel,
     Base,
     Category,
+    ChunkEmbedding,
     CorpusVersion,
     Document,
     DocumentCategory,
@@ -18,15 +26,19 @@ from techpubs_core.models import (
     DocumentType,
     DocumentVersion,
     EmbeddingCache,
+    EmbeddingModel,
     Generation,
     Platform,
+    RateLimitBudget,
     SearchCache,
 )
+from techpubs_core.search_cache import invalidate_search_cache, invalidate_search_cache_for_job
 
 __all__ = [
     "AircraftModel",
     "Base",
     "Category",
+    "ChunkEmbedding",
     "CorpusVersion",
     "Document",
     "DocumentCategory",
@@ -35,15 +47,24 @@ __all__ = [
     "DocumentType",
     "DocumentVersion",
     "EmbeddingCache",
+    "EmbeddingModel",
     "Generation",
     "Platform",
+    "RateLimitBudget",
     "SearchCache",
     "DEFAULT_CHUNKING_QUEUE",
     "DEFAULT_EMBEDDING_QUEUE",
     "DOCUMENTS_CONTAINER",
+    "bulk_copy_chunks",
+    "bulk_insert_chunks",
+    "bulk_update_embeddings",
+    "bulk_upsert_chunk_embeddings",
     "get_engine",
     "get_session",
     "get_session_factory",
+    "invalidate_search_cache",
+    "invalidate_search_cache_for_job",
+    "renumber_chunks",
 ]
 
 # Conditional imports for optional [queue] extra
@@ -52,6 +73,7 @@ try:
         JobMessage,
         JobQueueConsumer,
         JobQueueProducer,
+        VisibilityRenewer,
         get_credential,
         get_queue_client,
     )
@@ -60,6 +82,7 @@ try:
         "JobMessage",
         "JobQueueConsumer",
         "JobQueueProducer",
+        "VisibilityRenewer",
         "get_credential",
         "get_queue_client",
     ])
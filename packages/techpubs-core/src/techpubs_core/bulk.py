@@ -0,0 +1,289 @@
+"""Bulk write helpers for document chunks.
+
+These bypass the ORM unit of work and stream rows straight to PostgreSQL
+using psycopg's COPY protocol. They run on the session's own connection, so
+rows written here share the caller's transaction and become visible on commit.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy.orm import Session
+
+
+_CHUNK_COPY_SQL = (
+    "COPY document_chunks "
+    "(document_version_id, chunk_index, content, token_count, page_number, chapter_title) "
+    "FROM STDIN"
+)
+
+_CHUNK_WITH_EMBEDDING_COPY_SQL = (
+    "COPY document_chunks "
+    "(document_version_id, chunk_index, content, token_count, page_number, chapter_title, "
+    "embedding, embedding_model) "
+    "FROM STDIN"
+)
+
+
+_CHUNK_COPY_FROM_VERSION_SQL = text("""
+    WITH m AS (
+        SELECT *
+        FROM unnest(
+            CAST(:source_ids AS bigint[]),
+            CAST(:chunk_indexes AS int[]),
+            CAST(:page_numbers AS int[])
+        ) AS m(source_id, chunk_index, page_number)
+    ),
+    copied AS (
+        INSERT INTO document_chunks (
+            document_version_id, chunk_index, content, embedding, embedding_model,
+            token_count, page_number, chapter_title
+        )
+        SELECT
+            :document_version_id, m.chunk_index, c.content, c.embedding, c.embedding_model,
+            c.token_count, m.page_number, c.chapter_title
+        FROM m
+        JOIN document_chunks c ON c.id = m.source_id
+        RETURNING id, chunk_index, token_count
+    ),
+    copied_embeddings AS (
+        INSERT INTO chunk_embeddings (embedding_model, chunk_id, embedding)
+        SELECT e.embedding_model, copied.id, e.embedding
+        FROM copied
+        JOIN m ON m.chunk_index = copied.chunk_index
+        JOIN chunk_embeddings e ON e.chunk_id = m.source_id
+    )
+    SELECT token_count FROM copied
+""")
+
+
+_CHUNK_RENUMBER_SQL = text("""
+    UPDATE document_chunks AS c
+    SET chunk_index = n.chunk_index
+    FROM (
+        SELECT id, row_number() OVER (ORDER BY page_number, chunk_index, id) - 1 AS chunk_index
+        FROM document_chunks
+        WHERE document_version_id = :document_version_id
+    ) AS n
+    WHERE c.id = n.id
+    RETURNING c.token_count
+""")
+
+
+_EMBEDDING_UPDATE_TABLE_SQL = (
+    "CREATE TEMP TABLE chunk_embedding_updates (id bigint PRIMARY KEY, embedding real[]) ON COMMIT DROP"
+)
+
+_EMBEDDING_UPDATE_COPY_SQL = "COPY chunk_embedding_updates (id, embedding) FROM STDIN (FORMAT BINARY)"
+
+_EMBEDDING_UPDATE_SQL = (
+    "UPDATE document_chunks AS c "
+    "SET embedding = u.embedding::vector, embedding_model = %s "
+    "FROM chunk_embedding_updates AS u "
+    "WHERE c.id = u.id"
+)
+
+
+_CHUNK_EMBEDDING_UPSERT_SQL = (
+    "INSERT INTO chunk_embeddings (embedding_model, chunk_id, embedding) "
+    "SELECT %s, u.id, u.embedding::vector "
+    "FROM chunk_embedding_updates AS u "
+    "ON CONFLICT (embedding_model, chunk_id) DO UPDATE SET embedding = EXCLUDED.embedding"
+)
+
+
+def _driver_connection(session: Session):
+    """Get the underlying psycopg connection for a SQLAlchemy session."""
+    return session.connection().connection.driver_connection
+
+
+def _vector_literal(embedding) -> str:
+    """Format an embedding in pgvector's text input format ('[1.0,2.0,...]')."""
+    return "[" + ",".join(repr(float(value)) for value in embedding) + "]"
+
+
+def bulk_insert_chunks(
+    session: Session,
+    document_version_id: int,
+    chunks: Iterable[dict],
+    tokenizer=None,
+    progress_every: int = 1000,
+    embedding_model: str | None = None,
+) -> tuple[int, int]:
+    """Stream chunk rows into document_chunks using COPY.
+
+    Chunks are normally inserted without embeddings and the embedding job
+    fills those in. When embedding_model is given, every chunk must carry
+    its vector under 'embedding' and both are written in the same COPY.
+
+    Args:
+        session: Database session. Rows are written inside its transaction.
+        document_version_id: ID of the document version the chunks belong to.
+        chunks: Iterable of chunk dicts with 'content', 'chunk_index',
+            'page_number' and optionally 'chapter_title' and 'token_count'.
+        tokenizer: Optional tiktoken encoding for chunks without a
+            'token_count'. If None, falls back to a word split approximation.
+        progress_every: Print a progress line every N rows (0 to disable).
+        embedding_model: Model identifier stored with precomputed embeddings.
+
+    Returns:
+        Tuple of (number of rows inserted, total token count)
+    """
+    inserted = 0
+    total_token_count = 0
+
+    with _driver_connection(session).cursor() as cursor:
+        copy_sql = _CHUNK_COPY_SQL if embedding_model is None else _CHUNK_WITH_EMBEDDING_COPY_SQL
+        with cursor.copy(copy_sql) as copy:
+            for chunk in chunks:
+                content = chunk["content"]
+
+                token_count = chunk.get("token_count")
+                if token_count is None:
+                    if tokenizer is not None:
+                        token_count = len(tokenizer.encode(content))
+                    else:
+                        token_count = len(content.split())
+
+                row = (
+                    document_version_id,
+                    chunk["chunk_index"],
+                    content,
+                    token_count,
+                    chunk["page_number"],
+                    chunk.get("chapter_title"),
+                )
+                if embedding_model is not None:
+                    row += (_vector_literal(chunk["embedding"]), embedding_model)
+                copy.write_row(row)
+                inserted += 1
+                total_token_count += token_count
+
+                if progress_every and inserted % progress_every == 0:
+                    print(f"  Copied {inserted} chunks...")
+
+    return inserted, total_token_count
+
+
+def bulk_copy_chunks(
+    session: Session,
+    document_version_id: int,
+    copies: list[tuple[int, int, int | None]],
+) -> tuple[int, int]:
+    """Copy existing chunks (with their embeddings) into another document version.
+
+    Content and vectors are copied server-side with INSERT ... SELECT, so
+    embeddings never travel to the client. Vectors of every model are copied:
+    the embedding column and the chunks' chunk_embeddings rows.
+
+    Args:
+        session: Database session. Rows are written inside its transaction.
+        document_version_id: ID of the document version receiving the chunks.
+        copies: (source chunk id, new chunk_index, new page_number) tuples.
+
+    Returns:
+        Tuple of (number of rows copied, total token count)
+    """
+    if not copies:
+        return 0, 0
+
+    source_ids, chunk_indexes, page_numbers = (list(column) for column in zip(*copies))
+    result = session.execute(
+        _CHUNK_COPY_FROM_VERSION_SQL,
+        {
+            "document_version_id": document_version_id,
+            "source_ids": source_ids,
+            "chunk_indexes": chunk_indexes,
+            "page_numbers": page_numbers,
+        },
+    )
+    token_counts = result.scalars().all()
+    return len(token_counts), sum(count or 0 for count in token_counts)
+
+
+def renumber_chunks(session: Session, document_version_id: int) -> tuple[int, int]:
+    """Renumber a version's chunks 0..n-1 in (page_number, chunk_index) order.
+
+    Page-range chunking jobs number their chunks within their own range;
+    this gives the merged set its global chunk_index in one statement.
+
+    Args:
+        session: Database session. Rows are updated inside its transaction.
+        document_version_id: ID of the document version to renumber.
+
+    Returns:
+        Tuple of (number of chunks, total token count)
+    """
+    result = session.execute(_CHUNK_RENUMBER_SQL, {"document_version_id": document_version_id})
+    token_counts = result.scalars().all()
+    return len(token_counts), sum(count or 0 for count in token_counts)
+
+
+def _apply_embeddings(
+    session: Session,
+    embeddings: Iterable[tuple[int, list[float]]],
+    apply_sql: str,
+    embedding_model: str,
+) -> int:
+    """Binary COPY (chunk id, embedding) pairs into a temporary table and apply them with one statement."""
+    with _driver_connection(session).cursor() as cursor:
+        cursor.execute(_EMBEDDING_UPDATE_TABLE_SQL)
+        with cursor.copy(_EMBEDDING_UPDATE_COPY_SQL) as copy:
+            copy.set_types(["int8", "float4[]"])
+            for chunk_id, embedding in embeddings:
+                copy.write_row((chunk_id, embedding))
+        cursor.execute(apply_sql, (embedding_model,))
+        applied = cursor.rowcount
+        # Dropped now rather than at commit, so a transaction can update more than once
+        cursor.execute("DROP TABLE chunk_embedding_updates")
+    return applied
+
+
+def bulk_update_embeddings(
+    session: Session,
+    embeddings: Iterable[tuple[int, list[float]]],
+    embedding_model: str,
+) -> int:
+    """Write embeddings onto existing chunks with one UPDATE.
+
+    The vectors are sent with a binary COPY into a temporary table (as real[],
+    so no text formatting of floats and no vector type registration), then
+    applied with a single UPDATE ... FROM that also sets embedding_model.
+
+    Args:
+        session: Database session. Rows are updated inside its transaction.
+        embeddings: (chunk id, embedding) pairs.
+        embedding_model: Model identifier stored with the embeddings.
+
+    Returns:
+        Number of chunks updated
+    """
+    return _apply_embeddings(session, embeddings, _EMBEDDING_UPDATE_SQL, embedding_model)
+
+
+def bulk_upsert_chunk_embeddings(
+    session: Session,
+    embeddings: Iterable[tuple[int, list[float]]],
+    embedding_model: str,
+) -> int:
+    """Write a model's vectors into chunk_embeddings with one INSERT ... ON CONFLICT.
+
+    Same binary COPY as bulk_update_embeddings, for models whose vectors are
+    kept beside document_chunks (see embedding_models.py). Existing vectors
+    of the model are replaced.
+
+    Args:
+        session: Database session. Rows are written inside its transaction.
+        embeddings: (chunk id, embedding) pairs.
+        embedding_model: Name of a registered embedding model.
+
+    Returns:
+        Number of vectors written
+    """
+    return _apply_embeddings(session, embeddings, _CHUNK_EMBEDDING_UPSERT_SQL, embedding_model)
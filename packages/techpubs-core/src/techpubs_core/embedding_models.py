@@ -0,0 +1,209 @@
+"""Embedding models and the switch between them.
+
+Search used to depend on the single document_chunks.embedding column, so a
+model change (V8) meant NULLing every vector and waiting for the corpus to be
+re-embedded. The embedding_models table now lists every model with vectors in
+the database; exactly one is active, and search, the chunking job and the
+embedding job all use that one. The vectors of the model seeded by V18 stay
+in document_chunks.embedding; any other model's go to chunk_embeddings, keyed
+by the same model name that document_chunks.embedding_model records.
+
+Moving to a new model:
+
+1. register_embedding_model() adds it (a deployment at a dimension) with
+   its own partial ANN index.
+2. The re-embed job (reembed.py in the embedding job) fills in its vectors
+   in the background, throttled, while search keeps using the active model.
+3. activate_embedding_model() switches search over in one transaction, once
+   embedding_coverage() reports every searchable chunk covered.
+"""
+
+import re
+
+from sqlalchemy import and_, exists, func, select, text, update
+from sqlalchemy.orm import Session
+
+from techpubs_core.bulk import bulk_update_embeddings, bulk_upsert_chunk_embeddings
+from techpubs_core.models import ChunkEmbedding, Document, DocumentChunk, DocumentVersion, EmbeddingModel
+from techpubs_core.search_cache import invalidate_search_cache
+
+STORAGE_CHUNKS = "document_chunks"
+STORAGE_SIDE_TABLE = "chunk_embeddings"
+
+# pgvector's HNSW index covers up to 2000 dimensions as vector and 4000 as halfvec
+_MAX_VECTOR_INDEX_DIMENSIONS = 2000
+_MAX_HALFVEC_INDEX_DIMENSIONS = 4000
+
+_DEPLOYMENT_PATTERN = re.compile(r"^[A-Za-z0-9._-]+$")
+_MODEL_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._/@-]{1,100}$")
+
+
+def get_active_embedding_model(session: Session) -> EmbeddingModel:
+    """The embedding model search currently uses."""
+    model = session.query(EmbeddingModel).filter(EmbeddingModel.is_active.is_(True)).one_or_none()
+    if model is None:
+        raise ValueError("No active embedding model (embedding_models has no active row)")
+    return model
+
+
+def vector_type(dimensions: int) -> str:
+    """pgvector type for a model's vectors in queries and its ANN index."""
+    if dimensions <= _MAX_VECTOR_INDEX_DIMENSIONS:
+        return f"vector({dimensions})"
+    if dimensions <= _MAX_HALFVEC_INDEX_DIMENSIONS:
+        return f"halfvec({dimensions})"
+    raise ValueError(f"{dimensions} dimensions is more than an HNSW index supports")
+
+
+def chunk_is_searchable():
+    """Filter for chunks search can return (their version and document are not deleted)."""
+    return DocumentChunk.document_version_id.in_(
+        select(DocumentVersion.id)
+        .join(Document, DocumentVersion.document_id == Document.id)
+        .where(DocumentVersion.deleted_at.is_(None), Document.deleted_at.is_(None))
+    )
+
+
+def chunk_has_embedding(model: EmbeddingModel):
+    """Filter for chunks that have a vector from the model."""
+    if model.storage == STORAGE_CHUNKS:
+        return DocumentChunk.embedding.isnot(None)
+    return exists().where(
+        and_(ChunkEmbedding.embedding_model == model.name, ChunkEmbedding.chunk_id == DocumentChunk.id)
+    )
+
+
+def write_embeddings(session: Session, model: EmbeddingModel, embeddings) -> int:
+    """Write (chunk id, embedding) pairs to the model's storage in bulk.
+
+    Returns:
+        Number of vectors written
+    """
+    if model.storage == STORAGE_CHUNKS:
+        return bulk_update_embeddings(session, embeddings, model.name)
+    return bulk_upsert_chunk_embeddings(session, embeddings, model.name)
+
+
+def embedding_search_sql(model: EmbeddingModel) -> tuple[str, str, str]:
+    """SQL fragments for a vector search over the model's vectors.
+
+    Returns:
+        (join clause for document_chunks dc, vector expression, type to cast
+        the query vector to). Ordering by "<vector expression> <=> query"
+        lets the model's ANN index serve the search.
+    """
+    cast_type = vector_type(model.dimensions)
+    if model.storage == STORAGE_CHUNKS:
+        return "", "dc.embedding", cast_type
+    # The model name is a literal, not a parameter, so the planner can match
+    # the partial index of that model in generic plans too
+    name = model.name.replace("'", "''")
+    join = f"JOIN chunk_embeddings ce ON ce.chunk_id = dc.id AND ce.embedding_model = '{name}'"
+    return join, f"(ce.embedding::{cast_type})", cast_type
+
+
+def _index_name(model_name: str) -> str:
+    return ("idx_chunk_embeddings_" + re.sub(r"\W", "_", model_name).lower())[:63]
+
+
+def register_embedding_model(
+    session: Session, deployment: str, dimensions: int, name: str | None = None
+) -> EmbeddingModel:
+    """Add an Azure OpenAI embedding deployment as a model, with its ANN index.
+
+    A model is a deployment at a dimension: the same deployment shortened to
+    fewer dimensions produces different vectors. Unless given, the name is
+    "azure/<deployment>@<dimensions>". Registering a deployment and dimension
+    that is already a model (the one seeded by V18 included) returns that
+    model. Commits.
+
+    Its vectors go to chunk_embeddings. The index is a partial HNSW index on
+    the model's rows, cast to its dimension; it is built while the model has
+    no vectors yet, so creating it is quick.
+    """
+    if not _DEPLOYMENT_PATTERN.match(deployment):
+        raise ValueError(f"Invalid embedding deployment name '{deployment}'")
+    name = name or f"azure/{deployment}@{dimensions}"
+    if not _MODEL_NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid embedding model name '{name}'")
+    cast_type = vector_type(dimensions)
+
+    model = (
+        session.query(EmbeddingModel)
+        .filter(EmbeddingModel.deployment == deployment, EmbeddingModel.dimensions == dimensions)
+        .order_by(EmbeddingModel.is_active.desc(), EmbeddingModel.created_at)
+        .first()
+    )
+    if model is not None:
+        return model
+    existing = session.get(EmbeddingModel, name)
+    if existing is not None:
+        raise ValueError(
+            f"Embedding model {name} is registered for {existing.deployment} "
+            f"with {existing.dimensions} dimensions"
+        )
+
+    model = EmbeddingModel(name=name, deployment=deployment, dimensions=dimensions, storage=STORAGE_SIDE_TABLE)
+    session.add(model)
+    session.flush()
+    operator_class = cast_type.split("(")[0] + "_cosine_ops"
+    session.execute(text(
+        f"CREATE INDEX IF NOT EXISTS {_index_name(name)} ON chunk_embeddings "
+        f"USING hnsw ((embedding::{cast_type}) {operator_class}) "
+        f"WHERE embedding_model = '{name}'"
+    ))
+    session.commit()
+    print(f"Registered embedding model {name} ({dimensions} dimensions)")
+    return model
+
+
+def embedding_coverage(session: Session, model: EmbeddingModel) -> tuple[int, int]:
+    """How many searchable chunks have a vector from the model.
+
+    Returns:
+        Tuple of (chunks with a vector, searchable chunks)
+    """
+    embedded, total = (
+        session.query(
+            func.count(DocumentChunk.id).filter(chunk_has_embedding(model)),
+            func.count(DocumentChunk.id),
+        )
+        .filter(chunk_is_searchable())
+        .one()
+    )
+    return embedded, total
+
+
+def activate_embedding_model(session: Session, name: str) -> EmbeddingModel:
+    """Switch search to a model whose vectors cover every searchable chunk.
+
+    The models are locked, coverage is checked and the active flag moves in
+    one transaction, together with a search cache invalidation (cached
+    results were ranked by the previous model). Queries see either the old
+    model or the new one, never a mix. Commits.
+
+    Raises:
+        ValueError: If the model is unknown or some chunks lack its vectors.
+    """
+    models = {model.name: model for model in session.query(EmbeddingModel).with_for_update()}
+    model = models.get(name)
+    if model is None:
+        raise ValueError(f"Unknown embedding model '{name}'")
+    if model.is_active:
+        session.commit()
+        return model
+
+    embedded, total = embedding_coverage(session, model)
+    if embedded < total:
+        session.rollback()
+        raise ValueError(f"Embedding model {name} covers {embedded} of {total} chunks; not switching")
+
+    # Two statements: the unique index on is_active is checked row by row
+    session.execute(update(EmbeddingModel).where(EmbeddingModel.is_active.is_(True)).values(is_active=False))
+    session.execute(
+        update(EmbeddingModel).where(EmbeddingModel.name == name).values(is_active=True, activated_at=func.now())
+    )
+    invalidate_search_cache(session)
+    print(f"Search switched to embedding model {name} ({total} chunks)")
+    session.refresh(model)
+    return model
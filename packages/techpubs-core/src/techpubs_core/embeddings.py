@@ -5,9 +5,17 @@ from openai import AzureOpenAI
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from .rate_limit import TokenBucket, estimate_tokens
+
 # Embedding dimension for text-embedding-3-small
 EMBEDDING_DIMENSION = 1536
 
+# Tokens per minute shared by every process calling the deployment through
+# _embed (0 = no shared limit). Set it on the ingestion jobs, a little under
+# the deployment's TPM quota to leave room for search queries.
+EMBEDDING_TOKENS_PER_MINUTE = int(os.environ.get("EMBEDDING_TOKENS_PER_MINUTE", "0"))
+EMBEDDING_TOKEN_BURST_SECONDS = float(os.environ.get("EMBEDDING_TOKEN_BURST_SECONDS", "10"))
+
 
 def _get_deployment() -> str:
     """Get the Azure OpenAI embedding deployment name."""
@@ -37,6 +45,14 @@ def _get_client() -> AzureOpenAI:
     )
 
 
+@lru_cache(maxsize=None)
+def _get_token_bucket(deployment: str) -> TokenBucket | None:
+    """Cluster-wide token budget for a deployment, if one is configured."""
+    if not EMBEDDING_TOKENS_PER_MINUTE:
+        return None
+    return TokenBucket(f"azure/{deployment}", EMBEDDING_TOKENS_PER_MINUTE, EMBEDDING_TOKEN_BURST_SECONDS)
+
+
 def _sanitize_text(text: str) -> str:
     """Sanitize text for the OpenAI embedding API.
 
@@ -60,12 +76,23 @@ def _sanitize_text(text: str) -> str:
 
 
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
-def _embed(texts: list[str]) -> list[list[float]]:
-    """Generate embeddings using Azure OpenAI API."""
+def _embed(
+    texts: list[str],
+    deployment: str | None = None,
+    dimensions: int = EMBEDDING_DIMENSION,
+    token_bucket: TokenBucket | None = None,
+) -> list[list[float]]:
+    """Generate embeddings using Azure OpenAI API.
+
+    deployment defaults to AZURE_OPENAI_EMBEDDING_DEPLOYMENT; pass the
+    active EmbeddingModel's deployment and dimensions to embed for it.
+    token_bucket replaces the deployment's shared budget for callers with a
+    budget of their own (the re-embed backfill).
+    """
     import time
 
     client = _get_client()
-    deployment = _get_deployment()
+    deployment = deployment or _get_deployment()
 
     # Sanitize inputs to avoid API errors
     sanitized_texts = [_sanitize_text(t) for t in texts]
@@ -76,20 +103,29 @@ def _embed(texts: list[str]) -> list[list[float]]:
 
     if not non_empty_texts:
         # All texts were empty, return zero vectors
-        return [[0.0] * EMBEDDING_DIMENSION for _ in texts]
+        return [[0.0] * dimensions for _ in texts]
+
+    # Draw from the shared budget; the reservation is reconciled with actual usage below.
+    # A rejected call keeps its reservation, which backs the other workers off too.
+    token_bucket = token_bucket or _get_token_bucket(deployment)
+    reserved_tokens = estimate_tokens(non_empty_texts)
+    waited = token_bucket.acquire(reserved_tokens) if token_bucket is not None else 0.0
 
     try:
         start_time = time.perf_counter()
         response = client.embeddings.create(
             input=non_empty_texts,
             model=deployment,
-            dimensions=EMBEDDING_DIMENSION
+            dimensions=dimensions
         )
         elapsed_ms = (time.perf_counter() - start_time) * 1000
 
         # Log timing and token usage
         tokens_used = response.usage.total_tokens if response.usage else "unknown"
-        print(f"DEBUG: Embedding API call took {elapsed_ms:.2f}ms for {len(non_empty_texts)} texts ({tokens_used} tokens)")
+        budget_wait = f", {waited:.2f}s waiting for the token budget" if waited else ""
+        print(f"DEBUG: Embedding API call took {elapsed_ms:.2f}ms for {len(non_empty_texts)} texts ({tokens_used} tokens{budget_wait})")
+        if token_bucket is not None and response.usage:
+            token_bucket.reconcile(reserved_tokens, response.usage.total_tokens)
 
         # Log rate limit headers if available
         if hasattr(response, '_response') and response._response:
@@ -107,7 +143,7 @@ def _embed(texts: list[str]) -> list[list[float]]:
     api_embeddings = [item.embedding for item in sorted_data]
 
     # Map embeddings back to original positions, using zero vectors for empty texts
-    zero_vector = [0.0] * EMBEDDING_DIMENSION
+    zero_vector = [0.0] * dimensions
     result = []
     api_idx = 0
     for i in range(len(texts)):
@@ -120,9 +156,13 @@ def _embed(texts: list[str]) -> list[list[float]]:
     return result
 
 
-def generate_embedding(text: str) -> list[float]:
+def generate_embedding(
+    text: str,
+    deployment: str | None = None,
+    dimensions: int = EMBEDDING_DIMENSION,
+) -> list[float]:
     """Generate embedding for a single text."""
-    embeddings = _embed([text])
+    embeddings = _embed([text], deployment, dimensions)
     return embeddings[0]
 
 
@@ -189,7 +229,10 @@ def generate_embedding_cached(text: str, session) -> list[float]:
 def generate_embeddings_batch(
     texts: list[str],
     batch_size: int = 32,
-    batch_delay: float = 0.0
+    batch_delay: float = 0.0,
+    deployment: str | None = None,
+    dimensions: int = EMBEDDING_DIMENSION,
+    token_bucket: TokenBucket | None = None,
 ) -> list[list[float]]:
     """Generate embeddings for multiple texts efficiently.
 
@@ -197,6 +240,9 @@ def generate_embeddings_batch(
         texts: List of texts to generate embeddings for.
         batch_size: Number of texts per API call.
         batch_delay: Seconds to sleep between batches (helps avoid rate limits).
+        deployment: Embedding deployment (default AZURE_OPENAI_EMBEDDING_DEPLOYMENT).
+        dimensions: Vector dimensions requested from the deployment.
+        token_bucket: Token budget to draw from instead of the deployment's.
     """
     import time
 
@@ -208,7 +254,7 @@ def generate_embeddings_batch(
     # Process in batches
     for i in range(0, len(texts), batch_size):
         batch = texts[i:i + batch_size]
-        batch_embeddings = _embed(batch)
+        batch_embeddings = _embed(batch, deployment, dimensions, token_bucket)
         all_embeddings.extend(batch_embeddings)
         print(f"  Processed {len(all_embeddings)}/{len(texts)} texts")
 
@@ -3,7 +3,7 @@ from typing import Optional
 from uuid import UUID
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import BigInteger, CheckConstraint, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, CheckConstraint, DateTime, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -127,6 +127,13 @@ class DocumentVersion(Base):
     file_size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     blob_path: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
     total_token_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Per-page text fingerprints, set when the version's chunks are page-local
+    page_hashes: Mapped[Optional[list]] = mapped_column(JSONB, nullable=True)
+    # Stamp of the stored chunk set: source file hash and chunker config fingerprint
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    chunker_fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Blob path of the persisted extraction artifact (page texts, Docling documents)
+    extraction_path: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now, onupdate=datetime.now)
     deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -154,6 +161,16 @@ class DocumentJob(Base):
     chunk_start_index: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     chunk_end_index: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
+    # For page-range chunking jobs (1-based, inclusive)
+    page_start: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    page_end: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # Processing measurements recorded by the jobs (timings, throughput)
+    metrics: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+
+    # Chunking progress committed alongside the chunks, for resuming after a crash
+    checkpoint: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+
     document_version: Mapped["DocumentVersion"] = relationship(back_populates="jobs")
     parent_job: Mapped[Optional["DocumentJob"]] = relationship(
         back_populates="child_jobs",
@@ -193,6 +210,32 @@ class DocumentSerialRange(Base):
     document: Mapped["Document"] = relationship(back_populates="serial_ranges")
 
 
+class EmbeddingModel(Base):
+    """An embedding model whose vectors are stored for the chunks (see embedding_models.py)."""
+
+    __tablename__ = "embedding_models"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    deployment: Mapped[str] = mapped_column(String(100), nullable=False)
+    dimensions: Mapped[int] = mapped_column(Integer, nullable=False)
+    # "document_chunks" (DocumentChunk.embedding) or "chunk_embeddings"
+    storage: Mapped[str] = mapped_column(String(20), nullable=False, default="chunk_embeddings")
+    is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now)
+    activated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class ChunkEmbedding(Base):
+    """A chunk's vector from an embedding model not stored in document_chunks."""
+
+    __tablename__ = "chunk_embeddings"
+
+    embedding_model: Mapped[str] = mapped_column(String(100), ForeignKey("embedding_models.name"), primary_key=True)
+    chunk_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("document_chunks.id"), primary_key=True)
+    embedding = mapped_column(Vector(), nullable=False)  # dimension of the model
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.now)
+
+
 class EmbeddingCache(Base):
     __tablename__ = "embedding_cache"
 
@@ -202,6 +245,17 @@ class EmbeddingCache(Base):
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
 
+class RateLimitBudget(Base):
+    """Shared token bucket state for a rate-limited API (see rate_limit.py)."""
+
+    __tablename__ = "rate_limit_budgets"
+
+    name: Mapped[str] = mapped_column(Text, primary_key=True)
+    tokens_per_minute: Mapped[int] = mapped_column(Integer, nullable=False)
+    available: Mapped[float] = mapped_column(Float, nullable=False)
+    refilled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 class SearchCache(Base):
     __tablename__ = "search_cache"
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from dataclasses import dataclass
 from functools import lru_cache
 from typing import TYPE_CHECKING
@@ -163,6 +164,22 @@ class JobQueueConsumer:
         for message in messages:
             yield JobMessage.from_queue_message(message)
 
+    def extend_visibility(self, job_message: JobMessage) -> None:
+        """Hide a message for another visibility_timeout seconds from now.
+
+        The message gets a new pop receipt, which is stored on it so a later
+        delete_message still succeeds.
+
+        Args:
+            job_message: The JobMessage being processed.
+        """
+        updated = self._client.update_message(
+            job_message.raw_message,
+            visibility_timeout=self._visibility_timeout,
+        )
+        job_message.raw_message.pop_receipt = updated.pop_receipt
+        job_message.raw_message.next_visible_on = updated.next_visible_on
+
     def delete_message(self, job_message: JobMessage) -> None:
         """Delete a message from the queue after successful processing.
 
@@ -180,3 +197,50 @@ class JobQueueConsumer:
     def visibility_timeout(self) -> int:
         """Get the visibility timeout in seconds."""
         return self._visibility_timeout
+
+
+class VisibilityRenewer:
+    """Keeps received messages hidden while their jobs run.
+
+    A job that outlives the consumer's visibility timeout would otherwise
+    reappear on the queue and be picked up by another replica while it is
+    still running, and its own delete would fail on the replaced pop
+    receipt. A background thread extends the visibility of every message
+    not yet released, every interval seconds (a fifth of the timeout by
+    default), so a message only reappears once its replica is gone.
+    """
+
+    def __init__(
+        self,
+        consumer: JobQueueConsumer,
+        messages: list[JobMessage],
+        interval: float | None = None,
+    ) -> None:
+        self._consumer = consumer
+        self._interval = interval or consumer.visibility_timeout / 5
+        self._messages = {id(message): message for message in messages}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._renew, daemon=True)
+        self._thread.start()
+
+    def _renew(self) -> None:
+        while not self._stopped.wait(self._interval):
+            with self._lock:
+                for message in list(self._messages.values()):
+                    try:
+                        self._consumer.extend_visibility(message)
+                    except Exception as e:
+                        # Gone or taken over; nothing left to keep hidden
+                        print(f"WARNING: Could not extend visibility of message {message.raw_message.id}: {e}")
+                        del self._messages[id(message)]
+
+    def release(self, job_message: JobMessage) -> None:
+        """Stop renewing a message (before deleting it or leaving it for redelivery)."""
+        with self._lock:
+            self._messages.pop(id(job_message), None)
+
+    def stop(self) -> None:
+        """Stop renewing all messages."""
+        self._stopped.set()
+        self._thread.join()
@@ -0,0 +1,101 @@
+"""Cluster-wide token bucket backed by Postgres.
+
+Embedding workers used to throttle themselves independently, so every
+added replica added its own share of 429s from the shared Azure OpenAI
+deployment. A TokenBucket keeps one budget per rate-limited API in a
+rate_limit_budgets row that every worker draws from before a call, so
+aggregate throughput converges on the configured rate whatever the
+replica count. No extra service is needed.
+
+Each draw is a short transaction: a transaction-scoped advisory lock on
+the bucket (which also covers creating the row the first time), a refill
+for the time elapsed since the last draw, and the take. Calls reserve an
+estimate up front and reconcile it with the tokens the API reports, so
+the budget tracks actual usage; a bucket in debt makes the next callers
+wait.
+"""
+
+import time
+
+from sqlalchemy import func, select, text
+
+from techpubs_core.database import get_session
+from techpubs_core.models import RateLimitBudget
+
+_ADVISORY_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext(:key))")
+
+
+def estimate_tokens(texts: list[str]) -> int:
+    """Rough token count for reserving budget (about 4 characters per token)."""
+    return sum(len(t) // 4 + 1 for t in texts)
+
+
+class TokenBucket:
+    """A token bucket shared through the rate_limit_budgets table.
+
+    Args:
+        name: Budget row name, e.g. the model deployment.
+        tokens_per_minute: Sustained rate.
+        burst_seconds: Bucket capacity, in seconds of the sustained rate.
+    """
+
+    def __init__(self, name: str, tokens_per_minute: int, burst_seconds: float = 10.0) -> None:
+        self.name = name
+        self.tokens_per_minute = tokens_per_minute
+        self.rate = tokens_per_minute / 60
+        self.capacity = max(self.rate * burst_seconds, 1.0)
+
+    def _lock(self, session) -> RateLimitBudget | None:
+        session.execute(_ADVISORY_LOCK_SQL, {"key": f"rate_limit:{self.name}"})
+        return session.get(RateLimitBudget, self.name)
+
+    def _take(self, tokens: float) -> float:
+        """Refill the bucket and take tokens if they are there.
+
+        Returns:
+            0 if the tokens were taken, else the seconds until they will be.
+        """
+        with get_session() as session:
+            budget = self._lock(session)
+            # Wall clock of the database, shared by all workers (now() is the transaction start)
+            now = session.execute(select(func.clock_timestamp())).scalar_one()
+            if budget is None:
+                budget = RateLimitBudget(
+                    name=self.name, tokens_per_minute=self.tokens_per_minute, available=self.capacity, refilled_at=now
+                )
+                session.add(budget)
+            else:
+                elapsed = max((now - budget.refilled_at).total_seconds(), 0.0)
+                budget.available = min(self.capacity, budget.available + elapsed * self.rate)
+                budget.refilled_at = now
+                budget.tokens_per_minute = self.tokens_per_minute
+
+            if budget.available >= tokens:
+                budget.available -= tokens
+                return 0.0
+            return (tokens - budget.available) / self.rate
+
+    def acquire(self, tokens: int) -> float:
+        """Block until the bucket has the tokens and take them.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        # A call larger than the bucket would never fit; let it through when the bucket is full
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while (wait := self._take(tokens)) > 0:
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+    def reconcile(self, reserved: int, used: int) -> None:
+        """Charge (or refund) the difference between the reserved and the used tokens."""
+        # acquire() took at most the bucket's capacity
+        reserved = min(reserved, self.capacity)
+        if used == reserved:
+            return
+        with get_session() as session:
+            budget = self._lock(session)
+            if budget is not None:
+                budget.available = min(self.capacity, budget.available - (used - reserved))
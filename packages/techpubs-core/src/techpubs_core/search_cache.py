@@ -0,0 +1,88 @@
+"""Search cache helpers shared by the ingestion jobs."""
+
+import os
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+
+from techpubs_core.models import CorpusVersion, DocumentJob
+
+# While other jobs of the same document are still running, the cache is
+# invalidated at most once per this many seconds (0 = only by the last job)
+SEARCH_CACHE_INVALIDATION_WINDOW_SECONDS = int(
+    os.environ.get("SEARCH_CACHE_INVALIDATION_WINDOW_SECONDS", "300")
+)
+
+
+def invalidate_search_cache(session: Session) -> str:
+    """Invalidate the search cache by updating the corpus version.
+
+    Returns:
+        The new corpus version string.
+    """
+    new_version = uuid4().hex[:8]
+    session.execute(
+        update(CorpusVersion)
+        .where(CorpusVersion.id == 1)
+        .values(version=new_version, updated_at=datetime.utcnow())
+    )
+    session.commit()
+    print(f"Search cache invalidated, new corpus version: {new_version}")
+    return new_version
+
+
+def invalidate_search_cache_for_job(
+    session: Session,
+    job: DocumentJob,
+    window_seconds: int = SEARCH_CACHE_INVALIDATION_WINDOW_SECONDS,
+) -> str:
+    """Invalidate the search cache for a job's committed changes, unless that can wait.
+
+    A chunking job and its child jobs form one family. The cache is
+    invalidated when no other job of the family is pending or running (the
+    last one to finish makes everything searchable at once), or when the
+    corpus version is older than window_seconds, so a long ingestion still
+    surfaces its progress. It is not invalidated again if that already
+    happened after the job completed.
+
+    Call after committing the job's completion. The corpus version row is
+    locked while deciding, so of jobs finishing at the same time the last
+    one to decide sees the others completed.
+
+    Returns:
+        The decision: "last_job", "window_elapsed", "already_invalidated" or "deferred".
+    """
+    updated_at, now = (
+        session.query(CorpusVersion.updated_at, func.now())
+        .filter(CorpusVersion.id == 1)
+        .with_for_update()
+        .one()
+    )
+
+    family_id = job.parent_job_id or job.id
+    if job.completed_at is not None and updated_at >= job.completed_at:
+        decision = "already_invalidated"
+    elif not (
+        session.query(func.count(DocumentJob.id))
+        .filter(
+            or_(DocumentJob.id == family_id, DocumentJob.parent_job_id == family_id),
+            DocumentJob.id != job.id,
+            DocumentJob.status.in_(["pending", "running"]),
+        )
+        .scalar()
+    ):
+        decision = "last_job"
+    elif window_seconds and (now - updated_at).total_seconds() >= window_seconds:
+        decision = "window_elapsed"
+    else:
+        decision = "deferred"
+
+    if decision in ("last_job", "window_elapsed"):
+        invalidate_search_cache(session)
+    else:
+        # Release the corpus version lock
+        session.commit()
+        print(f"Search cache invalidation {decision.replace('_', ' ')}")
+    return decision